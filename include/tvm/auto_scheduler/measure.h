@@ -478,10 +478,33 @@ class ProgramMeasurerNode : public Object {
   int verbose;
   /*! \brief The number of allowed maximum continuous error before forcely stopping the tuning */
   int max_continuous_error;
+  /*! \brief Whether to reuse the results of the programs that lower to the same module. */
+  bool cache_results;
+  /*! \brief The key of a lowered program to its successful measure result. */
+  std::unordered_map<std::string, MeasureResult> result_cache;
+  /*! \brief The number of programs looked up in the result cache. */
+  int cache_query_ct;
+  /*! \brief The number of programs whose result is taken from the result cache. */
+  int cache_hit_ct;
 
   /*! \brief Reset book keeping variables */
   void Reset();
 
+  /*!
+   * \brief Get the key of a program in the result cache, i.e. a structural hash of
+   * its lowered module and its target.
+   * \param input The MeasureInput of the program.
+   * \return The key, or an empty string if the program fails to be lowered.
+   */
+  static std::string GetProgramKey(const MeasureInput& input);
+
+  /*!
+   * \brief Add the successful results of measured programs to the result cache.
+   * \param inputs The MeasureInputs.
+   * \param results The MeasureResults.
+   */
+  void AddToResultCache(const Array<MeasureInput>& inputs, const Array<MeasureResult>& results);
+
   /*!
    * \brief Do measurement.
    * \param task The current SearchTask.
@@ -524,10 +547,12 @@ class ProgramMeasurer : public ObjectRef {
    * measuring.
    * \param max_continuous_error The number of allowed maximum continuous error before
    * forcely stopping the tuning.
+   * \param cache_results Whether to reuse the results of the programs that lower to the same
+   * module instead of building and running them again.
    */
   ProgramMeasurer(ProgramBuilder builder, ProgramRunner runner,
                   Optional<Array<MeasureCallback>> callbacks, int verbose,
-                  int max_continuous_error = -1);
+                  int max_continuous_error = -1, bool cache_results = false);
 
   TVM_DEFINE_MUTABLE_OBJECT_REF_METHODS(ProgramMeasurer, ObjectRef, ProgramMeasurerNode);
 };
@@ -27,12 +27,13 @@ from . import relay_integration
 from . import search_policy
 from . import search_task
 from . import task_scheduler
+from . import distributed_task_scheduler
 from . import utils
 from . import workload_registry
 
 # Shortcut
 from .compute_dag import ComputeDAG, LayoutRewriteOption, get_shape_from_rewritten_layout
-from .cost_model import RandomModel, XGBModel
+from .cost_model import RandomModel, XGBModel, MLPModel
 from .dispatcher import DispatchContext, ApplyHistoryBest
 from .measure import (
     MeasureInput,
@@ -57,4 +58,5 @@ from .search_policy import (
     PreloadCustomSketchRule,
 )
 from .task_scheduler import TaskScheduler
+from .distributed_task_scheduler import DistributedTaskScheduler
 from .workload_registry import register_workload, make_workload_key
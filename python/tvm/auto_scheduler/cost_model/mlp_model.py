@@ -0,0 +1,335 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=invalid-name
+
+"""Cost model based on a small multi-layer perceptron implemented with numpy"""
+import logging
+
+import numpy as np
+
+from .cost_model import PythonBasedModel
+from .xgb_model import predict_throughput_pack_sum
+from ..feature import (
+    CSRFeatures,
+    get_per_store_features_from_measure_pairs,
+    get_per_store_features_from_states,
+)
+from ..measure_record import RecordReader
+
+logger = logging.getLogger("auto_scheduler")
+
+
+class MLPModel(PythonBasedModel):
+    """Train a small multi-layer perceptron to predict the normalized throughputs of programs.
+
+    As :any:`XGBModel`, the score of a program is the sum of the scores of its stages,
+    predicted from the per-store features of every stage, and the model is trained with
+    the pack-sum square error weighted by the normalized throughputs.
+    The per-stage model is a perceptron with one hidden ReLU layer, or a linear model
+    with L2 regularization (ridge) if `hidden_size` is 0.
+
+    The model is updated online: every update runs a few epochs of mini-batch SGD (Adam)
+    on the new records, mixed with as many records sampled from the old ones so the model
+    does not forget them. Both the update and the prediction are a few batched matrix
+    products, so they are much cheaper than the ones of XGBModel on large populations
+    and do not depend on xgboost.
+
+    Parameters
+    ----------
+    hidden_size: int = 64
+        The size of the hidden layer, 0 for a linear model
+    learning_rate: float = 1e-3
+        The learning rate of Adam
+    weight_decay: float = 1e-4
+        The L2 regularization of the weights
+    batch_size: int = 128
+        The number of programs in a mini-batch
+    n_epochs: int = 30
+        The number of epochs of an update
+    num_warmup_sample: int = 100
+        The minimum number of samples to start to use the trained model.
+        If the number of samples is less than this number, the model outputs random predictions.
+    seed: Optional[int]
+        The random seed
+    model_file: Optional[str]
+        If is not None, save model to this file after every update.
+    """
+
+    def __init__(
+        self,
+        hidden_size=64,
+        learning_rate=1e-3,
+        weight_decay=1e-4,
+        batch_size=128,
+        n_epochs=30,
+        num_warmup_sample=100,
+        seed=None,
+        model_file=None,
+    ):
+        self.hidden_size = hidden_size
+        self.learning_rate = learning_rate
+        self.weight_decay = weight_decay
+        self.batch_size = batch_size
+        self.n_epochs = n_epochs
+        self.num_warmup_sample = num_warmup_sample
+        self.model_file = model_file
+        self.rng = np.random.RandomState(seed or 43)
+
+        # the model parameters and the feature normalization, set by the first update
+        self.params = None
+        self.feature_mean = None
+        self.feature_scale = None
+        # the Adam states of the parameters
+        self.adam_m = None
+        self.adam_v = None
+        self.adam_t = 0
+
+        super().__init__()
+
+        # cache measurement input/result pairs and extracted features
+        self.inputs = []
+        self.results = []
+        self.inputs_feature_cache = CSRFeatures.from_list([])
+
+    def update(self, inputs, results):
+        """Update the cost model according to new measurement results (training data).
+
+        Parameters
+        ----------
+        inputs : List[MeasureInput]
+            The measurement inputs
+        results : List[MeasureResult]
+            The measurement results
+        """
+        if len(inputs) <= 0:
+            return
+        assert len(inputs) == len(results)
+
+        n_old = len(self.inputs)
+        self.inputs.extend(inputs)
+        self.results.extend(results)
+
+        # extract feature, the normalized throughputs of all records are updated
+        n_cached = len(self.inputs_feature_cache)
+        features, normalized_throughputs, _ = get_per_store_features_from_measure_pairs(
+            self.inputs, self.results, skip_first_n_feature_extraction=n_cached, csr=True
+        )
+        if n_cached > 0:
+            new_features = features.take(np.arange(n_cached, len(features)))
+            features = CSRFeatures.concatenate([self.inputs_feature_cache, new_features])
+        self.inputs_feature_cache = features
+
+        if self.params is None:
+            self._init_params(features.data)
+
+        # the new records and as many old records
+        new_ids = np.arange(n_old, len(features))
+        old_ids = self.rng.choice(n_old, min(n_old, len(new_ids)), replace=False)
+        train_ids = np.concatenate([new_ids, old_ids]).astype(np.int64)
+        train_ids = train_ids[~features.invalid_mask()[train_ids]]
+
+        for _ in range(self.n_epochs):
+            self.rng.shuffle(train_ids)
+            for i in range(0, len(train_ids), self.batch_size):
+                batch = train_ids[i : i + self.batch_size]
+                self._train_step(features.take(batch), normalized_throughputs[batch])
+
+        # Update the model file if it has been set
+        if self.model_file:
+            self.save(self.model_file)
+
+    def _init_params(self, xs):
+        """Initialize the parameters and the feature normalization from the training data"""
+        valid_rows = xs[xs.any(axis=1)]
+        if len(valid_rows) == 0:
+            valid_rows = xs
+        self.feature_mean = valid_rows.mean(axis=0).astype(np.float32)
+        std = valid_rows.std(axis=0)
+        self.feature_scale = np.where(std > 1e-6, 1 / np.maximum(std, 1e-6), 0).astype(np.float32)
+
+        vec_len = xs.shape[1]
+        if self.hidden_size > 0:
+            self.params = [
+                self.rng.normal(0, np.sqrt(2 / vec_len), (vec_len, self.hidden_size)),
+                np.zeros(self.hidden_size),
+                self.rng.normal(0, np.sqrt(1 / self.hidden_size), (self.hidden_size,)) * 0.1,
+                np.zeros(1),
+            ]
+        else:
+            self.params = [np.zeros(vec_len), np.zeros(1)]
+        self.params = [p.astype(np.float32) for p in self.params]
+        self.adam_m = [np.zeros_like(p) for p in self.params]
+        self.adam_v = [np.zeros_like(p) for p in self.params]
+        self.adam_t = 0
+
+    def _forward(self, xs):
+        """Predict the scores of feature rows, also return the hidden activations"""
+        xs = (xs - self.feature_mean) * self.feature_scale
+        if self.hidden_size > 0:
+            w1, b1, w2, b2 = self.params
+            hidden = np.maximum(xs @ w1 + b1, 0)
+            return hidden @ w2 + b2[0], xs, hidden
+        w, b = self.params
+        return xs @ w + b[0], xs, None
+
+    def _train_step(self, features, ys):
+        """Run an Adam step on a mini-batch with the pack-sum square error"""
+        raw_preds, xs, hidden = self._forward(features.data)
+        pack_ids = features.pack_ids()
+        preds = np.bincount(pack_ids, weights=raw_preds, minlength=len(features))
+        # weight the samples by their throughputs, as the training set of XGBModel
+        grad_out = ((preds - ys) * ys / len(features))[pack_ids].astype(np.float32)
+
+        if self.hidden_size > 0:
+            _, _, w2, _ = self.params
+            grad_hidden = np.outer(grad_out, w2) * (hidden > 0)
+            grads = [
+                xs.T @ grad_hidden,
+                grad_hidden.sum(axis=0),
+                hidden.T @ grad_out,
+                grad_out.sum(keepdims=True),
+            ]
+        else:
+            grads = [xs.T @ grad_out, grad_out.sum(keepdims=True)]
+
+        beta1, beta2, eps = 0.9, 0.999, 1e-8
+        self.adam_t += 1
+        lr = self.learning_rate * np.sqrt(1 - beta2 ** self.adam_t) / (1 - beta1 ** self.adam_t)
+        for i, (param, grad) in enumerate(zip(self.params, grads)):
+            if param.ndim > 1 or (self.hidden_size == 0 and i == 0):
+                grad = grad + self.weight_decay * param
+            self.adam_m[i] = beta1 * self.adam_m[i] + (1 - beta1) * grad
+            self.adam_v[i] = beta2 * self.adam_v[i] + (1 - beta2) * np.square(grad)
+            param -= (lr * self.adam_m[i] / (np.sqrt(self.adam_v[i]) + eps)).astype(np.float32)
+
+    def _is_trained(self):
+        return self.params is not None and len(self.inputs) > self.num_warmup_sample
+
+    def predict(self, task, states):
+        """Predict the scores of states
+
+        Parameters
+        ----------
+        search_task : SearchTask
+            The search task of states
+        statse : List[State]
+            The input states
+
+        Returns
+        -------
+        scores: List[float]
+            The predicted scores for all states
+        """
+        features = get_per_store_features_from_states(states, task, csr=True)
+        if self._is_trained():
+            raw_preds, _, _ = self._forward(features.data)
+            ret = predict_throughput_pack_sum(raw_preds, features.pack_ids(), len(states))
+        else:
+            ret = np.random.uniform(0, 1, (len(states),))
+
+        # Predict -inf for invalid states that failed to be lowered.
+        ret[features.invalid_mask()] = float("-inf")
+
+        return ret
+
+    def predict_stages(self, task, states):
+        """Predict the scores of all stages in states. This is the breakdown version of `predict`.
+
+        Parameters
+        ----------
+        search_task : SearchTask
+            The search task of states
+        statse : List[State]
+            The input states
+
+        Returns
+        -------
+        scores: List[float]
+            The predicted scores for all stages in all states in the packed format
+            of :any:`XGBModel.predict_stages`
+        """
+        features = get_per_store_features_from_states(states, task, csr=True)
+        n_states = len(states)
+        if self._is_trained():
+            raw_preds, _, _ = self._forward(features.data)
+            pack_ids = features.pack_ids()
+            breakdown = np.empty(2 * n_states + len(raw_preds))
+            breakdown[:n_states] = predict_throughput_pack_sum(raw_preds, pack_ids, n_states)
+            # the stages of state i are preceded by their number and the stages of states < i
+            breakdown[n_states + features.offsets[:-1] + np.arange(n_states)] = (
+                features.row_counts()
+            )
+            breakdown[n_states + np.arange(len(raw_preds)) + pack_ids + 1] = raw_preds
+        else:
+            breakdown = np.concatenate((np.random.uniform(0, 1, (n_states,)), np.zeros(n_states)))
+
+        # Predict -inf for invalid states that failed to be lowered.
+        breakdown[:n_states][features.invalid_mask()] = float("-inf")
+
+        return breakdown
+
+    def update_from_file(self, file_name, n_lines=None):
+        """Load measure records from a log file to update the cost model.
+        This function can be used to pre-train the cost model with history log files.
+
+        Parameters
+        ----------
+        file_name: str
+            The filename
+        n_lines: Optional[int]
+            Only load first n lines of the log file
+        """
+        inputs, results = RecordReader(file_name).read_lines(n_lines)
+        logger.info("MLPModel: Loaded %s measurement records from %s", len(inputs), file_name)
+        self.update(inputs, results)
+
+    def save(self, file_name: str):
+        """Save the model to a file
+
+        Parameters
+        ----------
+        file_name: str
+            The filename
+        """
+        arrays = {"param_%d" % i: p for i, p in enumerate(self.params)}
+        with open(file_name, "wb") as fout:
+            np.savez(
+                fout,
+                hidden_size=self.hidden_size,
+                feature_mean=self.feature_mean,
+                feature_scale=self.feature_scale,
+                **arrays,
+            )
+
+    def load(self, file_name: str):
+        """Load the model from a file
+
+        Parameters
+        ----------
+        file_name: str
+            The filename
+        """
+        with np.load(file_name) as data:
+            self.hidden_size = int(data["hidden_size"])
+            self.feature_mean = data["feature_mean"]
+            self.feature_scale = data["feature_scale"]
+            n_params = 4 if self.hidden_size > 0 else 2
+            self.params = [data["param_%d" % i] for i in range(n_params)]
+        self.adam_m = [np.zeros_like(p) for p in self.params]
+        self.adam_v = [np.zeros_like(p) for p in self.params]
+        self.adam_t = 0
+        self.num_warmup_sample = -1
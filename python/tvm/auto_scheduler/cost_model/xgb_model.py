@@ -25,7 +25,11 @@ import numpy as np
 
 from tvm.autotvm.tuner.metric import max_curve
 from .cost_model import PythonBasedModel
-from ..feature import get_per_store_features_from_measure_pairs, get_per_store_features_from_states
+from ..feature import (
+    CSRFeatures,
+    get_per_store_features_from_measure_pairs,
+    get_per_store_features_from_states,
+)
 from ..measure_record import RecordReader
 
 xgb = None
@@ -101,6 +105,16 @@ class XGBModel(PythonBasedModel):
     adapative_training: bool = False
         Whether to use adapatie training, which reduces the training frequency when there are
         too many logs.
+    incremental_training: bool = False
+        Whether to continue boosting the current model on the newly measured records
+        instead of training a new model on all records at every update.
+        This keeps the update time flat when there are many logs.
+    full_refit_interval: int = 10
+        With incremental training, train a new model on all records every this number of
+        updates, since the normalized throughputs of old records change with new best
+        records and old trees are never revised.
+    incremental_rounds: int = 100
+        The maximum number of boosting rounds of an incremental update.
     """
 
     def __init__(
@@ -110,6 +124,9 @@ class XGBModel(PythonBasedModel):
         seed=None,
         model_file=None,
         adapative_training=False,
+        incremental_training=False,
+        full_refit_interval=10,
+        incremental_rounds=100,
     ):
         global xgb
         try:
@@ -140,6 +157,11 @@ class XGBModel(PythonBasedModel):
         self.verbose_eval = verbose_eval
         self.model_file = model_file
         self.adapative_training = adapative_training
+        self.incremental_training = incremental_training
+        self.full_refit_interval = full_refit_interval
+        self.incremental_rounds = incremental_rounds
+        # the number of incremental updates since the last full training
+        self.num_incremental_updates = 0
 
         super().__init__()
 
@@ -147,11 +169,13 @@ class XGBModel(PythonBasedModel):
         self.inputs = []
         self.results = []
         self.last_train_length = 0
-        self.inputs_feature_cache = []
+        self.inputs_feature_cache = CSRFeatures.from_list([])
 
     def update(self, inputs, results):
         """Update the cost model according to new measurement results (training data).
-        XGBoost does not support incremental training, so we re-train a new model every time.
+        By default, a new model is trained on all records every time.
+        With incremental training, the current model is boosted on the new records,
+        and a new model is trained every `full_refit_interval` updates.
         Parameters
         ----------
         inputs : List[MeasureInput]
@@ -173,27 +197,54 @@ class XGBModel(PythonBasedModel):
             # Set a training threshold related to `last_train_length` to reduce the training
             # overhead when there're too many logs
             return
+        n_trained = self.last_train_length
         self.last_train_length = len(self.inputs)
 
         # extract feature
         n_cached = len(self.inputs_feature_cache)
         features, normalized_throughputs, task_ids = get_per_store_features_from_measure_pairs(
-            self.inputs, self.results, skip_first_n_feature_extraction=n_cached
+            self.inputs, self.results, skip_first_n_feature_extraction=n_cached, csr=True
         )
         if n_cached > 0:
-            features = list(features)
-            features[:n_cached] = self.inputs_feature_cache
-            features = np.array(features, dtype=object)
+            new_features = features.take(np.arange(n_cached, len(features)))
+            features = CSRFeatures.concatenate([self.inputs_feature_cache, new_features])
         self.inputs_feature_cache = features
-        dtrain = pack_sum_xgbmatrix(
-            features, normalized_throughputs, task_ids, normalized_throughputs
-        )
 
-        # train xgb model
-        self.bst = xgb.train(
+        if (
+            self.incremental_training
+            and self.bst is not None
+            and n_trained > 0
+            and self.num_incremental_updates < self.full_refit_interval
+        ):
+            # continue boosting on the records appended since the last training
+            index = np.arange(n_trained, len(features))
+            dtrain = pack_sum_xgbmatrix(
+                features.take(index),
+                normalized_throughputs[index],
+                task_ids[index],
+                normalized_throughputs[index],
+            )
+            # the early stopping state of the last training does not apply to the new records
+            self.bst.set_attr(best_score=None, best_iteration=None, best_msg=None)
+            self.bst = self._train(dtrain, self.incremental_rounds, xgb_model=self.bst)
+            self.num_incremental_updates += 1
+        else:
+            dtrain = pack_sum_xgbmatrix(
+                features, normalized_throughputs, task_ids, normalized_throughputs
+            )
+            self.bst = self._train(dtrain, 10000)
+            self.num_incremental_updates = 0
+
+        # Update the model file if it has been set
+        if self.model_file:
+            self.save(self.model_file)
+
+    def _train(self, dtrain, num_boost_round, xgb_model=None):
+        """Train a xgb model with the pack-sum loss, continuing from xgb_model if given"""
+        return xgb.train(
             self.xgb_params,
             dtrain,
-            num_boost_round=10000,
+            num_boost_round=num_boost_round,
             obj=pack_sum_square_error,
             callbacks=[
                 custom_callback(
@@ -208,12 +259,9 @@ class XGBModel(PythonBasedModel):
                     verbose_eval=self.verbose_eval,
                 )
             ],
+            xgb_model=xgb_model,
         )
 
-        # Update the model file if it has been set
-        if self.model_file:
-            self.save(self.model_file)
-
     def predict(self, task, states):
         """Predict the scores of states
         Parameters
@@ -227,18 +275,16 @@ class XGBModel(PythonBasedModel):
         scores: List[float]
             The predicted scores for all states
         """
-        features = get_per_store_features_from_states(states, task)
+        features = get_per_store_features_from_states(states, task, csr=True)
         if self.bst is not None and len(self.inputs) > self.num_warmup_sample:
             dtest, pack_ids = feature_to_pack_sum_xgbmatrix(features)
             raw_preds = self.bst.predict(dtest)
-            ret = predict_throughput_pack_sum(raw_preds, pack_ids)
+            ret = predict_throughput_pack_sum(raw_preds, pack_ids, len(states))
         else:
             ret = np.random.uniform(0, 1, (len(states),))
 
         # Predict -inf for invalid states that failed to be lowered.
-        for idx, feature in enumerate(features):
-            if feature.min() == feature.max() == 0:
-                ret[idx] = float("-inf")
+        ret[features.invalid_mask()] = float("-inf")
 
         return ret
 
@@ -278,17 +324,18 @@ class XGBModel(PythonBasedModel):
         To implement this format, we also store int as float, so we can store all numbers
         into a single float array.
         """
-        features = get_per_store_features_from_states(states, task)
+        features = get_per_store_features_from_states(states, task, csr=True)
         if self.bst is not None and len(self.inputs) > self.num_warmup_sample:
             dtest, pack_ids = feature_to_pack_sum_xgbmatrix(features)
             raw_preds = self.bst.predict(dtest)
-            breakdown = predict_throughput_pack_sum(raw_preds, pack_ids)
-            stage_scores = [[] for _ in range(len(states))]
-            for pred, pack_id in zip(raw_preds, pack_ids):
-                stage_scores[pack_id].append(pred)
-            for idx, stage_score in enumerate(stage_scores):
-                breakdown = np.append(breakdown, len(stage_score))
-                breakdown = np.concatenate((breakdown, np.array(stage_score)))
+            n_states = len(states)
+            breakdown = np.empty(2 * n_states + len(raw_preds))
+            breakdown[:n_states] = predict_throughput_pack_sum(raw_preds, pack_ids, n_states)
+            # the stages of state i are preceded by their number and the stages of states < i
+            breakdown[n_states + features.offsets[:-1] + np.arange(n_states)] = (
+                features.row_counts()
+            )
+            breakdown[n_states + np.arange(len(raw_preds)) + pack_ids + 1] = raw_preds
         else:
             breakdown = np.concatenate(
                 (
@@ -300,9 +347,7 @@ class XGBModel(PythonBasedModel):
             )
 
         # Predict 0 for invalid states that failed to be lowered.
-        for idx, feature in enumerate(features):
-            if feature.min() == feature.max() == 0:
-                breakdown[idx] = float("-inf")
+        breakdown[: len(states)][features.invalid_mask()] = float("-inf")
 
         return breakdown
 
@@ -346,31 +391,25 @@ def feature_to_pack_sum_xgbmatrix(xs):
     """Convert an extracted multi-stage feature vector to a xgbmatrx in pack-sum format
     Parameters
     ----------
-    xs: np.ndarray
+    xs: Union[CSRFeatures, np.ndarray]
         The feature vector
     Returns
     -------
     dmatrix: xgb.DMatrix
         The DMatrix
-    pack_ids: List[int]
+    pack_ids: np.ndarray
         pack ids information
     """
-    x_flatten = []
-    pack_ids = []
-
-    for ct, x in enumerate(xs):
-        for row in x:
-            x_flatten.append(row)
-            pack_ids.append(ct)
-
-    return xgb.DMatrix(np.array(x_flatten)), pack_ids
+    if not isinstance(xs, CSRFeatures):
+        xs = CSRFeatures.from_list(xs)
+    return xgb.DMatrix(xs.data), xs.pack_ids()
 
 
 def pack_sum_xgbmatrix(xs, ys, gids=None, weights=None):
     """Convert (feature, label) pairs into a xgb matrix with pack-sum format
     Parameters
     ----------
-    xs: np.ndarray
+    xs: Union[CSRFeatures, np.ndarray]
         The feature vector
     ys: np.ndarray
         The normaizlied throughput
@@ -383,45 +422,31 @@ def pack_sum_xgbmatrix(xs, ys, gids=None, weights=None):
     dmatrix: xgb.DMatrix
         The DMatrix with pack-sum information
     """
+    if not isinstance(xs, CSRFeatures):
+        xs = CSRFeatures.from_list(xs)
+    ys = np.asarray(ys)
+
     if gids is not None:
         # sort by group
         indices = gids.argsort()
-        xs, ys = xs[indices], ys[indices]
+        xs, ys = xs.take(indices), ys[indices]
         group_sizes = np.bincount(gids)
         if weights is not None:
-            weights = weights[indices]
+            weights = np.asarray(weights)[indices]
     else:
         # assume it has only one group
         group_sizes = [len(xs)]
 
-    x_flatten = []
-    y_flatten = []
-    weights_flatten = []
-    pack_ids = []
-
-    if weights is not None:
-        for ct, (x, y, w) in enumerate(zip(xs, ys, weights)):
-            for row in x:
-                x_flatten.append(row)
-                y_flatten.append(y)
-                weights_flatten.append(w)
-                pack_ids.append(ct)
-    else:
-        for ct, (x, y) in enumerate(zip(xs, ys)):
-            for row in x:
-                x_flatten.append(row)
-                y_flatten.append(y)
-                pack_ids.append(ct)
-
-    ret = xgb.DMatrix(np.array(x_flatten), y_flatten)
+    row_counts = xs.row_counts()
+    ret = xgb.DMatrix(xs.data, np.repeat(ys, row_counts))
     if weights is not None:
-        ret.set_weight(weights_flatten)
-    dmatrix_context.set("pack_ids", ret, np.array(pack_ids))
+        ret.set_weight(np.repeat(weights, row_counts))
+    dmatrix_context.set("pack_ids", ret, xs.pack_ids())
     dmatrix_context.set("group_sizes", ret, group_sizes)
     return ret
 
 
-def predict_throughput_pack_sum(raw_preds, pack_ids):
+def predict_throughput_pack_sum(raw_preds, pack_ids, n_packs=0):
     """Predict the throughputs for predictions in pack-sum format
     Parameters
     ----------
@@ -429,12 +454,15 @@ def predict_throughput_pack_sum(raw_preds, pack_ids):
         The raw predictions
     pack_ids: List[int]
         The pack id for predictions
+    n_packs: int
+        The minimum number of packs, so that the trailing packs without
+        any prediction get a zero throughput
     Returns
     -------
     throughputs: np.ndarray
         The throughput
     """
-    sum_pred = np.bincount(pack_ids, weights=raw_preds)
+    sum_pred = np.bincount(pack_ids, weights=raw_preds, minlength=n_packs)
     return sum_pred
 
 
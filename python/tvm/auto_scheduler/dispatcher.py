@@ -34,6 +34,19 @@ from .utils import calc_workload_dis_factor, decode_workload_key
 
 logger = logging.getLogger("auto_scheduler")
 
+# The placeholder of the arguments that only need to divide each other to be compatible
+_DIVISIBLE = object()
+
+
+def _compatible_signature(workload_args):
+    """The workload arguments that must be equal for two workloads of the same hash to be
+    compatible, see calc_workload_dis_factor. Positive integers are masked out by a
+    placeholder, so the distance factor of any two workloads with the same signature
+    is either inf or at least 1."""
+    if workload_args is None:
+        return ()
+    return tuple(_DIVISIBLE if isinstance(x, int) and x > 0 else x for x in workload_args)
+
 
 class DispatchContext(object):
     """
@@ -143,8 +156,19 @@ class ApplyHistoryBest(DispatchContext):
         self.best_by_model = {}
         self._best_user_defined = {}
 
+        # Dict[tuple (id of a best record map, target key, workload hash),
+        #   Dict[tuple (compatible signature), List[tuple (cost, workload args, State)]]]
+        self._compatible_index = {}
+        # Dict[tuple (target model, target keys, workload key), Optional[State]]
+        self._query_cache = {}
+
         self.load(records, n_lines)
 
+    def _invalidate(self):
+        """Drop the compatible index and the memoized queries after the records changed"""
+        self._compatible_index = {}
+        self._query_cache = {}
+
     @staticmethod
     def get_workload_entry(best_records, target_key, workload_key):
         """Get the entry of the target key and workload key hash in the given best record map.
@@ -196,6 +220,7 @@ class ApplyHistoryBest(DispatchContext):
         if not records:
             return
 
+        self._invalidate()
         best_by_targetkey = self.best_by_targetkey
         best_by_model = self.best_by_model
 
@@ -244,53 +269,71 @@ class ApplyHistoryBest(DispatchContext):
                 " above the dispatcher call. So does other target. "
             )
 
-        def match_record(best_records, target_key, workload_key):
-            """The helper function to match the record in the given map
-            and return the matched state, or None if no match.
-            """
-            ret = None
+        target_keys = tuple(str(k) for k in target.keys)
+        key = (str(target.model), target_keys, workload_key)
+        if key in self._query_cache:
+            return self._query_cache[key]
 
-            entry, workload_hash, workload_args = self.get_workload_entry(
-                best_records, target_key, workload_key
-            )
-            if workload_args in entry:
-                ret = entry[workload_args][0]
-            elif self.include_compatible:
-                best_cost = float("inf")
-                for args, val in entry.items():
-                    dis_f = calc_workload_dis_factor(
-                        (workload_hash, workload_args), (workload_hash, args)
-                    )
-                    if dis_f == float("inf"):
-                        continue
-
-                    state, cost = val
-                    cost *= dis_f
-                    if ret is None or cost < best_cost:
-                        best_cost = cost
-                        ret = state
-            return ret
-
-        # first try matching by model
-        ret = match_record(self._best_user_defined, target.model, workload_key)
-        if ret is not None:
-            return ret
-        ret = match_record(self.best_by_model, target.model, workload_key)
-        if ret is not None:
-            return ret
-
-        # then try matching by target key
-        for k in target.keys:
-            ret = match_record(self._best_user_defined, k, workload_key)
-            if ret is not None:
-                return ret
-            ret = match_record(self.best_by_targetkey, k, workload_key)
+        workload_hash, workload_args = decode_workload_key(workload_key)
+        ret = None
+        # first try matching by model, then try matching by target key
+        candidates = [(self._best_user_defined, target.model), (self.best_by_model, target.model)]
+        for k in target_keys:
+            candidates += [(self._best_user_defined, k), (self.best_by_targetkey, k)]
+        for best_records, target_key in candidates:
+            ret = self._match_record(best_records, target_key, workload_hash, workload_args)
             if ret is not None:
-                return ret
+                break
 
-        return None
+        self._query_cache[key] = ret
+        return ret
+
+    def _match_record(self, best_records, target_key, workload_hash, workload_args):
+        """Match the record of a workload in the given best record map.
+
+        An exact match is a dictionary lookup. Otherwise, when include_compatible is set,
+        only the records with the same compatible signature are checked, from the fastest
+        one, until no remaining record can beat the best scaled cost.
+
+        Returns
+        -------
+        state : Optional[StateObject]
+            The matched state, or None if no match.
+        """
+        entry = best_records.get(target_key, {}).get(workload_hash)
+        if not entry:
+            return None
+        if workload_args in entry:
+            return entry[workload_args][0]
+        if not self.include_compatible:
+            return None
+
+        index_key = (id(best_records), target_key, workload_hash)
+        buckets = self._compatible_index.get(index_key)
+        if buckets is None:
+            buckets = {}
+            for args, (state, cost) in entry.items():
+                buckets.setdefault(_compatible_signature(args), []).append((cost, args, state))
+            for bucket in buckets.values():
+                bucket.sort(key=lambda x: x[0])
+            self._compatible_index[index_key] = buckets
+
+        ret = None
+        best_cost = float("inf")
+        for cost, args, state in buckets.get(_compatible_signature(workload_args), []):
+            if ret is not None and cost >= best_cost:
+                # dis_f >= 1 inside a bucket, so the remaining records cannot be better
+                break
+            dis_f = calc_workload_dis_factor((workload_hash, workload_args), (workload_hash, args))
+            if dis_f == float("inf"):
+                continue
+            if ret is None or cost * dis_f < best_cost:
+                best_cost = cost * dis_f
+                ret = state
+        return ret
 
     def update(self, target, workload_key, state):
+        self._invalidate()
         entry, _, workload_args = self.get_workload_entry(
             self._best_user_defined, target.model, workload_key
         )
@@ -0,0 +1,520 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=invalid-name
+
+"""The task scheduler that tunes tasks on several worker processes, possibly on other hosts.
+
+The coordinator keeps the scheduling strategy of :any:`TaskScheduler` and dispatches
+rounds of tasks to the idle workers. Every task is owned by one worker, which keeps its
+search policy and cost model across rounds, measures the programs with its own
+builder and runner, and sends the measured records back to the coordinator.
+A task chosen while its owner is busy moves to an idle worker, which rebuilds the
+search policy of the task from its records.
+
+A worker on another host is started with
+
+.. code-block:: bash
+
+    TVM_AUTO_SCHEDULER_AUTHKEY=<hex key> \\
+    python -m tvm.auto_scheduler.distributed_task_scheduler --host <coordinator> --port <port>
+"""
+import argparse
+import logging
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from multiprocessing.connection import Client, Listener, wait
+
+from .measure import LocalBuilder, LocalRunner, ProgramMeasurer
+from .measure_record import RecordReader, dump_record_to_string, load_record_from_string
+from .task_scheduler import TaskScheduler, make_search_policies
+from .utils import make_traceback_info
+from .workload_registry import (
+    serialize_workload_registry_entry,
+    deserialize_workload_registry_entry,
+)
+from . import _ffi_api
+
+logger = logging.getLogger("auto_scheduler")
+
+AUTHKEY_ENV = "TVM_AUTO_SCHEDULER_AUTHKEY"
+
+
+def _send(conn, msg):
+    # pylint: disable=import-outside-toplevel
+    import cloudpickle
+
+    conn.send_bytes(cloudpickle.dumps(msg, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _recv(conn):
+    return pickle.loads(conn.recv_bytes())
+
+
+class _Worker:
+    """The coordinator side of a worker"""
+
+    def __init__(self, conn, proc=None):
+        self.conn = conn
+        self.proc = proc
+        self.task_ids = []
+
+
+class DistributedTaskScheduler(TaskScheduler):
+    """
+    Allocate the time resources when tuning multiple tasks together on several workers.
+
+    The tasks are split among the workers, balancing their floating point operations.
+    The coordinator chooses the next task to tune with the scheduling strategy among
+    the tasks that are not being tuned, and sends it to its worker if that worker is
+    idle, or to any idle worker otherwise. The new worker rebuilds the search policy
+    of a moved task from the records of the task, so several rounds of different tasks
+    run at once and the tuning order follows the strategy whatever the assignment.
+    Tasks that have never been tuned are chosen first, as in the warm-up of
+    :any:`TaskScheduler`.
+
+    The records measured by the workers are passed to the measure callbacks of the
+    tuning options in the coordinator, e.g. appended to its log file.
+    With `load_log_file`, the status of the task scheduler is restored from the file and
+    every worker receives the records of its tasks to restore its search policies
+    and cost model, so the workers do not need to access the file.
+    If a worker is lost, its tasks are moved to the other workers with their records.
+
+    Parameters
+    ----------
+    tasks: List[SearchTask]
+        All tasks to tune
+    n_local_workers: int = 2
+        The number of worker processes started on this host
+    n_remote_workers: int = 0
+        The number of workers started on other hosts to wait for
+    host: str = "127.0.0.1"
+        The address the coordinator listens on.
+        Use an address reachable from the other hosts for remote workers.
+    port: int = 0
+        The port the coordinator listens on, 0 for any free port
+    authkey: Optional[bytes]
+        The key that authenticates the workers. It is required for remote workers,
+        and randomly generated for local workers only.
+    builder_kwargs: Optional[Dict[str, Any]]
+        The arguments of the LocalBuilder of every worker
+    runner_kwargs: Optional[Dict[str, Any]]
+        The arguments of the LocalRunner of every worker
+    connect_timeout: float = 300
+        The time in seconds to wait for all the workers to connect
+    **kwargs:
+        The other arguments of :any:`TaskScheduler`
+    """
+
+    def __init__(
+        self,
+        tasks,
+        n_local_workers=2,
+        n_remote_workers=0,
+        host="127.0.0.1",
+        port=0,
+        authkey=None,
+        builder_kwargs=None,
+        runner_kwargs=None,
+        connect_timeout=300,
+        **kwargs,
+    ):
+        super(DistributedTaskScheduler, self).__init__(tasks, **kwargs)
+        if n_local_workers + n_remote_workers <= 0:
+            raise ValueError("At least one worker is needed")
+        if n_remote_workers > 0 and authkey is None:
+            raise ValueError("An authkey is required for remote workers")
+
+        self.n_local_workers = n_local_workers
+        self.n_remote_workers = n_remote_workers
+        self.host = host
+        self.port = port
+        self.authkey = authkey if authkey is not None else os.urandom(16)
+        self.builder_kwargs = builder_kwargs or {}
+        self.runner_kwargs = runner_kwargs or {}
+        self.connect_timeout = connect_timeout
+
+        self.workers = []
+        self.task_records = [[] for _ in range(len(self.tasks))]
+        self.policy_config = None
+
+    def tune(
+        self,
+        tune_option,
+        search_policy="default",
+        search_policy_params=None,
+        adapative_training=False,
+    ):
+        """Tune a batch of tasks together on the workers.
+
+        Parameters
+        ----------
+        tune_option: TuningOptions
+            The options of tuning. The builder and the runner are not used, the workers
+            measure with their own LocalBuilder and LocalRunner.
+        search_policy: : str = "default"
+            The name of the search policy of the workers, see :any:`TaskScheduler.tune`
+        search_policy_params : Optional[Dict[str, Any]]
+            The parameters of the search policy
+        adapative_training : bool = False
+            Option used by XGBModel to reduce the model training frequency when there're
+            too many logs.
+        """
+        if not isinstance(search_policy, str):
+            raise ValueError("The search policies of the workers must be given by name")
+
+        # init members
+        self.tune_option = tune_option
+        early_stopping = 1e20 if tune_option.early_stopping < 0 else tune_option.early_stopping
+        self.ct = self.best_ct = 0
+        self.tic = time.time()
+
+        # reset num_measures_per_round to make sure every task is tuned at least once
+        self.num_measures_per_round = min(
+            tune_option.num_measures_per_round, tune_option.num_measure_trials // len(self.tasks)
+        )
+        if self.num_measures_per_round <= 0:
+            raise ValueError("num_measure_trials is too small. Please set it to a higher value.")
+
+        # restore the status of the task scheduler from a log file
+        if self.load_log_file:
+            self._restore_status(self.load_log_file, self.num_measures_per_round)
+            self._load_task_records(self.load_log_file)
+        self.best_score = self.cur_score
+
+        self.policy_config = {
+            "search_policy": search_policy,
+            "search_policy_params": search_policy_params,
+            "num_measures_per_round": self.num_measures_per_round,
+            "verbose": tune_option.verbose,
+            "load_model_file": self.load_model_file,
+            "adapative_training": adapative_training,
+            "builder_kwargs": self.builder_kwargs,
+            "runner_kwargs": self.runner_kwargs,
+            "cache_measure_results": self.cache_measure_results,
+        }
+
+        listener = Listener((self.host, self.port), authkey=self.authkey)
+        try:
+            self._connect_workers(listener)
+            self._assign_tasks()
+            self._run(tune_option.num_measure_trials, early_stopping)
+        finally:
+            self._close_workers()
+            listener.close()
+
+    def _load_task_records(self, log_file):
+        """Collect the records of every task in a log file to restore the workers"""
+        str_target = str(self.tasks[0].target)
+        workload_key_to_task_id = {t.workload_key: i for i, t in enumerate(self.tasks)}
+        for inp, res in RecordReader(log_file):
+            if str(inp.task.target) != str_target:
+                continue
+            task_idx = workload_key_to_task_id.get(inp.task.workload_key, None)
+            if task_idx is not None:
+                self.task_records[task_idx].append(dump_record_to_string(inp, res))
+
+    def _connect_workers(self, listener):
+        """Start the local workers and wait for all the workers to connect"""
+        host, port = listener.address
+        if host in ("0.0.0.0", ""):
+            host = "127.0.0.1"
+        env = dict(os.environ)
+        env[AUTHKEY_ENV] = self.authkey.hex()
+        # as the spawn start method of multiprocessing, so the workloads defined in
+        # the modules of the coordinator can be unpickled
+        env["PYTHONPATH"] = os.pathsep.join(x for x in sys.path if x)
+        procs = [
+            subprocess.Popen(
+                [sys.executable, "-m", __name__, "--host", host, "--port", str(port)], env=env
+            )
+            for _ in range(self.n_local_workers)
+        ]
+        if self.n_remote_workers > 0:
+            logger.info(
+                "DistributedTaskScheduler: Waiting for %d remote workers on %s:%d",
+                self.n_remote_workers,
+                listener.address[0],
+                port,
+            )
+
+        conns = []
+
+        def accept():
+            try:
+                while len(conns) < self.n_local_workers + self.n_remote_workers:
+                    conns.append(listener.accept())
+            except OSError:  # the listener is closed
+                pass
+
+        thread = threading.Thread(target=accept, daemon=True)
+        thread.start()
+        thread.join(self.connect_timeout)
+        if thread.is_alive():
+            for proc in procs:
+                proc.kill()
+            raise RuntimeError(
+                "Only %d of %d workers connected"
+                % (len(conns), self.n_local_workers + self.n_remote_workers)
+            )
+
+        # the processes are only kept to be waited for, any connection can be any worker
+        self.workers = [
+            _Worker(conn, procs[i] if i < len(procs) else None) for i, conn in enumerate(conns)
+        ]
+
+    def _assign_tasks(self, task_ids=None):
+        """Assign tasks to the workers with the least floating point operations"""
+        task_ids = range(len(self.tasks)) if task_ids is None else task_ids
+        new_task_ids = {worker: [] for worker in self.workers}
+        for task_idx in sorted(task_ids, key=lambda i: -self.flop_cts[i]):
+            worker = min(
+                self.workers, key=lambda w: sum(self.flop_cts[i] for i in w.task_ids)
+            )
+            worker.task_ids.append(task_idx)
+            new_task_ids[worker].append(task_idx)
+
+        for worker, ids in new_task_ids.items():
+            if ids:
+                self._init_tasks(worker, ids)
+
+    def _move_task(self, task_idx, worker):
+        """Move a task to another worker, which rebuilds its search policy from its records"""
+        owner = next(w for w in self.workers if task_idx in w.task_ids)
+        owner.task_ids.remove(task_idx)
+        try:
+            # the owner handles the message after its running round
+            _send(owner.conn, ("drop", task_idx))
+        except (EOFError, OSError):  # a lost owner is removed when its round is waited for
+            pass
+        worker.task_ids.append(task_idx)
+        self._init_tasks(worker, [task_idx])
+
+    def _init_tasks(self, worker, task_ids):
+        """Send tasks with their records to a worker to build their search policies"""
+        registry = []
+        for task_idx in task_ids:
+            entry = serialize_workload_registry_entry(self.tasks[task_idx].workload_key)
+            if entry not in registry:
+                registry.append(entry)
+        config = dict(self.policy_config)
+        config["registry"] = registry
+        # the tasks are unpickled after their workloads are registered
+        config["tasks"] = pickle.dumps([(i, self.tasks[i]) for i in task_ids])
+        config["records"] = [line for i in task_ids for line in self.task_records[i]]
+        _send(worker.conn, ("init", config))
+
+    def _run(self, num_measure_trials, early_stopping):
+        """Dispatch the rounds to the workers until the trials are used up"""
+        in_flight = {}  # worker -> task_idx
+        last_task_idx = -1
+        stopping = False
+        while True:
+            while not stopping:
+                # do not start a round that would exceed the number of trials
+                n_pending = len(in_flight) * self.num_measures_per_round
+                if self.ct + n_pending >= num_measure_trials:
+                    break
+                idle = [w for w in self.workers if w not in in_flight]
+                if not idle:
+                    break
+                busy_tasks = set(in_flight.values())
+                task_idx = None
+                for i in range(len(self.tasks)):
+                    if not self.task_cts[i] and i not in busy_tasks and i not in self.dead_tasks:
+                        task_idx = i
+                        break
+                if task_idx is None:
+                    task_idx = self._choose_task(last_task_idx, busy_tasks)
+                if task_idx is None:
+                    break
+                worker = next((w for w in idle if task_idx in w.task_ids), None)
+                if worker is None:
+                    worker = idle[0]
+                    self._move_task(task_idx, worker)
+                for callback in self.callbacks:
+                    callback.pre_tune(self, task_idx)
+                _send(worker.conn, ("tune", task_idx))
+                in_flight[worker] = task_idx
+                last_task_idx = task_idx
+
+            if not in_flight:
+                break
+
+            for conn in wait([w.conn for w in in_flight]):
+                worker = next(w for w in in_flight if w.conn is conn)
+                task_idx = in_flight.pop(worker)
+                try:
+                    msg = _recv(conn)
+                except (EOFError, OSError):
+                    self._remove_worker(worker)
+                    continue
+                if self._finish_round(task_idx, msg, early_stopping):
+                    stopping = True
+            if len(self.dead_tasks) == len(self.tasks):
+                stopping = True
+
+    def _finish_round(self, task_idx, msg, early_stopping):
+        """Record the result of a round sent by a worker, return whether to stop early"""
+        measure_inputs, measure_results = [], []
+        if msg[0] == "error":
+            logger.warning("DistributedTaskScheduler: Task %d failed: %s", task_idx, msg[2])
+        else:
+            for line in msg[2]:
+                inp, res = load_record_from_string(line)
+                measure_inputs.append(inp)
+                measure_results.append(res)
+            self.task_records[task_idx].extend(msg[2])
+            if measure_inputs and self.tune_option.measure_callbacks:
+                for callback in self.tune_option.measure_callbacks:
+                    _ffi_api.MeasureCallbackCallback(
+                        callback, None, measure_inputs, measure_results
+                    )
+
+        self._update_task_status(task_idx, measure_inputs, measure_results)
+        for callback in self.callbacks:
+            callback.post_tune(self, task_idx)
+        self._adjust_similarity_group(task_idx)
+        return self._stop_early(early_stopping)
+
+    def _remove_worker(self, worker):
+        """Move the tasks of a lost worker to the other workers"""
+        logger.warning(
+            "DistributedTaskScheduler: Lost a worker, move its %d tasks", len(worker.task_ids)
+        )
+        self.workers.remove(worker)
+        worker.conn.close()
+        if not self.workers:
+            raise RuntimeError("All the workers are lost")
+        self._assign_tasks(worker.task_ids)
+
+    def _close_workers(self):
+        for worker in self.workers:
+            try:
+                _send(worker.conn, ("stop",))
+                worker.conn.close()
+            except (EOFError, OSError):
+                pass
+        for worker in self.workers:
+            if worker.proc is not None:
+                try:
+                    worker.proc.wait(timeout=30)
+                except subprocess.TimeoutExpired:
+                    worker.proc.kill()
+        self.workers = []
+
+
+def run_worker(host, port, authkey):
+    """Run a worker of DistributedTaskScheduler until the coordinator stops it.
+
+    Parameters
+    ----------
+    host: str
+        The address of the coordinator
+    port: int
+        The port of the coordinator
+    authkey: bytes
+        The key that authenticates the worker
+    """
+    conn = Client((host, port), authkey=authkey)
+    policies = {}
+    measurer = None
+    num_measures_per_round = None
+    try:
+        while True:
+            try:
+                msg = _recv(conn)
+            except EOFError:
+                break
+            if msg[0] == "stop":
+                break
+
+            if msg[0] == "init":
+                config = msg[1]
+                for entry in config["registry"]:
+                    deserialize_workload_registry_entry(entry)
+                task_ids, tasks = zip(*pickle.loads(config["tasks"]))
+                num_measures_per_round = config["num_measures_per_round"]
+                if measurer is None:
+                    measurer = ProgramMeasurer(
+                        LocalBuilder(**config["builder_kwargs"]),
+                        LocalRunner(**config["runner_kwargs"]),
+                        [],
+                        config["verbose"],
+                        cache_results=config["cache_measure_results"],
+                    )
+                if config["cache_measure_results"] and config["records"]:
+                    records = [load_record_from_string(line) for line in config["records"]]
+                    measurer.add_to_result_cache(*zip(*records))
+                with tempfile.TemporaryDirectory() as tmp_dir:
+                    load_log_file = None
+                    if config["records"]:
+                        load_log_file = os.path.join(tmp_dir, "records.json")
+                        with open(load_log_file, "w") as fout:
+                            for line in config["records"]:
+                                fout.write(line if line.endswith("\n") else line + "\n")
+                    new_policies = make_search_policies(
+                        config["search_policy"],
+                        config["search_policy_params"],
+                        tasks,
+                        num_measures_per_round,
+                        config["verbose"],
+                        config["load_model_file"],
+                        load_log_file,
+                        config["adapative_training"],
+                    )
+                policies.update(zip(task_ids, new_policies))
+            elif msg[0] == "drop":
+                policies.pop(msg[1], None)
+            elif msg[0] == "tune":
+                task_idx = msg[1]
+                try:
+                    inputs, results = policies[task_idx].continue_search_one_round(
+                        num_measures_per_round, measurer
+                    )
+                    lines = [dump_record_to_string(inp, res) for inp, res in zip(inputs, results)]
+                    _send(conn, ("result", task_idx, lines))
+                except Exception:  # pylint: disable=broad-except
+                    _send(conn, ("error", task_idx, make_traceback_info()))
+    finally:
+        conn.close()
+
+
+def main():
+    """The main function for CLI."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", type=str, required=True, help="address of the coordinator")
+    parser.add_argument("--port", type=int, required=True, help="port of the coordinator")
+    args = parser.parse_args()
+    logging.basicConfig()
+
+    authkey = os.environ.get(AUTHKEY_ENV)
+    if authkey is None:
+        raise RuntimeError("Please set the authkey of the coordinator in " + AUTHKEY_ENV)
+
+    # pylint: disable=import-outside-toplevel, unused-import
+    import tvm.topi  # register the workloads of topi
+
+    run_worker(args.host, args.port, bytes.fromhex(authkey))
+
+
+if __name__ == "__main__":
+    main()
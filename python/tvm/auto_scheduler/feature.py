@@ -27,7 +27,6 @@ The feature specification is defined by `src/auto_scheduler/feature.cc::FeatureS
 """
 
 from typing import List, Tuple, Union, Optional
-import struct
 
 import numpy as np
 
@@ -46,6 +45,176 @@ SIZE_OF_INT32 = 4
 SIZE_OF_FLOAT32 = 4
 
 
+class CSRFeatures:
+    """The multi-stage feature vectors of several programs in a compressed sparse row layout.
+
+    The feature vectors of all stages of all programs are the rows of a single
+    float32 matrix, and the rows of program i are ``data[offsets[i]:offsets[i + 1]]``.
+    A program that failed to be lowered has a single row of zeros.
+
+    Parameters
+    ----------
+    data: np.ndarray
+        The float32 matrix of shape (n_rows, vec_len)
+    offsets: np.ndarray
+        The int64 row offsets of shape (n_programs + 1,)
+    """
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray):
+        self.data = data
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            if index < 0:
+                index += len(self)
+            return self.data[self.offsets[index] : self.offsets[index + 1]]
+        return self.take(np.arange(len(self))[index])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def row_counts(self) -> np.ndarray:
+        """The number of rows (stages) of every program"""
+        return np.diff(self.offsets)
+
+    def pack_ids(self) -> np.ndarray:
+        """The index of the program of every row"""
+        return np.repeat(np.arange(len(self)), self.row_counts())
+
+    def invalid_mask(self) -> np.ndarray:
+        """Whether the features of every program are all zeros,
+        i.e. the program failed to be lowered"""
+        if len(self) == 0:
+            return np.zeros(0, dtype=bool)
+        zero_rows = ~self.data.any(axis=1)
+        return np.logical_and.reduceat(zero_rows, self.offsets[:-1])
+
+    def take(self, indices) -> "CSRFeatures":
+        """Select programs
+
+        Parameters
+        ----------
+        indices: np.ndarray
+            The indices of the programs to select
+
+        Returns
+        -------
+        features: CSRFeatures
+            The features of the selected programs
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        counts = self.row_counts()[indices]
+        offsets = np.zeros(len(indices) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        rows = np.repeat(self.offsets[indices] - offsets[:-1], counts) + np.arange(offsets[-1])
+        return CSRFeatures(self.data[rows], offsets)
+
+    @staticmethod
+    def concatenate(features_list: List["CSRFeatures"]) -> "CSRFeatures":
+        """Concatenate the features of several groups of programs"""
+        offsets = [np.zeros(1, dtype=np.int64)]
+        base = 0
+        for features in features_list:
+            offsets.append(features.offsets[1:] + base)
+            base += features.offsets[-1]
+        data = np.concatenate([features.data for features in features_list])
+        return CSRFeatures(data, np.concatenate(offsets))
+
+    @staticmethod
+    def from_list(xs) -> "CSRFeatures":
+        """Build from a sequence of 2-D feature arrays, one per program,
+        e.g. the output of the legacy :any:`unpack_feature`"""
+        xs = [np.asarray(x, dtype=np.float32).reshape(-1, DEFAULT_FEATURE_VEC_LEN) for x in xs]
+        offsets = np.zeros(len(xs) + 1, dtype=np.int64)
+        np.cumsum([len(x) for x in xs], out=offsets[1:])
+        if xs:
+            data = np.concatenate(xs)
+        else:
+            data = np.zeros((0, DEFAULT_FEATURE_VEC_LEN), dtype=np.float32)
+        return CSRFeatures(data, offsets)
+
+
+def unpack_feature_csr(byte_arr: bytearray) -> Tuple[CSRFeatures, np.ndarray, np.ndarray]:
+    """Unpack the flatten feature (in byte array format) from c++ into a CSRFeatures.
+
+    The sizes, the throughputs and the task ids are read through numpy views of the byte
+    array, and the feature rows of all programs are gathered into one matrix with a single
+    vectorized copy, without any per-row python object.
+    See :any:`unpack_feature` for the packed format.
+
+    Parameters
+    ----------
+    byte_arr: bytearray
+        The two-dimensional feature vector in serialized byte array format
+
+    Returns
+    -------
+    features: CSRFeatures
+        Feature vectors
+    normalized_throughputs: np.ndarray
+        Normalized throughputs
+    task_ids: np.ndarray
+        Task ids
+    """
+    vec_len = DEFAULT_FEATURE_VEC_LEN
+    int_view = np.frombuffer(byte_arr, dtype=np.int32)
+    float_view = np.frombuffer(byte_arr, dtype=np.float32)
+
+    # unpack sizes
+    n = int(int_view[0])
+    sizes = int_view[1 : n + 3].astype(np.int64)
+    begin = n + 3
+
+    # The features of program i are either empty (failed during lowering), or
+    # {
+    #   float n_stage;                        // The number of stages
+    #   float feature_vecs[n_stage][vec_len]  // The feature vector for each stage
+    # }
+    feature_sizes = sizes[:n]
+    starts = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(feature_sizes, out=starts[1:])
+    region = float_view[begin : begin + starts[-1]]
+
+    valid = feature_sizes > 0
+    n_stmts = np.ones(n, dtype=np.int64)
+    n_stmts[valid] = (region[starts[:-1][valid]] + 0.5).astype(np.int64)
+    vec_lens = (feature_sizes[valid] - 1) // np.maximum(n_stmts[valid], 1)
+    assert np.all(vec_lens == vec_len), (
+        "The lenght of feature vector is wrong. Expected %d but got %s." % (vec_len, vec_lens)
+    )
+    assert np.all(vec_lens * n_stmts[valid] == feature_sizes[valid] - 1)
+
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(n_stmts, out=offsets[1:])
+    data = np.zeros((offsets[-1], vec_len), dtype=np.float32)
+    if starts[-1] > 0:
+        # drop the n_stage headers, the remaining floats are the rows of the valid programs
+        mask = np.ones(len(region), dtype=bool)
+        mask[starts[:-1][valid]] = False
+        valid_rows = np.repeat(valid, n_stmts)
+        data[valid_rows] = region[mask].reshape(-1, vec_len)
+    offset = begin + starts[-1]
+
+    # unpack normalized_throughputs
+    m = int(sizes[-2])
+    normalized_throughputs = float_view[offset : offset + m].astype(np.float64)
+    offset += m
+
+    # unpack task_ids
+    m = int(sizes[-1])
+    task_ids = int_view[offset : offset + m].astype(np.int64)
+    offset += m
+
+    n_bytes = offset * SIZE_OF_INT32
+    assert n_bytes == len(byte_arr), "%d vs %d" % (n_bytes, len(byte_arr))
+    return CSRFeatures(data, offsets), normalized_throughputs, task_ids
+
+
 def unpack_feature(byte_arr: bytearray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """Unpack the flatten feature (in byte array format) from c++
 
@@ -86,69 +255,14 @@ def unpack_feature(byte_arr: bytearray) -> Tuple[np.ndarray, np.ndarray, np.ndar
     To implement this format, we also store int as float, so we can store all numbers
     into a single float array.
     """
-    vec_len = DEFAULT_FEATURE_VEC_LEN
-
-    # unpack sizes
-    offset = 0
-    n = struct.unpack_from("1i", byte_arr, offset=offset)[0]
-    offset += SIZE_OF_INT32
-
-    sizes = struct.unpack_from("%di" % (n + 2), byte_arr, offset=offset)
-    offset += SIZE_OF_INT32 * (n + 2)
-
-    # unpack features
-    features = []
-    for size in sizes[:-2]:
-        row = []
-
-        # Now, we need to unpack the feature for multiple statements.
-        # The format is:
-        # {
-        #   int   n_stage;                        // The number of stages
-        #   float feature_vecs[n_stage][vec_len]  // The feature vector for each stage
-        # }
-        # where vec_len can be calculated by `(size - 1) / n_stmts`
-
-        if size == 0:
-            # failed during lowering
-            features.append(np.zeros((1, vec_len)))
-        else:
-            n_stmts = struct.unpack_from("f", byte_arr, offset=offset)
-            offset += SIZE_OF_FLOAT32
-
-            n_stmts = int(n_stmts[0] + 0.5)
-            tmp_vec_len = (size - 1) // n_stmts
-            assert (
-                tmp_vec_len == vec_len
-            ), "The lenght of feature vector is wrong. " "Expected %d but got %d." % (
-                vec_len,
-                tmp_vec_len,
-            )
-            assert tmp_vec_len * n_stmts == size - 1
-            for _ in range(n_stmts):
-                x = struct.unpack_from("%df" % vec_len, byte_arr, offset=offset)
-                offset += vec_len * SIZE_OF_FLOAT32
-                row.append(x)
-
-            features.append(np.array(row))
-
-    # unpack normalized_throughputs
-    m = sizes[-2]
-    normalized_throughputs = struct.unpack_from("%df" % m, byte_arr, offset=offset)
-    offset += m * SIZE_OF_FLOAT32
-
-    # unpack task_ids
-    m = sizes[-1]
-    task_ids = struct.unpack_from("%di" % m, byte_arr, offset=offset)
-    offset += m * SIZE_OF_INT32
-
-    assert offset == len(byte_arr), "%d vs %d" % (offset, len(byte_arr))
-    return np.array(features, dtype=object), np.array(normalized_throughputs), np.array(task_ids)
+    features, normalized_throughputs, task_ids = unpack_feature_csr(byte_arr)
+    features = [x.astype(np.float64) for x in features]
+    return np.array(features, dtype=object), normalized_throughputs, task_ids
 
 
 def get_per_store_features_from_file(
-    filename: str, max_lines: int, max_n_bufs: Optional[int] = None
-) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    filename: str, max_lines: int, max_n_bufs: Optional[int] = None, csr: bool = False
+) -> Tuple[Union[np.ndarray, CSRFeatures], np.ndarray, np.ndarray]:
     """Get per-store features from a log file
 
     Parameters
@@ -159,10 +273,12 @@ def get_per_store_features_from_file(
         Only extract the first n lines of the file
     max_n_bufs: Optional[int]
         The maximum number of extracted buffers for one statement
+    csr: bool
+        Whether to return the features as a CSRFeatures instead of an object array
 
     Returns
     -------
-    features: np.ndarray
+    features: Union[np.ndarray, CSRFeatures]
         Feature vectors
     normalized_throughputs: np.ndarray
         Normalized throughputs
@@ -172,7 +288,7 @@ def get_per_store_features_from_file(
     byte_arr = _ffi_api.GetPerStoreFeaturesFromFile(
         filename, max_lines, max_n_bufs or DEFAULT_MAX_N_BUFS
     )
-    return unpack_feature(byte_arr)
+    return unpack_feature_csr(byte_arr) if csr else unpack_feature(byte_arr)
 
 
 def get_per_store_features_from_measure_pairs(
@@ -180,7 +296,8 @@ def get_per_store_features_from_measure_pairs(
     results: List[MeasureResult],
     skip_first_n_feature_extraction: int = 0,
     max_n_bufs: Optional[int] = None,
-) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    csr: bool = False,
+) -> Tuple[Union[np.ndarray, CSRFeatures], np.ndarray, np.ndarray]:
     """Get per-store features from measurement input/result pairs
 
     Parameters
@@ -193,10 +310,12 @@ def get_per_store_features_from_measure_pairs(
         Skip feature extraction for the first n states
     max_n_bufs: int
         The maximum number of extracted buffers for one statement
+    csr: bool
+        Whether to return the features as a CSRFeatures instead of an object array
 
     Returns
     -------
-    features: np.ndarray
+    features: Union[np.ndarray, CSRFeatures]
         Feature vectors
     normalized_throughputs: np.ndarray
         Normalized throughputs
@@ -206,12 +325,15 @@ def get_per_store_features_from_measure_pairs(
     byte_arr = _ffi_api.GetPerStoreFeaturesFromMeasurePairs(
         inputs, results, skip_first_n_feature_extraction, max_n_bufs or DEFAULT_MAX_N_BUFS
     )
-    return unpack_feature(byte_arr)
+    return unpack_feature_csr(byte_arr) if csr else unpack_feature(byte_arr)
 
 
 def get_per_store_features_from_states(
-    states: List[Union[State, StateObject]], task: "SearchTask", max_n_bufs: Optional[int] = None
-) -> np.ndarray:
+    states: List[Union[State, StateObject]],
+    task: "SearchTask",
+    max_n_bufs: Optional[int] = None,
+    csr: bool = False,
+) -> Union[np.ndarray, CSRFeatures]:
     """Get per-store features from measurement input/result pairs
 
     Parameters
@@ -222,10 +344,12 @@ def get_per_store_features_from_states(
         The search task of the input states
     max_n_bufs: Optional[int]
         The maximum number of extracted buffers for one statement
+    csr: bool
+        Whether to return the features as a CSRFeatures instead of an object array
 
     Returns
     -------
-    features: np.ndarray
+    features: Union[np.ndarray, CSRFeatures]
         Feature vectors
     """
     if isinstance(states[0], State):
@@ -235,7 +359,7 @@ def get_per_store_features_from_states(
     byte_arr = _ffi_api.GetPerStoreFeaturesFromStates(
         state_objects, task, max_n_bufs or DEFAULT_MAX_N_BUFS
     )
-    return unpack_feature(byte_arr)[0]
+    return unpack_feature_csr(byte_arr)[0] if csr else unpack_feature(byte_arr)[0]
 
 
 def get_per_store_feature_names(max_n_bufs: Optional[int] = None) -> List[str]:
@@ -34,6 +34,7 @@ We implement these in python to utilize python's multiprocessing and error handl
 import os
 import time
 import shutil
+import pickle
 import tempfile
 import multiprocessing
 
@@ -41,10 +42,12 @@ import tvm._ffi
 from tvm.runtime import Object, module, ndarray
 from tvm.driver import build_module
 from tvm.ir import transform
-from tvm.autotvm.measure.measure_methods import set_cuda_target_arch
+from tvm.autotvm.measure.measure_methods import probe_cutoff, set_cuda_target_arch
 from tvm.contrib import tar, ndk
+from tvm.contrib.cpu_slots import CPUSlotExecutor
+from tvm.contrib.popen_pool import PopenPoolExecutor
 
-from . import _ffi_api
+from . import _ffi_api, workload_registry
 from .loop_state import StateObject
 from .utils import (
     call_func_with_timeout,
@@ -63,6 +66,9 @@ from .workload_registry import (
 # We use 1e10 instead of sys.float_info.max for better readability in log
 MAX_FLOAT = 1e10
 
+# The error message of a successful measurement that was stopped early by its cutoff
+CENSORED_MSG = "censored by the early abort cutoff, the cost is the one of the probe"
+
 
 class BuildFunc:
     """store build_func name and callable to class variable.
@@ -76,6 +82,138 @@ class BuildFunc:
     build_func = tar.tar
 
 
+class LocalBuildPool:
+    """store the persistent build worker processes of LocalBuilder to class variable.
+    The workers are kept warm across measurement rounds, and the pool is recreated
+    when the number of workers or the timeout changes.
+    pool: Optional[PopenPoolExecutor] = None
+        The pool of build workers.
+    config: Optional[Tuple[int, int]] = None
+        The (n_parallel, timeout) of the pool.
+    """
+
+    pool = None
+    config = None
+
+    @classmethod
+    def get(cls, n_parallel, timeout):
+        """Get the pool of build workers with the given configuration."""
+        if cls.pool is None or cls.config != (n_parallel, timeout):
+            cls.pool = PopenPoolExecutor(
+                max_workers=n_parallel, timeout=timeout, initializer=_init_build_worker
+            )
+            cls.config = (n_parallel, timeout)
+        return cls.pool
+
+
+class LocalRunSlots:
+    """store the CPU slot executors of LocalRunner objects to class variable.
+    The runners pass themselves to their run function, which looks their executor up here.
+    executors: Dict[int, CPUSlotExecutor] = {}
+        The executors that measure programs concurrently in worker processes pinned
+        to disjoint CPU sets, keyed by the address of their runner object.
+        A runner without an executor measures the programs one at a time.
+    """
+
+    executors = {}
+
+    @classmethod
+    def set(cls, runner, executor):
+        """Set the executor of a runner. This replaces the executor of a deleted runner
+        that had the same address."""
+        if executor is None:
+            cls.executors.pop(runner.handle.value, None)
+        else:
+            cls.executors[runner.handle.value] = executor
+
+    @classmethod
+    def get(cls, runner):
+        """Get the executor of a runner, None to measure its programs one at a time."""
+        return None if runner is None else cls.executors.get(runner.handle.value)
+
+    @classmethod
+    def release(cls, runner):
+        """Remove the executor of a runner and kill its worker processes."""
+        executor = cls.executors.pop(runner.handle.value, None)
+        if executor is not None:
+            executor.kill_workers()
+
+
+class RunCutoff:
+    """The early abort state of a LocalRunner or RPCRunner.
+    The states of the runners are stored to class variable, the runners pass themselves
+    to their run functions, which look their state up here.
+    states: Dict[int, RunCutoff] = {}
+        The state of every runner with an early abort ratio,
+        keyed by the address of the runner object.
+
+    Parameters
+    ----------
+    ratio: Optional[float]
+        A program whose probe is slower than this ratio times the best cost of its task
+        so far is not timed further, None to time every program fully.
+        It is at least 1, so that no program faster than the best is censored.
+
+    Attributes
+    ----------
+    best_costs: Dict[Tuple[str, str], float]
+        The best cost of every (workload key, target) measured by the runner.
+    n_censored: int
+        The number of programs measured slower than their cutoff.
+    """
+
+    states = {}
+
+    def __init__(self, ratio=None):
+        if ratio is not None and ratio < 1:
+            raise ValueError("early_abort_ratio must be at least 1, got %s" % ratio)
+        self.ratio = ratio
+        self.best_costs = {}
+        self.n_censored = 0
+
+    @classmethod
+    def set(cls, runner, ratio):
+        """Set a new state of a runner. This replaces the state of a deleted runner
+        that had the same address."""
+        if ratio is None:
+            cls.states.pop(runner.handle.value, None)
+        else:
+            cls.states[runner.handle.value] = cls(ratio)
+
+    @classmethod
+    def release(cls, runner):
+        """Remove the state of a runner."""
+        cls.states.pop(runner.handle.value, None)
+
+    @classmethod
+    def of(cls, runner):
+        """Get the state of a runner, a state without early abort if it has none."""
+        if runner is None or runner.handle.value not in cls.states:
+            return cls()
+        return cls.states[runner.handle.value]
+
+    def get(self, inp):
+        """Get the cost beyond which a program is not timed further, None for no cutoff"""
+        if self.ratio is None:
+            return None
+        best = self.best_costs.get((inp.task.workload_key, str(inp.task.target)))
+        return None if best is None else best * self.ratio
+
+    def update(self, inp, res):
+        """Update the best cost of the task of a program with its measure result tuple"""
+        costs, error_no, error_msg = res[:3]
+        if self.ratio is None or error_no != MeasureErrorNo.NO_ERROR:
+            return
+        if error_msg == CENSORED_MSG:
+            # slower than the cutoff, so it is not the best
+            self.n_censored += 1
+            return
+        cost = sum(costs) / len(costs)
+        key = (inp.task.workload_key, str(inp.task.target))
+        if cost < self.best_costs.get(key, MAX_FLOAT):
+            self.best_costs[key] = cost
+
+
 @tvm._ffi.register_object("auto_scheduler.MeasureCallback")
 class MeasureCallback(Object):
     """ The base class of measurement callback functions. """
@@ -276,6 +414,19 @@ class ProgramRunner(Object):
         """
         return _ffi_api.ProgramRunnerRun(self, measure_inputs, build_results, verbose)
 
+    def close(self):
+        """Release the state kept for the runner in Python, i.e. the worker processes
+        of its CPU slots and its early abort state. They are kept until then, as the
+        Python object of a runner may be dropped while the runner is still in use."""
+        LocalRunSlots.release(self)
+        RunCutoff.release(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
 
 @tvm._ffi.register_object("auto_scheduler.ProgramMeasurer")
 class ProgramMeasurer(Object):
@@ -295,14 +446,77 @@ class ProgramMeasurer(Object):
         The Verbosity level: 0 for silent, 1 to output information during program
     max_continuous_error : Optional[int]
         The number of allowed maximum continuous error before stop the tuning
+    cache_results : bool = False
+        Whether to reuse the results of programs that lower to the same module.
+        A program is looked up by a structural hash of its lowered module and its target,
+        and a successful result of the same program is returned without building and
+        running it again.
     """
 
-    def __init__(self, builder, runner, callbacks, verbose, max_continuous_error=None):
+    def __init__(
+        self, builder, runner, callbacks, verbose, max_continuous_error=None, cache_results=False
+    ):
         max_continuous_error = max_continuous_error or -1  # -1 means using the default value
         self.__init_handle_by_constructor__(
-            _ffi_api.ProgramMeasurer, builder, runner, callbacks, verbose, max_continuous_error
+            _ffi_api.ProgramMeasurer,
+            builder,
+            runner,
+            callbacks,
+            verbose,
+            max_continuous_error,
+            cache_results,
         )
 
+    def add_to_result_cache(self, inputs, results):
+        """Add the successful results of measured programs to the result cache,
+        e.g. the records of a log file of a previous tuning.
+
+        Parameters
+        ----------
+        inputs : List[MeasureInput]
+            The measure inputs
+        results : List[MeasureResult]
+            The measure results
+        """
+        _ffi_api.ProgramMeasurerAddToResultCache(self, inputs, results)
+
+    def measure(self, task, inputs):
+        """Build and run programs, without calling the callbacks.
+        With cache_results, the cached and duplicate programs are not built and run again,
+        and their results are copies with an all_cost of 0.
+
+        Parameters
+        ----------
+        task : SearchTask
+            The search task of the programs
+        inputs : List[MeasureInput]
+            The measure inputs
+
+        Returns
+        -------
+        results : List[MeasureResult]
+            The measure results
+        """
+        return _ffi_api.ProgramMeasurerSilentMeasure(self, task, inputs)
+
+    def result_cache_stats(self):
+        """Get the statistics of the result cache
+
+        Returns
+        -------
+        stats : Dict[str, Union[int, float]]
+            The number of programs looked up in the cache ("queries"), the number of
+            programs whose result is taken from the cache ("hits"), the hit rate
+            ("hit_rate") and the number of cached results ("size").
+        """
+        queries, hits, size = [int(x) for x in _ffi_api.ProgramMeasurerResultCacheStats(self)]
+        return {
+            "queries": queries,
+            "hits": hits,
+            "hit_rate": hits / queries if queries else 0.0,
+            "size": size,
+        }
+
 
 @tvm._ffi.register_object("auto_scheduler.LocalBuilder")
 class LocalBuilder(ProgramBuilder):
@@ -311,10 +525,10 @@ class LocalBuilder(ProgramBuilder):
     Parameters
     ----------
     timeout : int = 15
-        The timeout limit (in second) for each build thread.
-        This is used in a wrapper of the multiprocessing.Process.join().
+        The timeout limit (in second) for each build.
+        A build worker that exceeds it is killed and restarted.
     n_parallel : int = multiprocessing.cpu_count()
-        Number of threads used to build in parallel.
+        Number of persistent worker processes used to build in parallel.
     build_func: callable or str = "default"
         If is 'default', use default build function
         If is 'ndk', use function for android ndk
@@ -372,6 +586,25 @@ class LocalRunner(ProgramRunner):
         its actual latency during end-to-end inference.
         To make this option effective, the argument `number` should also be set to 1.
         This is only has effect on CPU task.
+    cpu_slots : Optional[Union[int, List[List[int]]]] = None
+        Measure several programs at once, each in a worker process pinned to its own
+        CPU set. It is either the CPU sets, or the number of sets to split the host into
+        (non-positive for as many as fit), see :code:`tvm.contrib.cpu_slots.partition_cpus`.
+        This is meant for CPU tasks whose programs use a few threads.
+        With None, the programs are measured one at a time.
+        The worker processes stay alive until :any:`close` is called, so call it when the
+        runner is no longer used, or use the runner as a context manager.
+    cores_per_slot : int = 1
+        The number of physical cores of a CPU set when cpu_slots is a number.
+    per_numa_node : bool = True
+        Whether to keep a CPU set inside one NUMA node when cpu_slots is a number.
+    early_abort_ratio : Optional[float] = None
+        Stop timing a program whose probe, one repeat after a warm-up, is slower than this
+        ratio times the best cost of its task so far, and record the cost of the probe only
+        (a censored result, whose error_msg is CENSORED_MSG). This saves the device time of
+        the whole number x repeat x min_repeat_ms budget on programs that cannot be the best.
+        None to time every program fully. The ratio is at least 1, so that no program
+        faster than the best is censored. The state of the runner is kept until :any:`close`.
     """
 
     def __init__(
@@ -382,6 +615,10 @@ class LocalRunner(ProgramRunner):
         min_repeat_ms=100,
         cooldown_interval=0.0,
         enable_cpu_cache_flush=False,
+        cpu_slots=None,
+        cores_per_slot=1,
+        per_numa_node=True,
+        early_abort_ratio=None,
     ):
         if enable_cpu_cache_flush:
             number = 1
@@ -396,6 +633,26 @@ class LocalRunner(ProgramRunner):
             cooldown_interval,
             enable_cpu_cache_flush,
         )
+        RunCutoff.set(self, early_abort_ratio)
+        if cpu_slots is not None:
+            executor = CPUSlotExecutor(cpu_slots, cores_per_slot, per_numa_node, timeout=timeout)
+        else:
+            executor = None
+        LocalRunSlots.set(self, executor)
+
+    def slot_stats(self):
+        """Get the timing stability of every CPU set when cpu_slots is used,
+        see :code:`tvm.contrib.cpu_slots.CPUSlotExecutor.slot_stats`.
+
+        Returns
+        -------
+        stats : List[Dict[str, Any]]
+            The stability of every CPU set, empty if cpu_slots is not used.
+        """
+        executor = LocalRunSlots.get(self)
+        if executor is None:
+            return []
+        return executor.slot_stats()
 
 
 @tvm._ffi.register_object("auto_scheduler.RPCRunner")
@@ -443,6 +700,13 @@ class RPCRunner(ProgramRunner):
         its actual latency during end-to-end inference.
         To make this option effective, the argument `number` should also be set to 1.
         This is only has effect on CPU task.
+    early_abort_ratio : Optional[float] = None
+        Stop timing a program whose probe, one repeat after a warm-up, is slower than this
+        ratio times the best cost of its task so far, and record the cost of the probe only
+        (a censored result, whose error_msg is CENSORED_MSG). This saves the device time of
+        the whole number x repeat x min_repeat_ms budget on programs that cannot be the best.
+        None to time every program fully. The ratio is at least 1, so that no program
+        faster than the best is censored. The state of the runner is kept until :any:`close`.
     """
 
     def __init__(
@@ -458,6 +722,7 @@ class RPCRunner(ProgramRunner):
         min_repeat_ms=100,
         cooldown_interval=0.0,
         enable_cpu_cache_flush=False,
+        early_abort_ratio=None,
     ):
         self.__init_handle_by_constructor__(
             _ffi_api.RPCRunner,
@@ -473,6 +738,7 @@ class RPCRunner(ProgramRunner):
             cooldown_interval,
             enable_cpu_cache_flush,
         )
+        RunCutoff.set(self, early_abort_ratio)
 
         if check_remote(key, host, port, priority, timeout):
             print("Get devices for measurement successfully!")
@@ -522,6 +788,12 @@ class LocalRPCMeasureContext:
         its actual latency during end-to-end inference.
         To make this option effective, the argument `number` should also be set to 1.
         This is only has effect on CPU task.
+    early_abort_ratio : Optional[float] = None
+        Stop timing a program whose probe, one repeat after a warm-up, is slower than this
+        ratio times the best cost of its task so far, and record the cost of the probe only
+        (a censored result, whose error_msg is CENSORED_MSG). This saves the device time of
+        the whole number x repeat x min_repeat_ms budget on programs that cannot be the best.
+        None to time every program fully.
     """
 
     def __init__(
@@ -534,6 +806,7 @@ class LocalRPCMeasureContext:
         min_repeat_ms=0,
         cooldown_interval=0.0,
         enable_cpu_cache_flush=False,
+        early_abort_ratio=None,
     ):
         # pylint: disable=import-outside-toplevel
         from tvm.rpc.tracker import Tracker
@@ -567,12 +840,14 @@ class LocalRPCMeasureContext:
             min_repeat_ms,
             cooldown_interval,
             enable_cpu_cache_flush,
+            early_abort_ratio,
         )
         # Wait for the processes to start
         time.sleep(0.5)
 
     def __del__(self):
         # Close the tracker and server before exit
+        self.runner.close()
         self.tracker.terminate()
         self.server.terminate()
         time.sleep(0.5)
@@ -593,9 +868,7 @@ class MeasureErrorNo(object):
     UNKNOWN_ERROR = 8  # Unknown error
 
 
-def _timed_func(inp_serialized, build_func, verbose):
-    tic = time.time()
-    inp = MeasureInput.deserialize(inp_serialized)
+def _timed_build(inp, build_func, verbose, tic):
     task = inp.task
 
     error_no = MeasureErrorNo.NO_ERROR
@@ -637,37 +910,41 @@ def _timed_func(inp_serialized, build_func, verbose):
     return filename, args, error_no, error_msg, time.time() - tic
 
 
-def local_build_worker(args):
+def _init_build_worker():
+    """Import the modules needed by the builds once per worker process"""
+    # pylint: disable=import-outside-toplevel, unused-import
+    import tvm.auto_scheduler
+    import tvm.topi
+
+
+def _build_in_worker(inp_str, registry_name, registry_value, build_func, verbose):
     """
-    Build function of LocalBuilder to be ran in the Builder thread pool.
+    Build a MeasureInput in a persistent worker process of LocalBuilder.
 
     Parameters
     ----------
-    args: Tuple[MeasureInput, str, int, int]
-        inputs, build-func, time, verbose args passed to local_builder_build
+    inp_str: str
+        The MeasureInput serialized by SerializeMeasureInput.
+    registry_name: str
+        The name of the workload registry entry of the MeasureInput.
+    registry_value: bytes
+        The pickled value of the workload registry entry. It is only unpickled
+        by the workers that have not registered the entry yet.
+    build_func: callable
+        The build function to process the built module.
+    verbose: int
+        Verbosity level.
 
     Returns
     -------
-    res : BuildResult
-        The build result of this Builder thread.
+    res : Tuple
+        The fields of the BuildResult.
     """
-    inp, build_func, timeout, verbose = args
-    assert build_func == BuildFunc.name, (
-        "BuildFunc.name: " + BuildFunc.name + ", but args is: " + build_func
-    )
-    build_func = BuildFunc.build_func
-
-    res = call_func_with_timeout(timeout, _timed_func, args=(inp, build_func, verbose))
-    if isinstance(res, TimeoutError):
-        if verbose >= 1:
-            print(".T", end="", flush=True)  # Build timeout
-        res = None, [], MeasureErrorNo.BUILD_TIMEOUT, None, timeout
-    elif isinstance(res, Exception):
-        if verbose >= 1:
-            print(".E", end="", flush=True)  # Build error
-        res = None, [], MeasureErrorNo.COMPILE_HOST, str(res), timeout
-
-    return res
+    tic = time.time()
+    if registry_name not in workload_registry.WORKLOAD_FUNC_REGISTRY:
+        deserialize_workload_registry_entry((registry_name, pickle.loads(registry_value)))
+    inp = recover_measure_input(_ffi_api.DeserializeMeasureInput(inp_str))
+    return _timed_build(inp, build_func, verbose, tic)
 
 
 @tvm._ffi.register_func("auto_scheduler.local_builder.build")
@@ -675,15 +952,17 @@ def local_builder_build(inputs, timeout, n_parallel, build_func="default", verbo
     """
     Build function of LocalBuilder to build the MeasureInputs to runnable modules.
 
+    The builds run in a pool of persistent worker processes that is shared by
+    the measurement rounds. A worker that hangs or crashes is killed and restarted.
+
     Parameters
     ----------
     inputs : List[MeasureInput]
         The MeasureInputs to be built.
     timeout : int
-        The timeout limit (in second) for each build thread.
-        This is used in a wrapper of the multiprocessing.Process.join().
+        The timeout limit (in second) for each build.
     n_parallel : int
-        Number of threads used to build in parallel.
+        Number of worker processes used to build in parallel.
     build_func : str = 'default'
         The name of build function to process the built module.
     verbose: int = 1
@@ -694,26 +973,46 @@ def local_builder_build(inputs, timeout, n_parallel, build_func="default", verbo
     res : List[BuildResult]
         The build results of these MeasureInputs.
     """
-    # This pool is not doing computationally intensive work, so we can use threads
-    pool = multiprocessing.pool.ThreadPool(n_parallel)
-    tuple_res = pool.map(
-        local_build_worker,
-        [
-            (
-                i.serialize(),
-                build_func,
-                timeout,
+    # pylint: disable=import-outside-toplevel
+    import cloudpickle
+
+    assert build_func == BuildFunc.name, (
+        "BuildFunc.name: " + BuildFunc.name + ", but args is: " + build_func
+    )
+    pool = LocalBuildPool.get(n_parallel, timeout)
+
+    # pickle the workload registry entry once per workload instead of once per input
+    registry_entries = {}
+    futures = []
+    for inp in inputs:
+        workload_key = inp.task.workload_key
+        if workload_key not in registry_entries:
+            name, value = serialize_workload_registry_entry(workload_key)
+            registry_entries[workload_key] = (name, cloudpickle.dumps(value))
+        name, value = registry_entries[workload_key]
+        futures.append(
+            pool.submit(
+                _build_in_worker,
+                _ffi_api.SerializeMeasureInput(inp),
+                name,
+                value,
+                BuildFunc.build_func,
                 verbose,
             )
-            for i in inputs
-        ],
-    )
-    pool.terminate()
-    pool.join()
-    del pool
+        )
 
     results = []
-    for res in tuple_res:
+    for future in futures:
+        try:
+            res = future.result()
+        except TimeoutError:
+            if verbose >= 1:
+                print(".T", end="", flush=True)  # Build timeout
+            res = None, [], MeasureErrorNo.BUILD_TIMEOUT, None, timeout
+        except Exception as ex:  # pylint: disable=broad-except
+            if verbose >= 1:
+                print(".E", end="", flush=True)  # Build error
+            res = None, [], MeasureErrorNo.COMPILE_HOST, str(ex), timeout
         results.append(BuildResult(*res))
 
     return results
@@ -728,14 +1027,43 @@ def _timed_eval_func(
     cooldown_interval,
     enable_cpu_cache_flush,
     verbose,
+    cutoff=None,
 ):
     inp = MeasureInput.deserialize(inp_serialized)
+    return _timed_eval(
+        str(inp.task.target),
+        build_res.filename,
+        [(get_const_tuple(x.shape), x.dtype) for x in build_res.args],
+        build_res.time_cost,
+        number,
+        repeat,
+        min_repeat_ms,
+        cooldown_interval,
+        enable_cpu_cache_flush,
+        verbose,
+        cutoff,
+    )
+
+
+def _timed_eval(
+    target,
+    filename,
+    arg_info,
+    build_time_cost,
+    number,
+    repeat,
+    min_repeat_ms,
+    cooldown_interval,
+    enable_cpu_cache_flush,
+    verbose,
+    cutoff=None,
+):
     tic = time.time()
     error_no = 0
     error_msg = None
     try:
-        func = module.load_module(build_res.filename)
-        ctx = ndarray.context(str(inp.task.target), 0)
+        func = module.load_module(filename)
+        ctx = ndarray.context(target, 0)
         # Limitation:
         # We can not get PackFunction directly in the remote mode as it is wrapped
         # under the std::function. We could lift the restriction later once we fold
@@ -758,20 +1086,24 @@ def _timed_eval_func(
 
     if error_no == 0:
         try:
-            args = [ndarray.empty(get_const_tuple(x.shape), x.dtype, ctx) for x in build_res.args]
+            args = [ndarray.empty(shape, dtype, ctx) for shape, dtype in arg_info]
             random_fill = tvm.get_global_func("tvm.contrib.random.random_fill", True)
             assert random_fill, "Please make sure USE_RANDOM is ON in the config.cmake"
             for arg in args:
                 random_fill(arg)
             ctx.sync()
-            costs = time_f(*args).results
+            costs = probe_cutoff(func, ctx, args, f_prepare, cutoff, min_repeat_ms)
+            if costs is None:
+                costs = time_f(*args).results
+            else:
+                error_msg = CENSORED_MSG
         # pylint: disable=broad-except
         except Exception:
             costs = (MAX_FLOAT,)
             error_no = MeasureErrorNo.RUNTIME_DEVICE
             error_msg = make_traceback_info()
 
-    shutil.rmtree(os.path.dirname(build_res.filename))
+    shutil.rmtree(os.path.dirname(filename))
     toc = time.time()
     time.sleep(cooldown_interval)
 
@@ -780,7 +1112,7 @@ def _timed_eval_func(
             print("*", end="", flush=True)
         else:
             print("*E", end="", flush=True)  # Run error
-    return costs, error_no, error_msg, toc - tic + build_res.time_cost, toc
+    return costs, error_no, error_msg, toc - tic + build_time_cost, toc
 
 
 @tvm._ffi.register_func("auto_scheduler.local_runner.run")
@@ -794,6 +1126,7 @@ def local_run(
     cooldown_interval=0,
     enable_cpu_cache_flush=False,
     verbose=1,
+    runner=None,
 ):
     """
     Run function of LocalRunner to test the performance of the input BuildResults.
@@ -833,6 +1166,8 @@ def local_run(
         This is only has effect on CPU task.
     verbose: int = 1
         Verbosity level. 0 for silent, 1 to output information during program measuring.
+    runner: Optional[LocalRunner] = None
+        The runner that measures, to look up its CPU slot executor and early abort state.
 
     Returns
     -------
@@ -840,8 +1175,25 @@ def local_run(
         The measure results of these MeasureInputs.
     """
 
-    measure_results = []
     assert len(inputs) == len(build_results), "Measure input size should be equal to build results"
+    run_cutoff = RunCutoff.of(runner)
+    executor = LocalRunSlots.get(runner)
+    if executor is not None:
+        return _local_run_in_slots(
+            executor,
+            run_cutoff,
+            inputs,
+            build_results,
+            timeout,
+            number,
+            repeat,
+            min_repeat_ms,
+            cooldown_interval,
+            enable_cpu_cache_flush,
+            verbose,
+        )
+
+    measure_results = []
     for inp, build_res in zip(inputs, build_results):
         if build_res.error_no != 0:
             res = (
@@ -864,6 +1216,7 @@ def local_run(
                     cooldown_interval,
                     enable_cpu_cache_flush,
                     verbose,
+                    run_cutoff.get(inp),
                 ),
                 add_thread_wrapper=True,
             )
@@ -887,7 +1240,89 @@ def local_run(
                     build_res.time_cost + timeout,
                     time.time(),
                 )
+            run_cutoff.update(inp, res)
+
+        measure_results.append(MeasureResult(*res))
+
+    if verbose >= 1:
+        print("", flush=True)
 
+    return measure_results
+
+
+def _local_run_in_slots(
+    executor,
+    run_cutoff,
+    inputs,
+    build_results,
+    timeout,
+    number,
+    repeat,
+    min_repeat_ms,
+    cooldown_interval,
+    enable_cpu_cache_flush,
+    verbose,
+):
+    """Run the BuildResults concurrently in the pinned worker processes of a CPUSlotExecutor.
+    The other parameters are the same as :code:`local_run`, run_cutoff is the RunCutoff
+    of the runner."""
+    futures = []
+    for inp, build_res in zip(inputs, build_results):
+        if build_res.error_no != 0:
+            futures.append(None)
+            continue
+        futures.append(
+            executor.submit(
+                _timed_eval,
+                str(inp.task.target),
+                build_res.filename,
+                [(get_const_tuple(x.shape), x.dtype) for x in build_res.args],
+                build_res.time_cost,
+                number,
+                repeat,
+                min_repeat_ms,
+                cooldown_interval,
+                enable_cpu_cache_flush,
+                verbose,
+                run_cutoff.get(inp),
+            )
+        )
+
+    measure_results = []
+    for inp, build_res, future in zip(inputs, build_results, futures):
+        if future is None:
+            res = (
+                (MAX_FLOAT,),
+                build_res.error_no,
+                build_res.error_msg,
+                build_res.time_cost,
+                time.time(),
+            )
+        else:
+            try:
+                slot, res = future.result()
+                executor.record(slot, res[0] if res[1] == MeasureErrorNo.NO_ERROR else None)
+            except TimeoutError:
+                if verbose >= 1:
+                    print("*T", end="", flush=True)  # Run timeout
+                res = (
+                    (MAX_FLOAT,),
+                    MeasureErrorNo.RUN_TIMEOUT,
+                    None,
+                    build_res.time_cost + timeout,
+                    time.time(),
+                )
+            except Exception as ex:  # pylint: disable=broad-except
+                if verbose >= 1:
+                    print("*E", end="", flush=True)  # Run error
+                res = (
+                    (MAX_FLOAT,),
+                    MeasureErrorNo.RUNTIME_DEVICE,
+                    str(ex),
+                    build_res.time_cost + timeout,
+                    time.time(),
+                )
+            run_cutoff.update(inp, res)
         measure_results.append(MeasureResult(*res))
 
     if verbose >= 1:
@@ -910,6 +1345,7 @@ def _timed_rpc_run(
     cooldown_interval,
     enable_cpu_cache_flush,
     verbose,
+    cutoff,
 ):
     inp = MeasureInput.deserialize(inp_serialized)
     tic = time.time()
@@ -954,7 +1390,11 @@ def _timed_rpc_run(
                 random_fill(arg)
             ctx.sync()
 
-            costs = time_f(*args).results
+            costs = probe_cutoff(func, ctx, args, f_prepare, cutoff, min_repeat_ms)
+            if costs is None:
+                costs = time_f(*args).results
+            else:
+                error_msg = CENSORED_MSG
             # clean up remote files
             remote.remove(build_res.filename)
             remote.remove(os.path.splitext(build_res.filename)[0] + ".so")
@@ -991,7 +1431,7 @@ def _rpc_run_worker(args):
     res : MeasureResult
         The measure result of this Runner thread.
     """
-    _, build_res, _, _, _, _, timeout, _, _, _, _, _, verbose = args
+    _, build_res, _, _, _, _, timeout, _, _, _, _, _, verbose, _ = args
     if build_res.error_no != MeasureErrorNo.NO_ERROR:
         return (
             (MAX_FLOAT,),
@@ -1042,6 +1482,7 @@ def rpc_runner_run(
     cooldown_interval=0.0,
     enable_cpu_cache_flush=False,
     verbose=1,
+    runner=None,
 ):
     """Run function of RPCRunner to test the performance of the input BuildResults.
 
@@ -1090,6 +1531,8 @@ def rpc_runner_run(
         This is only has effect on CPU task.
     verbose: int = 1
         Verbosity level. 0 for silent, 1 to output information during program measuring.
+    runner: Optional[RPCRunner] = None
+        The runner that measures, to look up its early abort state.
 
     Returns
     -------
@@ -1099,6 +1542,7 @@ def rpc_runner_run(
     assert len(inputs) == len(build_results), "Measure input size should be equal to build results"
     # This pool is not doing computationally intensive work, so we can use threads
     pool = multiprocessing.pool.ThreadPool(n_parallel)
+    run_cutoff = RunCutoff.of(runner)
     tuple_res = pool.map(
         _rpc_run_worker,
         [
@@ -1116,6 +1560,7 @@ def rpc_runner_run(
                 cooldown_interval,
                 enable_cpu_cache_flush,
                 verbose,
+                run_cutoff.get(inp),
             )
             for inp, build_res in zip(inputs, build_results)
         ],
@@ -1125,7 +1570,8 @@ def rpc_runner_run(
     del pool
 
     results = []
-    for res in tuple_res:
+    for inp, res in zip(inputs, tuple_res):
+        run_cutoff.update(inp, res)
         results.append(MeasureResult(*res))
 
     if verbose >= 1:
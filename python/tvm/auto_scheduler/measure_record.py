@@ -20,18 +20,22 @@
 import argparse
 import logging
 import os
-import itertools
 
 import numpy as np
 
 import tvm._ffi
 from tvm.runtime import Object
+from tvm.contrib.popen_pool import PopenPoolExecutor
 from .measure import MeasureErrorNo, MeasureCallback
 from .utils import calc_workload_dis_factor, decode_workload_key
 from . import _ffi_api
 
 logger = logging.getLogger("auto_scheduler")
 
+# The minimum number of bytes of a log file handled by one worker process
+# of the parallel readers. Smaller files are read in the current process.
+_MIN_RANGE_BYTES = 16 * 1024 * 1024
+
 
 @tvm._ffi.register_object("auto_scheduler.RecordToFile")
 class RecordToFile(MeasureCallback):
@@ -206,47 +210,90 @@ def save_records(filename, inputs, results):
     _ffi_api.SaveRecords(filename, inputs, results)
 
 
-def load_best_record(filename, workload_key=None, target=None, include_compatible=False):
-    """Return the best measurement pair form a log file. This may return none results if
-    there is no legal measure pair with the specified workload_key/target found from the log file.
+def _split_byte_ranges(filename, n_parts):
+    """Split a log file into at most n_parts byte ranges aligned to line boundaries.
 
     Parameters
     ----------
     filename : str
-        File name to load log from.
-    workload_key : Optional[str]
-        The workload key of the compute declaration.
-        With `None`, this returns the best measure pair of all workloads.
-    target : Optional[tvm.target.Target]
-        The target device.
-        With `None`, this returns the best measure pair of all target devices.
-    include_compatible: bool
-        When set to True, all compatible records in the log file will be considered.
+        File name of the log.
+    n_parts : int
+        The maximum number of ranges.
 
     Returns
     -------
+    ranges : List[Tuple[int, int]]
+        The non-empty [start, end) byte ranges that cover the file in order.
+    """
+    size = os.path.getsize(filename)
+    bounds = [0]
+    with open(filename, "rb") as fin:
+        for i in range(1, n_parts):
+            pos = size * i // n_parts
+            if pos <= bounds[-1]:
+                continue
+            # move to the beginning of the first line that starts at or after pos
+            fin.seek(pos - 1)
+            fin.readline()
+            pos = fin.tell()
+            if bounds[-1] < pos < size:
+                bounds.append(pos)
+    bounds.append(size)
+    return [(bounds[i], bounds[i + 1]) for i in range(len(bounds) - 1) if bounds[i] < bounds[i + 1]]
+
+
+def _iter_byte_range(filename, start, end):
+    """Generator: decode the records whose lines start in the byte range [start, end).
+
+    Yields
+    ------
+    offset : int
+        The byte offset of the line in the file.
+    line : str
+        The raw line of the record, without the line break.
     input : auto_scheduler.measure.MeasureInput
-        The best State's MeasureInput from this log fine.
     result : auto_scheduler.measure.MeasureResult
-        The best State's MeasureResult from this log fine.
     """
-    log_reader = RecordReader(filename)
-    best_cost = 1e30
-    best_inp = None
-    best_res = None
+    with open(filename, "rb") as fin:
+        fin.seek(start)
+        offset = start
+        while offset < end:
+            raw = fin.readline()
+            if not raw:
+                break
+            line = raw.decode().rstrip("\r\n")
+            # skip comment lines begin with '#' or ' ', the same as RecordReader
+            if line and line[0] not in "# ":
+                inp, res = load_record_from_string(line)
+                yield offset, line, inp, res
+            offset += len(raw)
 
-    for inp, res in log_reader:
+
+def _record_cost(res):
+    return np.mean([v.value for v in res.costs])
+
+
+def _best_in_byte_range(filename, start, end, workload_key, target_kind, include_compatible):
+    """Find the best record of a byte range, see :any:`load_best_record`.
+
+    Returns
+    -------
+    best : Optional[Tuple[float, str]]
+        The (cost, line) of the best record, or None if no record matches.
+    """
+    if workload_key is not None:
+        target_workload = decode_workload_key(workload_key)
+    best = None
+    for _, line, inp, res in _iter_byte_range(filename, start, end):
         if res.error_no != MeasureErrorNo.NO_ERROR:
             continue
-        if target and inp.task.target.kind.name != target.kind.name:
+        if target_kind and inp.task.target.kind.name != target_kind:
             continue
 
-        costs = [v.value for v in res.costs]
-        cost = np.mean(costs)
-
+        cost = _record_cost(res)
         if workload_key is not None:
             dis_f = calc_workload_dis_factor(
-                decode_workload_key(workload_key), decode_workload_key(inp.task.workload_key)
+                target_workload, decode_workload_key(inp.task.workload_key)
             )
             if dis_f == float("inf"):
                 continue
@@ -257,60 +304,144 @@ def load_best_record(filename, workload_key=None, target=None, include_compatibl
             # eliminate this difference, which is basically the concept of throughput.
             cost *= dis_f
 
-        if cost < best_cost:
-            best_cost = cost
-            best_inp = inp
-            best_res = res
+        if cost < 1e30 and (best is None or cost < best[0]):
+            best = (cost, line)
+    return best
+
+
+def _distill_byte_range(filename, start, end):
+    """Find the best record of every (target key or model, workload key) in a byte range,
+    the same keys as the best record maps of :any:`ApplyHistoryBest`.
+
+    Returns
+    -------
+    best : Dict[Tuple[bool, str, str], Tuple[float, int, str]]
+        The (cost, offset, line) of the best record of each key.
+    """
+    best = {}
+    for offset, line, inp, res in _iter_byte_range(filename, start, end):
+        if res.error_no != MeasureErrorNo.NO_ERROR:
+            continue
+        cost = _record_cost(res)
+        target = inp.task.target
+        keys = [(False, str(k), inp.task.workload_key) for k in target.keys]
+        if target.model != "unknown":
+            keys.append((True, str(target.model), inp.task.workload_key))
+        for key in keys:
+            if key not in best or best[key][0] > cost:
+                best[key] = (cost, offset, line)
+    return best
+
 
-    return best_inp, best_res
+def _map_byte_ranges(filenames, n_parallel, func, *args):
+    """Apply a reduction to the byte ranges of log files, in worker processes
+    if the files are large enough.
 
+    Returns
+    -------
+    results : List[Tuple[int, Any]]
+        The index of the file and the result of each range, in the order of the file contents.
+    """
+    n_parallel = n_parallel or os.cpu_count() or 1
+    tasks = []
+    for i, filename in enumerate(filenames):
+        n_parts = max(1, min(n_parallel, os.path.getsize(filename) // _MIN_RANGE_BYTES))
+        for start, end in _split_byte_ranges(filename, n_parts):
+            tasks.append((i, filename, start, end))
+
+    if n_parallel == 1 or len(tasks) <= 1:
+        return [(i, func(filename, start, end, *args)) for i, filename, start, end in tasks]
+
+    pool = PopenPoolExecutor(max_workers=min(n_parallel, len(tasks)))
+    futures = [
+        (i, pool.submit(func, filename, start, end, *args)) for i, filename, start, end in tasks
+    ]
+    return [(i, future.result()) for i, future in futures]
+
+
+def load_best_record(
+    filename, workload_key=None, target=None, include_compatible=False, n_parallel=None
+):
+    """Return the best measurement pair form a log file. This may return none results if
+    there is no legal measure pair with the specified workload_key/target found from the log file.
 
-def distill_record_file(in_file, out_file):
+    Parameters
+    ----------
+    filename : str
+        File name to load log from.
+    workload_key : Optional[str]
+        The workload key of the compute declaration.
+        With `None`, this returns the best measure pair of all workloads.
+    target : Optional[tvm.target.Target]
+        The target device.
+        With `None`, this returns the best measure pair of all target devices.
+    include_compatible: bool
+        When set to True, all compatible records in the log file will be considered.
+    n_parallel: Optional[int]
+        The number of worker processes that scan byte ranges of a large log file.
+        With `None`, this uses the number of CPUs.
+
+    Returns
+    -------
+    input : auto_scheduler.measure.MeasureInput
+        The best State's MeasureInput from this log fine.
+    result : auto_scheduler.measure.MeasureResult
+        The best State's MeasureResult from this log fine.
+    """
+    target_kind = target.kind.name if target else None
+    best = None
+    for _, range_best in _map_byte_ranges(
+        [filename], n_parallel, _best_in_byte_range, workload_key, target_kind, include_compatible
+    ):
+        if range_best is not None and (best is None or range_best[0] < best[0]):
+            best = range_best
+
+    if best is None:
+        return None, None
+    inp, res = load_record_from_string(best[1])
+    return inp, res
+
+
+def distill_record_file(in_file, out_file, n_parallel=None):
     """
     Pick the best entries from a record file and store them to another file.
     This function distills the useful log entries from a large log file.
     If out_file already exists, the best entries from both
     in_file and out_file will be saved.
 
+    The byte ranges of large files are scanned by worker processes in parallel,
+    and the best lines are copied to out_file without serializing the records again.
+
     Parameters
     ----------
     in_file: str
         The filename of input
     out_file: str or file
         The filename of output
+    n_parallel: Optional[int]
+        The number of worker processes. With `None`, this uses the number of CPUs.
     """
-    # pylint: disable=import-outside-toplevel
-    from .dispatcher import ApplyHistoryBest
-
-    context = load_records(in_file)
+    filenames = [in_file]
     if os.path.isfile(out_file):
-        out_context = load_records(out_file)
-        context = itertools.chain(context, out_context)
-    context, context_clone = itertools.tee(context)
-    best_context = ApplyHistoryBest(context)
-    best_set = set()
-
-    def measure_input_str_key(inp):
-        return _ffi_api.SerializeMeasureInput(inp)
-
-    for v in best_context.best_by_model.values():
-        best_set.add(measure_input_str_key(v[0]))
+        filenames.append(out_file)
 
-    for v in best_context.best_by_targetkey.values():
-        best_set.add(measure_input_str_key(v[0]))
+    # merge the bests of the ranges in file order, so ties keep the earliest record
+    best = {}
+    for i, range_best in _map_byte_ranges(filenames, n_parallel, _distill_byte_range):
+        for key, (cost, offset, line) in range_best.items():
+            if key not in best or best[key][0] > cost:
+                best[key] = (cost, (i, offset), line)
 
-    inputs = []
-    results = []
-    for inp, res in context_clone:
-        if measure_input_str_key(inp) in best_set:
-            inputs.append(inp)
-            results.append(res)
-            best_set.remove(measure_input_str_key(inp))
+    # a record that is the best of several keys is written once, in the original order
+    lines = sorted(set((order, line) for _, order, line in best.values()))
 
     # create a new file and save the best records
-    open(out_file, "w")
-    save_records(out_file, inputs, results)
-    logger.info("Extract %d best records from %s to %s", len(inputs), in_file, out_file)
+    tmp_file = out_file + ".tmp.%d" % os.getpid()
+    with open(tmp_file, "w") as fout:
+        for _, line in lines:
+            fout.write(line + "\n")
+    os.replace(tmp_file, out_file)
+    logger.info("Extract %d best records from %s to %s", len(lines), in_file, out_file)
 
 
 def main():
@@ -319,6 +450,7 @@ def main():
     parser.add_argument("--mode", choices=["distill"], required=True)
     parser.add_argument("--i", type=str, help="input file")
     parser.add_argument("--o", type=str, default=None, help="output file")
+    parser.add_argument("--n-parallel", type=int, default=None, help="number of worker processes")
 
     args = parser.parse_args()
     logging.basicConfig()
@@ -326,7 +458,7 @@ def main():
 
     if args.mode == "distill":
         args.o = args.o or args.i + ".best.json"
-        distill_record_file(args.i, args.o)
+        distill_record_file(args.i, args.o, args.n_parallel)
 
 
 """
@@ -30,7 +30,7 @@ import logging
 import numpy as np
 
 from .search_policy import SearchPolicy, SketchPolicy, PreloadMeasuredStates
-from .cost_model import RandomModel, XGBModel
+from .cost_model import RandomModel, XGBModel, MLPModel
 from .utils import array_mean
 from .measure import ProgramMeasurer
 from .measure_record import RecordReader
@@ -97,6 +97,17 @@ def make_search_policies(
             elif load_log_file:
                 logger.info("TaskScheduler: Reload measured states and train the model...")
                 cost_model.update_from_file(load_log_file)
+        elif model_type == "mlp":
+            cost_model = MLPModel(
+                num_warmup_sample=len(tasks) * num_measures_per_round,
+                model_file=load_model_file,
+            )
+            if load_model_file and os.path.isfile(load_model_file):
+                logger.info("TaskScheduler: Load pretrained model...")
+                cost_model.load(load_model_file)
+            elif load_log_file:
+                logger.info("TaskScheduler: Reload measured states and train the model...")
+                cost_model.update_from_file(load_log_file)
         elif model_type == "random":
             cost_model = RandomModel()
         else:
@@ -202,6 +213,10 @@ class TaskScheduler:
     callbacks: Optional[List[TaskSchedulerCallback]]
         The task scheduler callbacks that will be called before and after tuning a task.
         If None, PrintTableInfo and LogEstimatedLatency callback will be used.
+    cache_measure_results: bool = False
+        Whether to reuse the results of programs that lower to the same module instead of
+        measuring them again, see :any:`ProgramMeasurer`. The records of `load_log_file`
+        are added to the cache.
     """
 
     def __init__(
@@ -217,6 +232,7 @@ class TaskScheduler:
         gamma: float = 0.5,
         backward_window_size: int = 3,
         callbacks=None,
+        cache_measure_results: bool = False,
     ):
         self.tasks = tasks
         if objective_func:  # use custom objective function
@@ -230,6 +246,7 @@ class TaskScheduler:
         self.strategy = strategy
         self.load_log_file = load_log_file
         self.load_model_file = load_model_file
+        self.cache_measure_results = cache_measure_results
         self.alpha = alpha
         self.beta = beta
         self.gamma = gamma
@@ -293,6 +310,7 @@ class TaskScheduler:
             If it is str,
             "default" for the default policy (SketchPolicy + XGBModel),
             "sketch.xgb" for SketchPolicy + XGBModel,
+            "sketch.mlp" for SketchPolicy + MLPModel,
             "sketch.random" for SketchPolicy + RandomModel.
         search_policy_params : Optional[Dict[str, Any]]
             The parameters of the search policy
@@ -309,7 +327,10 @@ class TaskScheduler:
             tune_option.runner,
             tune_option.measure_callbacks,
             tune_option.verbose,
+            cache_results=self.cache_measure_results,
         )
+        if self.cache_measure_results and self.load_log_file:
+            self.measurer.add_to_result_cache(*RecordReader(self.load_log_file).read_lines())
         self.ct = self.best_ct = 0
         self.tic = time.time()
 
@@ -347,87 +368,101 @@ class TaskScheduler:
         # use the specific strategy to choose workload to tune
         task_idx = -1
         while self.ct < tune_option.num_measure_trials and len(self.dead_tasks) < len(self.tasks):
-            if self.strategy == "round-robin":
-                task_idx = (task_idx + 1) % len(self.tasks)
-                while task_idx in self.dead_tasks:
-                    task_idx = (task_idx + 1) % len(self.tasks)
-            elif self.strategy == "gradient":
-                gradients = []
-                for i in range(len(self.tasks)):
-                    if i in self.dead_tasks:
-                        gradients.append(0)
-                        continue
-
-                    # compute gradient from chain rule : (delta f / delta g_i)
-                    delta = 1e-4
-                    new_costs = list(self.best_costs)
-                    new_costs[i] -= delta
-                    chain_grad = (
-                        self._compute_score(self.best_costs) - self._compute_score(new_costs)
-                    ) / delta
-
-                    # compute (g_i(t_i) - g(t_i - \Delta t)) / (\Delta t)
-                    if (
-                        self.task_cts[i] - 1 < len(self.task_costs_history[i])
-                        and self.task_cts[i] - 1 - self.backward_window_size >= 0
-                    ):
-                        backward_grad = (
-                            self.task_costs_history[i][self.task_cts[i] - 1]
-                            - self.task_costs_history[i][
-                                self.task_cts[i] - 1 - self.backward_window_size
-                            ]
-                        ) / self.backward_window_size
-                    else:
-                        backward_grad = 0
-
-                    # compute (g_i(t_i + \Delta t) - g(t_i)) / (\Delta t)
-                    g_next_1 = self.best_costs[i] - (self.best_costs[i] / self.task_cts[i])
-
-                    g_next_2 = self.beta * 1e30
-                    group_id = self.tag_to_group_id.get(self.task_tags[i], None)
-                    if group_id is not None and len(self.group_task_ids[group_id]) > 1:
-                        best_flops = max(
-                            [
-                                self.flop_cts[j] / self.best_costs[j]
-                                for j in self.group_task_ids[group_id]
-                            ]
-                        )
-                        g_next_2 = self.beta * self.flop_cts[i] / best_flops
-
-                    g_next = min(g_next_1, g_next_2)
-                    forward_grad = g_next - self.best_costs[i]
-
-                    # combine all grads
-                    grad = chain_grad * (
-                        self.alpha * backward_grad + (1 - self.alpha) * forward_grad
-                    )
-                    assert grad <= 0
-                    gradients.append(grad)
-
-                if max(gradients) == min(gradients):
-                    task_idx = np.random.choice(len(gradients))
-                else:
-                    task_idx = np.argmin(gradients)
-            else:
-                raise ValueError("Invalid strategy: " + self.strategy)
-
+            task_idx = self._choose_task(task_idx)
             self._tune_task(task_idx)
             self._adjust_similarity_group(task_idx)
-
-            if self.cur_score < self.best_score:
-                self.best_score = self.cur_score
-                self.best_ct = self.ct
-            elif self.ct - self.best_ct >= early_stopping and all(
-                cost < 1e9 for cost in self.best_costs
-            ):
-                if self.tune_option.verbose >= 1:
-                    print(
-                        "Stop early since no performance improvement in the last "
-                        + str(early_stopping)
-                        + " measurement trials."
-                    )
+            if self._stop_early(early_stopping):
                 break
 
+    def _choose_task(self, last_task_idx, busy_tasks=()):
+        """Choose the next task to tune with the scheduling strategy
+
+        Parameters
+        ----------
+        last_task_idx: int
+            The last chosen task, -1 if there is none
+        busy_tasks: Collection[int]
+            The tasks that cannot be chosen now, in addition to the dead tasks
+
+        Returns
+        -------
+        task_idx: Optional[int]
+            The chosen task, None if no task can be chosen
+        """
+        candidates = [
+            i for i in range(len(self.tasks)) if i not in self.dead_tasks and i not in busy_tasks
+        ]
+        if not candidates:
+            return None
+
+        if self.strategy == "round-robin":
+            task_idx = (last_task_idx + 1) % len(self.tasks)
+            while task_idx not in candidates:
+                task_idx = (task_idx + 1) % len(self.tasks)
+            return task_idx
+        if self.strategy == "gradient":
+            gradients = [self._compute_gradient(i) for i in candidates]
+            if max(gradients) == min(gradients):
+                return candidates[np.random.choice(len(gradients))]
+            return candidates[int(np.argmin(gradients))]
+        raise ValueError("Invalid strategy: " + self.strategy)
+
+    def _compute_gradient(self, i):
+        """Compute the gradient of the objective function with respect to the time of task i"""
+        # compute gradient from chain rule : (delta f / delta g_i)
+        delta = 1e-4
+        new_costs = list(self.best_costs)
+        new_costs[i] -= delta
+        chain_grad = (self._compute_score(self.best_costs) - self._compute_score(new_costs)) / delta
+
+        # compute (g_i(t_i) - g(t_i - \Delta t)) / (\Delta t)
+        if (
+            self.task_cts[i] - 1 < len(self.task_costs_history[i])
+            and self.task_cts[i] - 1 - self.backward_window_size >= 0
+        ):
+            backward_grad = (
+                self.task_costs_history[i][self.task_cts[i] - 1]
+                - self.task_costs_history[i][self.task_cts[i] - 1 - self.backward_window_size]
+            ) / self.backward_window_size
+        else:
+            backward_grad = 0
+
+        # compute (g_i(t_i + \Delta t) - g(t_i)) / (\Delta t)
+        g_next_1 = self.best_costs[i] - (self.best_costs[i] / self.task_cts[i])
+
+        g_next_2 = self.beta * 1e30
+        group_id = self.tag_to_group_id.get(self.task_tags[i], None)
+        if group_id is not None and len(self.group_task_ids[group_id]) > 1:
+            best_flops = max(
+                [self.flop_cts[j] / self.best_costs[j] for j in self.group_task_ids[group_id]]
+            )
+            g_next_2 = self.beta * self.flop_cts[i] / best_flops
+
+        g_next = min(g_next_1, g_next_2)
+        forward_grad = g_next - self.best_costs[i]
+
+        # combine all grads
+        grad = chain_grad * (self.alpha * backward_grad + (1 - self.alpha) * forward_grad)
+        assert grad <= 0
+        return grad
+
+    def _stop_early(self, early_stopping):
+        """Update the best score after a round, and check whether to stop early"""
+        if self.cur_score < self.best_score:
+            self.best_score = self.cur_score
+            self.best_ct = self.ct
+        elif self.ct - self.best_ct >= early_stopping and all(
+            cost < 1e9 for cost in self.best_costs
+        ):
+            if self.tune_option.verbose >= 1:
+                print(
+                    "Stop early since no performance improvement in the last "
+                    + str(early_stopping)
+                    + " measurement trials."
+                )
+            return True
+        return False
+
     def _tune_task(self, task_idx):
         """Tune the select task for one round"""
 
@@ -438,7 +473,14 @@ class TaskScheduler:
         measure_inputs, measure_results = self.search_policies[task_idx].continue_search_one_round(
             self.num_measures_per_round, self.measurer
         )
+        self._update_task_status(task_idx, measure_inputs, measure_results)
 
+        # Run post-tune callbacks
+        for callback in self.callbacks:
+            callback.post_tune(self, task_idx)
+
+    def _update_task_status(self, task_idx, measure_inputs, measure_results):
+        """Update the status of a task after tuning it for one round"""
         for res in measure_results:
             cost = array_mean(res.costs)
             if cost < self.best_costs[task_idx]:
@@ -453,10 +495,6 @@ class TaskScheduler:
         self.ct += len(measure_inputs)
         self.cur_score = self._compute_score(self.best_costs)
 
-        # Run post-tune callbacks
-        for callback in self.callbacks:
-            callback.post_tune(self, task_idx)
-
     def _compute_score(self, costs):
         """compute the objective function"""
         return self.objective_func(costs)
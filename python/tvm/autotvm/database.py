@@ -19,7 +19,11 @@
 Database of MeasureInput/MeasureResult pair.
 This can be used for replaying measurement.
 """
+import itertools
 import os
+import sqlite3
+
+import numpy as np
 
 from .record import encode, decode, measure_str_key
 
@@ -61,6 +65,22 @@ class Database(object):
         """
         raise NotImplementedError()
 
+    def save_batch(self, inputs, results, extend=False):
+        """
+        Save a batch of results, e.g. one round of measurement
+
+        Parameters
+        ----------
+        inputs: Array of MeasureInput
+            to be translated into keys
+        results: Array of MeasureResult
+            to associate with keys
+        extend:
+            Whether to extend existing MeasureResults if they exist
+        """
+        for inp, res in zip(inputs, results):
+            self.save(inp, res, extend)
+
 
 def filter_inputs(db, measure_inputs, retry=False):
     """
@@ -202,3 +222,187 @@ class DummyDatabase(RedisDatabase):
 
     def flush(self):
         self.db = {}
+
+
+class SQLiteDatabase(Database):
+    """
+    SQLite version of record database, stored in a single local file.
+
+    Every saved result is one row, indexed by its string key, target, task and
+    config index, so ``save(extend=True)`` is a plain insert and ``filter`` can
+    narrow the rows down in SQL before decoding them. The database runs in WAL
+    mode and all writes are done in immediate transactions, so several tuning
+    processes on one host can write to the same file at the same time.
+
+    Parameters
+    ----------
+    filename: str
+        The path of the database file
+    timeout: float
+        How many seconds a writer waits for the lock of another writer
+    """
+
+    def __init__(self, filename, timeout=60.0):
+        self.filename = filename
+        self.timeout = timeout
+        self._conn = None
+        self._pid = None
+        self._connect()
+
+    def _connect(self):
+        # sqlite connections must not be shared with forked measurement processes
+        if self._conn is not None and self._pid == os.getpid():
+            return self._conn
+        self._conn = sqlite3.connect(self.filename, timeout=self.timeout, isolation_level=None)
+        self._pid = os.getpid()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS records ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "key TEXT NOT NULL, "
+            "target TEXT NOT NULL, "
+            "task_name TEXT NOT NULL, "
+            "workload TEXT NOT NULL, "
+            "config_index INTEGER, "
+            "error_no INTEGER NOT NULL, "
+            "cost REAL, "
+            "timestamp REAL, "
+            "record TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS records_key ON records (key)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS records_target ON records (target)")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS records_workload ON records (task_name, workload)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS records_config ON records (config_index)")
+        return self._conn
+
+    @staticmethod
+    def _row(inp, res):
+        cost = float(np.mean(res.costs)) if res.error_no == 0 else None
+        return (
+            measure_str_key(inp),
+            str(inp.target),
+            inp.task.name,
+            str(inp.task.workload),
+            inp.config.index,
+            res.error_no,
+            cost,
+            res.timestamp,
+            encode(inp, res),
+        )
+
+    def load(self, inp, get_all=False):
+        conn = self._connect()
+        if get_all:
+            rows = conn.execute(
+                "SELECT record FROM records WHERE key = ? ORDER BY id", (measure_str_key(inp),)
+            ).fetchall()
+            records = [decode(row[0]) for row in rows]
+            return [rec[1] for rec in records if rec is not None]
+        row = conn.execute(
+            "SELECT record FROM records WHERE key = ? ORDER BY timestamp DESC, id DESC LIMIT 1",
+            (measure_str_key(inp),),
+        ).fetchone()
+        if row is None:
+            return None
+        rec = decode(row[0])
+        return rec[1] if rec is not None else None
+
+    def save(self, inp, res, extend=False):
+        self.save_batch([inp], [res], extend)
+
+    def save_batch(self, inputs, results, extend=False):
+        rows = [self._row(inp, res) for inp, res in zip(inputs, results)]
+        if not extend:
+            # without extend, only the last result of a key survives
+            rows = list({row[0]: row for row in rows}.values())
+        if not rows:
+            return
+        conn = self._connect()
+        # take the write lock up front, so concurrent writers queue on the busy timeout
+        # instead of failing on a lock upgrade
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if not extend:
+                conn.executemany("DELETE FROM records WHERE key = ?", [(row[0],) for row in rows])
+            conn.executemany(
+                "INSERT INTO records (key, target, task_name, workload, config_index, "
+                "error_no, cost, timestamp, record) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def filter(self, func=None, target=None, task_name=None, workload=None, error_no=None):
+        """
+        Dump all of the records that match the given rule.
+        The keyword predicates are evaluated by SQLite before any record is decoded.
+
+        Parameters
+        ----------
+        func: Optional[callable]
+            The signature of the function is (MeasureInput, [MeasureResult]) -> bool
+        target: Optional[str or Target]
+            Only match records of this target
+        task_name: Optional[str]
+            Only match records of this task
+        workload: Optional[tuple]
+            Only match records of this workload
+        error_no: Optional[int]
+            Only consider results with this error number
+
+        Returns
+        -------
+        list of records in tuple (MeasureInput, MeasureResult) matching the rule
+
+        Examples
+        --------
+        get records of a task with errors
+        >>> db.filter(task_name="conv2d_nchw.x86", error_no=MeasureErrorNo.RUNTIME_DEVICE)
+        get fast records for a target
+        >>> db.filter(lambda inp, results: min(r.costs[0] for r in results) < 1e-3,
+        ...           target="llvm -mcpu=skylake-avx512")
+        """
+        conditions = []
+        params = []
+        for column, value in (
+            ("target", None if target is None else str(target)),
+            ("task_name", task_name),
+            ("workload", None if workload is None else str(workload)),
+            ("error_no", error_no),
+        ):
+            if value is not None:
+                conditions.append("%s = ?" % column)
+                params.append(value)
+        query = "SELECT key, record FROM records"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY key, id"
+
+        matched_records = list()
+        rows = self._connect().execute(query, params)
+        for _, group in itertools.groupby(rows, key=lambda row: row[0]):
+            records = [decode(row[1]) for row in group]
+            records = [rec for rec in records if rec is not None]
+            if not records:
+                continue
+            inps, results = zip(*records)
+            inp = inps[0]
+            if func is not None and not func(inp, results):
+                continue
+            result = max(results, key=lambda res: res.timestamp)
+            matched_records.append((inp, result))
+        return matched_records
+
+    def flush(self):
+        self._connect().execute("DELETE FROM records")
+
+    def close(self):
+        """Close the connection of this process"""
+        if self._conn is not None and self._pid == os.getpid():
+            self._conn.close()
+        self._conn = None
@@ -28,5 +28,19 @@ class AutotvmGlobalScope(object):
         self.in_tuning = False
         self.silent = False
 
+    def deep_copy(self, global_scope):
+        """Copy the state of another scope into this one"""
+        self.cuda_target_arch = global_scope.cuda_target_arch
+        self.in_tuning = global_scope.in_tuning
+        self.silent = global_scope.silent
+
 
 GLOBAL_SCOPE = AutotvmGlobalScope()
+
+
+def reset_global_scope(global_scope):
+    """Reset the global autotvm state to the state of another scope.
+    This initializes the worker processes of a PopenPoolExecutor,
+    which are not forked from the process that owns the scope."""
+    GLOBAL_SCOPE.deep_copy(global_scope)
+    AutotvmGlobalScope.current = GLOBAL_SCOPE
@@ -35,7 +35,9 @@ class MeasureInput(namedtuple("MeasureInput", ["target", "task", "config"])):
     """
 
 
-class MeasureResult(namedtuple("MeasureResult", ["costs", "error_no", "all_cost", "timestamp"])):
+class MeasureResult(
+    namedtuple("MeasureResult", ["costs", "error_no", "all_cost", "timestamp", "censored"])
+):
     """
     Stores all the results of a measurement
 
@@ -50,8 +52,16 @@ class MeasureResult(namedtuple("MeasureResult", ["costs", "error_no", "all_cost"
         All cost of this measure, including rpc, compilation, test runs
     timestamp: float
         The absolute time stamp when we finish measurement.
+    censored: bool
+        Whether the measurement was stopped early because the program was slower than
+        the cutoff of the runner. costs is then the cost of the probe only, a lower bound.
     """
 
+    def __new__(cls, costs, error_no, all_cost, timestamp, censored=False):
+        return super(MeasureResult, cls).__new__(
+            cls, costs, error_no, all_cost, timestamp, censored
+        )
+
 
 class MeasureErrorNo(object):
     """Error type for MeasureResult"""
@@ -268,4 +278,7 @@ def create_measure_batch(task, option):
 
     measure_batch.n_parallel = builder.n_parallel
     measure_batch.attach_objects = attach_objects
+    # the two stages, so that a tuner can overlap the build of a batch with the run of another
+    measure_batch.build = builder.build
+    measure_batch.run = runner.run
     return measure_batch
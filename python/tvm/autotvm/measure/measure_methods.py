@@ -38,9 +38,11 @@ from tvm import nd, rpc as _rpc
 from tvm.error import TVMError
 from tvm.driver import build
 from tvm.contrib import nvcc, ndk, tar
+from tvm.contrib.cpu_slots import CPUSlotExecutor
+from tvm.contrib.popen_pool import PopenPoolExecutor
 
 from ..utils import get_const_tuple
-from ..env import AutotvmGlobalScope
+from ..env import AutotvmGlobalScope, reset_global_scope
 from ..task.space import InstantiationError
 
 from .measure import MeasureResult, MeasureErrorNo, Builder, Runner
@@ -79,9 +81,28 @@ class LocalBuilder(Builder):
         If is 'default', use default build function
         If is 'ndk', use function for android ndk
         If is callable, use it as custom build function, expect lib_format field.
+    max_tasks_per_worker: int, optional
+        The number of builds a worker process runs before it is restarted.
+        "None" keeps the workers alive until they time out or crash.
+    max_worker_memory: int, optional
+        Restart a worker process after a build if its resident memory
+        grows beyond this number of bytes.
+
+    Note
+    ----
+    The builds run in a pool of long-lived worker processes that import TVM once,
+    instead of a fresh process per build. A worker that exceeds the timeout is
+    killed and lazily respawned.
     """
 
-    def __init__(self, timeout=10, n_parallel=None, build_func="default"):
+    def __init__(
+        self,
+        timeout=10,
+        n_parallel=None,
+        build_func="default",
+        max_tasks_per_worker=None,
+        max_worker_memory=None,
+    ):
         super(LocalBuilder, self).__init__(timeout, n_parallel)
 
         if isinstance(build_func, str):
@@ -92,7 +113,14 @@ class LocalBuilder(Builder):
             else:
                 raise ValueError("Invalid build_func" + build_func)
         self.build_func = _WrappedBuildFunc(build_func)
-        self.executor = LocalExecutor(timeout=timeout)
+        self.executor = PopenPoolExecutor(
+            max_workers=self.n_parallel,
+            timeout=timeout,
+            initializer=_init_build_worker,
+            initargs=(AutotvmGlobalScope.current,),
+            maximum_process_uses=max_tasks_per_worker,
+            max_process_rss=max_worker_memory,
+        )
         self.tmp_dir = tempfile.mkdtemp()
 
     def build(self, measure_inputs):
@@ -101,14 +129,27 @@ class LocalBuilder(Builder):
         shutil.rmtree(self.tmp_dir, ignore_errors=True)
         self.tmp_dir = tempfile.mkdtemp()
 
+        # the workers are not forked from this process, so pass the global scope explicitly,
+        # it may have changed since the workers were started, e.g. in_tuning
+        global_scope = AutotvmGlobalScope.current
         for i in range(0, len(measure_inputs), self.n_parallel):
             futures = []
             for inp in measure_inputs[i : i + self.n_parallel]:
-                ret = self.executor.submit(self.build_func, inp, self.tmp_dir, **self.build_kwargs)
+                ret = self.executor.submit(
+                    _build_in_worker,
+                    self.build_func,
+                    global_scope,
+                    inp,
+                    self.tmp_dir,
+                    self.build_kwargs,
+                )
                 futures.append(ret)
 
             for future in futures:
-                res = future.get()
+                try:
+                    res = future.result()
+                except Exception as ex:  # pylint: disable=broad-except
+                    res = ex
 
                 if isinstance(res, Exception):
                     # timeout or fleet error, return MeasureResult directly
@@ -199,6 +240,23 @@ class RPCRunner(Runner):
         its actual latency during end-to-end inference.
         To make this option effective, the argument `number` should also be set to 1.
         This is only has effect on CPU task.
+    early_abort_ratio: float, optional
+        Stop timing a candidate whose probe, one repeat after a warm-up, is slower than this
+        ratio times the best cost of its task so far, and record the cost of the probe only
+        (a censored result, see :any:`probe_cutoff`). This saves the device time of the
+        whole number x repeat x min_repeat_ms budget on candidates that cannot be the best.
+        The number of censored results is counted in `n_censored`. The ratio is at least 1,
+        so that no candidate faster than the best is censored. None to time every
+        candidate fully.
+    session_pool: bool, optional
+        Measure in persistent worker processes that each keep a leased remote session
+        across measurements, instead of requesting a new session from the tracker for
+        every candidate. A session is checked to be alive before it is reused, and it is
+        recycled after `max_session_uses` measurements, or when a measurement fails or
+        times out. The files uploaded to a session are removed when it is recycled.
+        The sessions are released by `release_sessions` or when the runner is deleted.
+    max_session_uses: int, optional
+        The number of measurements a leased session is used for when session_pool is set.
     """
 
     def __init__(
@@ -214,8 +272,13 @@ class RPCRunner(Runner):
         min_repeat_ms=0,
         cooldown_interval=0.1,
         enable_cpu_cache_flush=False,
+        early_abort_ratio=None,
+        session_pool=False,
+        max_session_uses=100,
     ):
         super(RPCRunner, self).__init__(timeout, n_parallel)
+        if early_abort_ratio is not None and early_abort_ratio < 1:
+            raise ValueError("early_abort_ratio must be at least 1, got %s" % early_abort_ratio)
 
         self.key = key
         self.host = host
@@ -230,7 +293,57 @@ class RPCRunner(Runner):
         self.enable_cpu_cache_flush = enable_cpu_cache_flush
         self.cooldown_interval = cooldown_interval
 
-        self.executor = LocalExecutor(timeout=timeout * (self.n_parallel + 1))
+        self.early_abort_ratio = early_abort_ratio
+        self.best_costs = {}  # (target, workload) -> the best cost measured so far
+        self.n_censored = 0
+
+        self.max_session_uses = max_session_uses if session_pool else None
+        if session_pool:
+            self.executor = PopenPoolExecutor(
+                max_workers=self.n_parallel, timeout=timeout * (self.n_parallel + 1)
+            )
+        else:
+            self.executor = LocalExecutor(timeout=timeout * (self.n_parallel + 1))
+
+    def get_cutoff(self, measure_input):
+        """Get the cost beyond which a candidate is not timed further
+
+        Parameters
+        ----------
+        measure_input: MeasureInput
+            The candidate
+
+        Returns
+        -------
+        cutoff: Optional[float]
+            The cutoff, None to time the candidate fully
+        """
+        if self.early_abort_ratio is None:
+            return None
+        key = (str(measure_input.target), measure_input.task.workload)
+        best = self.best_costs.get(key)
+        return None if best is None else best * self.early_abort_ratio
+
+    def update_cutoff(self, measure_input, result):
+        """Update the best cost of the task of a measured candidate
+
+        Parameters
+        ----------
+        measure_input: MeasureInput
+            The candidate
+        result: MeasureResult
+            The measure result of the candidate
+        """
+        if self.early_abort_ratio is None or result.error_no != MeasureErrorNo.NO_ERROR:
+            return
+        if result.censored:
+            # slower than the cutoff, so it is not the best
+            self.n_censored += 1
+            return
+        cost = np.mean(result.costs)
+        key = (str(measure_input.target), measure_input.task.workload)
+        if cost < self.best_costs.get(key, float("inf")):
+            self.best_costs[key] = cost
 
     def set_task(self, task):
         self.task = task
@@ -290,11 +403,19 @@ class RPCRunner(Runner):
                     self.cooldown_interval,
                     remote_args,
                     self.enable_cpu_cache_flush,
+                    self.get_cutoff(measure_inp),
+                    self.max_session_uses,
                 )
                 futures.append(ret)
 
-            for future in futures:
-                res = future.get()
+            for measure_inp, future in zip(measure_inputs[i:], futures):
+                if self.max_session_uses is None:
+                    res = future.get()
+                else:
+                    try:
+                        res = future.result()
+                    except Exception as ex:  # pylint: disable=broad-except
+                        res = ex
                 if isinstance(res, Exception):  # executor error or timeout
                     results.append(
                         MeasureResult(
@@ -302,10 +423,23 @@ class RPCRunner(Runner):
                         )
                     )
                 else:
+                    self.update_cutoff(measure_inp, res)
                     results.append(res)
 
         return results
 
+    def release_sessions(self):
+        """Release the remote sessions leased by the worker processes when session_pool
+        is set, so that the tracker hands the devices to other requests. The workers are
+        killed, which closes their sessions, and new ones lease new sessions if the runner
+        is used again."""
+        if self.max_session_uses is not None:
+            self.executor.kill_workers()
+
+    def __del__(self):
+        if hasattr(self, "executor"):
+            self.release_sessions()
+
 
 class LocalRunner(RPCRunner):
     """Run generated code on local devices.
@@ -338,10 +472,30 @@ class LocalRunner(RPCRunner):
         its actual latency during end-to-end inference.
         To make this option effective, the argument `number` should also be set to 1.
         This is only has effect on CPU task.
+    cpu_slots: int or List[List[int]], optional
+        Measure several candidates at once, each in a worker process pinned to its own
+        CPU set. It is either the CPU sets, or the number of sets to split the host into
+        (non-positive for as many as fit), see :any:`tvm.contrib.cpu_slots.partition_cpus`.
+        This is meant for CPU tasks whose kernels use a few threads.
+        The timing stability of every set is reported by `slot_stats`.
+    cores_per_slot: int, optional
+        The number of physical cores of a CPU set when cpu_slots is a number.
+    per_numa_node: bool, optional
+        Whether to keep a CPU set inside one NUMA node when cpu_slots is a number.
+    early_abort_ratio: float, optional
+        Stop timing a candidate whose probe is slower than this ratio times the best cost
+        of its task so far, see :any:`RPCRunner`.
+    session_pool: bool, optional
+        Measure in a persistent worker process that keeps its session to the local
+        rpc server across measurements, see :any:`RPCRunner`.
+    max_session_uses: int, optional
+        The number of measurements a session is used for when session_pool is set.
     Note
     ----
     This is a "fake" local mode. We start a silent rpc tracker and rpc server
     for the user. In this way we reuse timeout/isolation mechanism in RPC infrastructure.
+    With cpu_slots, the candidates are measured in local sessions of the pinned
+    worker processes instead.
     """
 
     def __init__(
@@ -352,6 +506,12 @@ class LocalRunner(RPCRunner):
         min_repeat_ms=0,
         cooldown_interval=0.1,
         enable_cpu_cache_flush=False,
+        cpu_slots=None,
+        cores_per_slot=1,
+        per_numa_node=True,
+        early_abort_ratio=None,
+        session_pool=False,
+        max_session_uses=100,
     ):
         super(LocalRunner, self).__init__(
             "",
@@ -365,16 +525,29 @@ class LocalRunner(RPCRunner):
             min_repeat_ms=min_repeat_ms,
             cooldown_interval=cooldown_interval,
             enable_cpu_cache_flush=enable_cpu_cache_flush,
+            early_abort_ratio=early_abort_ratio,
+            session_pool=session_pool,
+            max_session_uses=max_session_uses,
         )
         self.tracker = None
         self.server = None
 
+        self.slot_executor = None
+        if cpu_slots is not None:
+            self.slot_executor = CPUSlotExecutor(
+                cpu_slots, cores_per_slot, per_numa_node, timeout=timeout
+            )
+            self.n_parallel = len(self.slot_executor)
+
     def set_task(self, task):
         # pylint: disable=import-outside-toplevel
         from ...rpc.tracker import Tracker
         from ...rpc.server import Server
 
         self.task = task
+        if self.slot_executor is not None:
+            # measured in local sessions, no tracker and server are needed
+            return None, None
         tracker = Tracker("0.0.0.0", port=9000, port_end=10000, silent=True)
         device_key = "$local$device$%d" % tracker.port
         server = Server(
@@ -393,6 +566,68 @@ class LocalRunner(RPCRunner):
         super(LocalRunner, self).set_task(task)
         return server, tracker
 
+    def get_build_kwargs(self):
+        if self.slot_executor is not None:
+            return {}
+        return super(LocalRunner, self).get_build_kwargs()
+
+    def run(self, measure_inputs, build_results):
+        if self.slot_executor is None:
+            return super(LocalRunner, self).run(measure_inputs, build_results)
+
+        futures = []
+        for measure_inp, build_res in zip(measure_inputs, build_results):
+            if isinstance(build_res, MeasureResult):  # build error
+                futures.append(build_res)
+                continue
+            futures.append(
+                self.slot_executor.submit(
+                    run_through_rpc,
+                    measure_inp,
+                    build_res,
+                    self.number,
+                    self.repeat,
+                    self.min_repeat_ms,
+                    self.cooldown_interval,
+                    None,
+                    self.enable_cpu_cache_flush,
+                    self.get_cutoff(measure_inp),
+                )
+            )
+
+        results = []
+        for measure_inp, future in zip(measure_inputs, futures):
+            if isinstance(future, MeasureResult):
+                results.append(future)
+                continue
+            try:
+                slot, res = future.result()
+            except TimeoutError as ex:
+                # recorded by the executor
+                results.append(
+                    MeasureResult((str(ex),), MeasureErrorNo.RUN_TIMEOUT, self.timeout, time.time())
+                )
+                continue
+            except Exception as ex:  # pylint: disable=broad-except
+                # e.g. a crashed worker, recorded by the executor
+                results.append(
+                    MeasureResult(
+                        (str(ex),), MeasureErrorNo.RUNTIME_DEVICE, self.timeout, time.time()
+                    )
+                )
+                continue
+            self.slot_executor.record(slot, res.costs if res.error_no == 0 else None)
+            self.update_cutoff(measure_inp, res)
+            results.append(res)
+        return results
+
+    def slot_stats(self):
+        """Get the timing stability of every CPU set when cpu_slots is used,
+        see :any:`tvm.contrib.cpu_slots.CPUSlotExecutor.slot_stats`"""
+        if self.slot_executor is None:
+            return []
+        return self.slot_executor.slot_stats()
+
 
 def _build_func_common(measure_input, check_gpu=None, cuda_arch=None, build_option=None):
     """Common part for building a configuration"""
@@ -473,6 +708,60 @@ class _WrappedBuildFunc:
         return BuildResult(filename, arg_info, None, time.time() - tic)
 
 
+def _init_build_worker(global_scope):
+    """Import the modules needed by the builds once per worker process,
+    and restore the autotvm global scope of the builder"""
+    # pylint: disable=import-outside-toplevel, unused-import
+    import tvm.autotvm
+    import tvm.topi
+
+    reset_global_scope(global_scope)
+
+
+def _build_in_worker(build_func, global_scope, measure_input, tmp_dir, build_kwargs):
+    """Run a build in a worker process of LocalBuilder"""
+    reset_global_scope(global_scope)
+    return build_func(measure_input, tmp_dir, **build_kwargs)
+
+
+def probe_cutoff(func, ctx, args, f_preproc="", cutoff=None, min_repeat_ms=0):
+    """Time one repeat of a function, to stop timing it early if it is uncompetitive.
+
+    The probe is a time_evaluator of two repeats. The first one warms the function up
+    and sizes `number` so that a repeat lasts min_repeat_ms, as the full timing does,
+    and the second one is the probe.
+
+    Parameters
+    ----------
+    func: Module
+        The module of the function
+    ctx: TVMContext
+        The context to run the function on
+    args: List[NDArray]
+        The arguments of the function
+    f_preproc: str
+        The preprocessing function of time_evaluator
+    cutoff: Optional[float]
+        The cost in seconds beyond which the function is not timed further,
+        None to skip the probe
+    min_repeat_ms: int
+        The minimum duration of one repeat in milliseconds
+
+    Returns
+    -------
+    costs: Optional[List[float]]
+        The cost of the probe if it exceeds the cutoff, i.e. a censored measurement
+        that stands for all the repeats. None if the function should be timed normally.
+    """
+    if cutoff is None:
+        return None
+    probe = func.time_evaluator(
+        func.entry_name, ctx, number=1, repeat=2, min_repeat_ms=min_repeat_ms, f_preproc=f_preproc
+    )
+    costs = probe(*args).results[-1:]
+    return costs if costs[0] > cutoff else None
+
+
 def run_through_rpc(
     measure_input,
     build_result,
@@ -482,6 +771,8 @@ def run_through_rpc(
     cooldown_interval,
     remote_args,
     enable_cpu_cache_flush=False,
+    cutoff=None,
+    max_session_uses=None,
 ):
     """Run a generated library through rpc
 
@@ -509,23 +800,37 @@ def run_through_rpc(
         will be automatically increased.
     cooldown_interval: float
         The cool down interval between two measurements
-    remote_args: Tuple
-        The argument for request_remote
+    remote_args: Optional[Tuple]
+        The argument for request_remote. None to run in a local session of this process.
     enable_cpu_cache_flush: bool
         Whether to flush cache on CPU between repeated measurements.
         Flushing cache can make the measured latency of one operator closer to
         its actual latency during end-to-end inference.
         To make this option effective, the argument `number` should also be set to 1.
         This is only has effect on CPU task.
+    cutoff: Optional[float]
+        If a probe of the function is slower than this cost in seconds, the function is
+        not timed further and its result is censored, see :any:`probe_cutoff`.
+    max_session_uses: Optional[int]
+        Run in the session leased by this process for remote_args, which is used for this
+        number of measurements, see :any:`lease_remote`. None to request a new session.
     """
     if isinstance(build_result, MeasureResult):
         return build_result
 
     tic = time.time()
     errno = MeasureErrorNo.NO_ERROR
+    censored = False
+    lease = None
     try:
         # upload built module
-        remote = request_remote(*remote_args)
+        if remote_args is None:
+            remote = _rpc.LocalSession()
+        elif max_session_uses is None:
+            remote = request_remote(*remote_args)
+        else:
+            lease = lease_remote(remote_args, max_session_uses)
+            remote = lease.remote
         # Program the FPGA every single time when targeting VTA
         if (
             hasattr(measure_input.target, "device_name")
@@ -568,12 +873,18 @@ def run_through_rpc(
                 random_fill(arg)
         ctx.sync()
 
-        costs = time_f(*args).results
+        costs = probe_cutoff(func, ctx, args, f_prepare, cutoff, min_repeat_ms)
+        censored = costs is not None
+        if not censored:
+            costs = time_f(*args).results
 
-        # clean up remote files
-        remote.remove(build_result.filename)
-        remote.remove(os.path.splitext(build_result.filename)[0] + ".so")
-        remote.remove("")
+        # clean up remote files, a leased session removes them when it is recycled
+        files = [build_result.filename, os.path.splitext(build_result.filename)[0] + ".so"]
+        if lease is None:
+            for filename in files + [""]:
+                remote.remove(filename)
+        else:
+            lease.files.extend(files)
 
         if len(costs) > 2:  # remove largest and smallest value to reduce variance
             costs = list(costs)
@@ -587,9 +898,15 @@ def run_through_rpc(
             msg = msg[: msg.index("CUDA Source")]
         costs = (RuntimeError(msg[:1024]),)
         errno = MeasureErrorNo.RUNTIME_DEVICE
+        if lease is not None:
+            recycle_remote(remote_args)
+    except Exception:
+        if lease is not None:
+            recycle_remote(remote_args)
+        raise
     tstamp = time.time()
     time.sleep(cooldown_interval)
-    return MeasureResult(costs, errno, tstamp - tic + build_result.time_cost, tstamp)
+    return MeasureResult(costs, errno, tstamp - tic + build_result.time_cost, tstamp, censored)
 
 
 def request_remote(device_key, host=None, port=None, priority=1, timeout=60):
@@ -623,6 +940,97 @@ def request_remote(device_key, host=None, port=None, priority=1, timeout=60):
     return remote
 
 
+class LeasedSession:
+    """A remote session kept by a process across measurements, see :any:`lease_remote`
+
+    Parameters
+    ----------
+    remote: RPCSession
+        The session
+    session_timeout: float
+        The duration after which the server kills the session
+    """
+
+    def __init__(self, remote, session_timeout):
+        self.remote = remote
+        self.deadline = time.time() + session_timeout
+        self.n_uses = 0
+        self.files = []  # the uploaded files to remove when the session is recycled
+
+    def is_alive(self):
+        """Check that the session still answers with a cheap remote call"""
+        try:
+            self.remote.get_function("tvm.rpc.server.remove")
+        except Exception:  # pylint: disable=broad-except
+            return False
+        return True
+
+    def cleanup(self):
+        """Remove the uploaded files from the remote work directory in one batch"""
+        files, self.files = self.files, []
+        try:
+            for filename in files + [""]:
+                self.remote.remove(filename)
+        except Exception:  # pylint: disable=broad-except
+            pass  # the files are lost along with a broken session
+
+
+# the sessions leased by this process, (key, host, port, priority, timeout) -> LeasedSession
+_LEASED_SESSIONS = {}
+
+
+def lease_remote(remote_args, max_uses):
+    """Get the remote session leased by the current process for a device,
+    so that consecutive measurements skip the tracker request and the session setup.
+
+    The session is checked to be alive before it is reused, and it is recycled
+    after max_uses measurements. Its session timeout is only twice the timeout of a
+    measurement, so that the server soon frees a device that hangs, and the session is
+    recycled when less than the timeout of a measurement is left.
+
+    Parameters
+    ----------
+    remote_args: Tuple
+        The argument for request_remote, (key, host, port, priority, timeout).
+        The timeout is the one of a measurement.
+    max_uses: int
+        The number of measurements a session is used for
+
+    Returns
+    ------
+    lease: LeasedSession
+        The leased session, with its use counted
+    """
+    key, host, port, priority, timeout = remote_args
+    lease = _LEASED_SESSIONS.get(remote_args)
+    if lease is not None and (
+        lease.n_uses >= max_uses or time.time() + timeout > lease.deadline or not lease.is_alive()
+    ):
+        recycle_remote(remote_args)
+        lease = None
+    if lease is None:
+        session_timeout = 2 * timeout
+        lease = LeasedSession(
+            request_remote(key, host, port, priority, session_timeout), session_timeout
+        )
+        _LEASED_SESSIONS[remote_args] = lease
+    lease.n_uses += 1
+    return lease
+
+
+def recycle_remote(remote_args):
+    """Clean up and close the remote session leased by the current process for a device
+
+    Parameters
+    ----------
+    remote_args: Tuple
+        The argument for request_remote the session was leased with
+    """
+    lease = _LEASED_SESSIONS.pop(remote_args, None)
+    if lease is not None:
+        lease.cleanup()
+
+
 def check_remote(target, device_key, host=None, port=None, priority=100, timeout=10):
     """
     Check the availability of a remote device
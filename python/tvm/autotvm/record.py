@@ -103,6 +103,8 @@ def encode(inp, result, protocol="json"):
             "version": AUTOTVM_LOG_VERSION,
             "tvm_version": __version__,
         }
+        if result.censored:
+            json_dict["censored"] = True
         return json.dumps(json_dict)
     if protocol == "pickle":
         row = (
@@ -171,7 +173,10 @@ def decode(row, protocol="json"):
         tsk = task.Task(clean_json_to_python(task_name), clean_json_to_python(task_args))
         config = ConfigEntity.from_json_dict(row["config"])
         inp = MeasureInput(tgt, tsk, config)
-        result = MeasureResult(*[tuple(x) if isinstance(x, list) else x for x in row["result"]])
+        result = MeasureResult(
+            *[tuple(x) if isinstance(x, list) else x for x in row["result"]],
+            censored=row.get("censored", False),
+        )
         config.cost = np.mean(result.costs)
 
         return inp, result
@@ -215,9 +220,10 @@ def load_from_file(filename):
             yield ret
 
 
-def split_workload(in_file, clean=True):
+def split_workload(in_file, clean=True, max_open_files=64):
     """Split a log file into separate files, each of which contains only a single workload
-    This function can also delete duplicated records in log file
+    This function can also delete duplicated records in log file.
+    Records are streamed to the output files, so the log is never fully loaded in memory.
 
     Parameters
     ----------
@@ -225,48 +231,176 @@ def split_workload(in_file, clean=True):
         input filename
     clean: bool
         whether delete duplicated items
+    max_open_files: int
+        The maximum number of output files kept open at once.
+        The least recently written file is closed and reopened when it is needed again.
     """
     tic = time.time()
-    lines = list(open(in_file).readlines())
-
     logger.info("start converting...")
+
+    wkl_dict = OrderedDict()  # workload -> [filename, number of valid, number of duplicated]
+    open_files = OrderedDict()  # workload -> the open output file, in order of last write
+    added = set()
     pool = multiprocessing.Pool()
-    lines = [rec for rec in pool.map(decode, lines) if rec is not None]
+    try:
+        with open(in_file) as fin:
+            for rec in pool.imap(decode, fin, chunksize=1024):
+                if rec is None:
+                    continue
+                inp, res = rec
+                wkl = measure_str_key(inp, False)
+                if wkl not in wkl_dict:
+                    wkl_dict[wkl] = [in_file + ".%03d.wkl" % len(wkl_dict), 0, 0]
+                    mode = "w"
+                else:
+                    mode = "a"
+                entry = wkl_dict[wkl]
+                if clean:
+                    # clean duplicated items
+                    str_key = measure_str_key(inp)
+                    if str_key in added:
+                        entry[2] += 1
+                        continue
+                    added.add(str_key)
+                if wkl in open_files:
+                    open_files.move_to_end(wkl)
+                else:
+                    if len(open_files) >= max_open_files:
+                        open_files.popitem(last=False)[1].close()
+                    open_files[wkl] = open(entry[0], mode)
+                open_files[wkl].write(encode(inp, res) + "\n")
+                entry[1] += 1
+    finally:
+        pool.close()
+        pool.join()
+        for fout in open_files.values():
+            fout.close()
     logger.info("map done %.2f", time.time() - tic)
 
-    wkl_dict = OrderedDict()
-    for inp, res in lines:
-        wkl = measure_str_key(inp, False)
-        if wkl not in wkl_dict:
-            wkl_dict[wkl] = []
-        wkl_dict[wkl].append([inp, res])
-
-    if clean:
-        for i, (k, v) in enumerate(wkl_dict.items()):
-            # clean duplicated items
-            added = set()
-            cleaned = []
-            for inp, res in v:
-                str_key = measure_str_key(inp)
-                if str_key in added:
-                    continue
-                added.add(str_key)
-                cleaned.append([inp, res])
-
-            # write to file
-            logger.info("Key: %s\tValid: %d\tDup: %d\t", k, len(cleaned), len(v) - len(cleaned))
-            with open(args.i + ".%03d.wkl" % i, "w") as fout:
-                for inp, res in cleaned:
-                    fout.write(encode(inp, res) + "\n")
+    for k, (_, valid, dup) in wkl_dict.items():
+        if clean:
+            logger.info("Key: %s\tValid: %d\tDup: %d\t", k, valid, dup)
+        else:
+            logger.info("Key: %s\tNum: %d", k, valid)
+
+
+def _split_chunks(filename, chunk_size):
+    """Split a file into byte ranges of about chunk_size bytes"""
+    size = os.path.getsize(filename)
+    return [(begin, min(begin + chunk_size, size)) for begin in range(0, size, chunk_size)]
+
+
+def _distill_chunk(args):
+    """Compute the best table of the lines starting inside a byte range of a log file.
+
+    The table maps (is_model, target key or model, workload) to (cost, file_id, offset, line),
+    which follows the keys of ApplyHistoryBest. Ties are broken by the position in the
+    logs, so the earliest best record wins the same way it does in ApplyHistoryBest.
+    """
+    file_id, filename, begin, end, protocol = args
+    best = {}
+    with open(filename, "rb") as fin:
+        if begin > 0:
+            # a line belongs to the chunk where it starts
+            fin.seek(begin - 1)
+            begin += len(fin.readline()) - 1
+        offset = begin
+        while offset < end:
+            line = fin.readline()
+            if not line:
+                break
+            pos = offset
+            offset += len(line)
+            row = line.decode().rstrip("\n")
+            if not row or row.startswith("#"):
+                continue
+            ret = decode(row, protocol)
+            if ret is None:
+                continue
+            inp, res = ret
+            if res.error_no != 0:
+                continue
+            value = (np.mean(res.costs), file_id, pos, row)
+            keys = [(False, k, inp.task.workload) for k in inp.target.keys]
+            if inp.target.model != "unknown":
+                keys.append((True, inp.target.model, inp.task.workload))
+            for key in keys:
+                if key not in best or best[key][:3] > value[:3]:
+                    best[key] = value
+    return best
+
+
+def distill_log(in_files, out_file, n_parallel=None, chunk_size=64 * 1024 * 1024, protocol="json"):
+    """
+    Pick the best entries from log files and store them to another file.
+
+    Every file is split into byte ranges of chunk_size bytes, and the ranges are
+    distilled in parallel worker processes. Each worker only keeps a best table
+    keyed by (target key or model, workload), and the tables are merged as they arrive,
+    so memory is bounded by the number of workloads, not by the number of lines.
+    The selected records are identical to the ones that ApplyHistoryBest picks
+    from the concatenation of in_files.
+
+    Parameters
+    ----------
+    in_files: str or List[str]
+        The filenames of input
+    out_file: str or file
+        The filename of output, or a file object to write the best entries to
+    n_parallel: Optional[int]
+        The number of worker processes. Defaults to the number of cpus.
+        If 1, the logs are distilled in the current process.
+    chunk_size: int
+        The number of bytes of log decoded by a worker at a time
+    protocol: str
+        log protocol, json or pickle
+
+    Returns
+    -------
+    n_best: int
+        The number of best records written to out_file
+    """
+    if isinstance(in_files, str):
+        in_files = [in_files]
+    jobs = []
+    for file_id, filename in enumerate(in_files):
+        for begin, end in _split_chunks(filename, chunk_size):
+            jobs.append((file_id, filename, begin, end, protocol))
+
+    best = {}
+
+    def _merge(chunk_best):
+        for key, value in chunk_best.items():
+            if key not in best or best[key][:3] > value[:3]:
+                best[key] = value
+
+    n_parallel = n_parallel or multiprocessing.cpu_count()
+    if n_parallel == 1 or len(jobs) <= 1:
+        for job in jobs:
+            _merge(_distill_chunk(job))
     else:
-        for i, (k, v) in enumerate(wkl_dict.items()):
-            logger.info("Key: %s\tNum: %d", k, len(v))
-            with open(args.i + ".%03d.wkl" % i, "w") as fout:
-                for inp, res in v:
-                    fout.write(encode(inp, res) + "\n")
+        pool = multiprocessing.Pool(min(n_parallel, len(jobs)))
+        try:
+            for chunk_best in pool.imap_unordered(_distill_chunk, jobs):
+                _merge(chunk_best)
+        finally:
+            pool.close()
+            pool.join()
+
+    # a record can be the best of several keys, write it once in log order
+    rows = sorted(set(value[1:] for value in best.values()))
+    logger.info("Extract %d best records from %s", len(rows), ", ".join(in_files))
+    fout = open(out_file, "w") if isinstance(out_file, str) else out_file
+    try:
+        for _, _, row in rows:
+            fout.write(row + "\n")
+    finally:
+        if isinstance(out_file, str):
+            fout.close()
+    return len(rows)
 
 
-def pick_best(in_file, out_file):
+def pick_best(in_file, out_file, n_parallel=1):
     """
     Pick the best entries from a file and store them to another file.
     This function distills the useful log entries from a large log file.
@@ -276,12 +410,27 @@ def pick_best(in_file, out_file):
     Parameters
     ----------
     in_file: str
-        The filename of input
+        The filename of input, either a log file or a record store
     out_file: str or file
         The filename of output
+    n_parallel: Optional[int]
+        The number of worker processes used to distill a log file,
+        see :any:`distill_log`. Defaults to the current process only.
     """
-    context = load_from_file(in_file)
-    if os.path.isfile(out_file):
+    # pylint: disable=import-outside-toplevel
+    from .record_store import RecordStore, is_record_store
+
+    if not is_record_store(in_file):
+        in_files = [in_file]
+        if isinstance(out_file, str) and os.path.isfile(out_file):
+            in_files.append(out_file)
+        distill_log(in_files, out_file, n_parallel=n_parallel)
+        return
+
+    # only the indexed best records of a store need to be decoded
+    with RecordStore(in_file) as store:
+        context = list(store.best_records())
+    if isinstance(out_file, str) and os.path.isfile(out_file):
         out_context = load_from_file(out_file)
         context = itertools.chain(context, out_context)
     context, context_clone = itertools.tee(context)
@@ -305,33 +454,37 @@ def pick_best(in_file, out_file):
 
 """
 Usage:
-This record executable module has three modes.
+This record executable module has four modes.
 
 * Print log file in readable format
 e.g. python -m tvm.autotvm.record --mode read --i collect_conv.log --begin 0 --end 5 --ir --code
 
-* Extract history best from a large log file
-e.g. python -m tvm.autotvm.record --mode pick --i collect.log
+* Extract history best from a large log file, with 16 worker processes
+e.g. python -m tvm.autotvm.record --mode pick --i collect.log --j 16
 
 * Split a log file into separate files, each of which contains only a single wkl
 e.g. python -m tvm.autotvm.record --mode split --i collect.log
+
+* Convert a log file to an indexed record store
+e.g. python -m tvm.autotvm.record --mode convert --i collect.log --o collect.tvmrec
 """
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
-    parser.add_argument("--mode", choices=["read", "pick", "split"], default="read")
+    parser.add_argument("--mode", choices=["read", "pick", "split", "convert"], default="read")
     parser.add_argument("--i", type=str, help="input file")
     parser.add_argument("--o", type=str, default=None, help="output file")
     parser.add_argument("--begin", type=int, default=0)
     parser.add_argument("--end", type=int, default=5)
     parser.add_argument("--ir", action="store_true")
     parser.add_argument("--code", action="store_true")
+    parser.add_argument("--j", type=int, default=None, help="number of worker processes")
 
     args = parser.parse_args()
     logging.basicConfig(level=logging.INFO)
 
     if args.mode == "pick":
         args.o = args.o or args.i + ".best.log"
-        pick_best(args.i, args.o)
+        pick_best(args.i, args.o, n_parallel=args.j)
     elif args.mode == "read":
         for i, (inp, result) in enumerate(load_from_file(args.i)):
             if args.begin <= i < args.end:
@@ -352,3 +505,8 @@ if __name__ == "__main__":
                         print(func.imported_modules[0].get_source())
     elif args.mode == "split":
         split_workload(args.i)
+    elif args.mode == "convert":
+        from .record_store import convert_to_store
+
+        args.o = args.o or args.i + ".tvmrec"
+        convert_to_store(args.i, args.o).close()
@@ -0,0 +1,353 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=invalid-name
+"""
+Indexed binary store of tuning records.
+
+The store is made of two files:
+
+* ``<path>``: an append-only data file. Every record is framed by a fixed-size
+  header holding the payload length, the length of its index keys, its error
+  number and its mean cost, followed by the pickled index keys and the record
+  itself encoded with :any:`autotvm.record.encode`.
+
+* ``<path>.idx``: a persistent index that maps ``(target key or model, workload)``
+  to the offset and cost of the best valid record. The index also remembers how
+  many bytes of the data file it covers, so records appended by another writer
+  are picked up by scanning only their headers.
+
+Queries only decode the records they hit, so opening a store with millions of
+rows costs one index load instead of a full parse of the log.
+"""
+import logging
+import os
+import pickle
+import struct
+
+import numpy as np
+
+from .record import encode, decode, AUTOTVM_LOG_VERSION
+
+logger = logging.getLogger("autotvm")
+
+RECORD_STORE_MAGIC = b"TVMREC\x00\x01"
+_HEADER = struct.Struct("<IIid")
+_INDEX_SUFFIX = ".idx"
+
+
+def is_record_store(filename):
+    """Check whether a file is an autotvm record store
+
+    Parameters
+    ----------
+    filename: str
+        The filename to check
+
+    Returns
+    -------
+    ret: bool
+        True if the file starts with the record store magic
+    """
+    if not isinstance(filename, str) or not os.path.isfile(filename):
+        return False
+    with open(filename, "rb") as fin:
+        return fin.read(len(RECORD_STORE_MAGIC)) == RECORD_STORE_MAGIC
+
+
+def _index_keys(inp):
+    """The index keys of a record. Target keys and target models are kept apart
+    the same way ApplyHistoryBest keeps best_by_targetkey and best_by_model apart."""
+    workload = inp.task.workload
+    keys = [(False, k, workload) for k in inp.target.keys]
+    if inp.target.model != "unknown":
+        keys.append((True, inp.target.model, workload))
+    return keys
+
+
+class RecordStore(object):
+    """
+    Append-only binary store of tuning records with a persistent best-config index
+
+    Parameters
+    ----------
+    filename: str
+        The path of the data file. The index is stored next to it with a ``.idx`` suffix.
+    protocol: str
+        The protocol used to encode the payload of each record, json or pickle
+
+    Examples
+    --------
+    .. code-block:: python
+
+        with RecordStore("conv2d.tvmrec") as store:
+            store.append(inp, res)
+        with autotvm.apply_history_best(RecordStore("conv2d.tvmrec")):
+            lib = relay.build(mod, target=target, params=params)
+    """
+
+    def __init__(self, filename, protocol="pickle"):
+        self.filename = filename
+        self.index_filename = filename + _INDEX_SUFFIX
+        self.protocol = protocol
+
+        # (target key or model, workload) -> (offset, cost)
+        self._index = {}
+        self._indexed_size = len(RECORD_STORE_MAGIC)
+        self._n_records = 0
+        self._dirty = False
+        self._fout = None
+        self._fin = None
+
+        if not os.path.isfile(filename):
+            with open(filename, "wb") as fout:
+                fout.write(RECORD_STORE_MAGIC)
+        elif not is_record_store(filename):
+            raise RuntimeError("%s is not an autotvm record store" % filename)
+
+        self._load_index()
+        self._catch_up()
+
+    def _load_index(self):
+        if not os.path.isfile(self.index_filename):
+            return
+        try:
+            with open(self.index_filename, "rb") as fin:
+                state = pickle.load(fin)
+        except (EOFError, pickle.UnpicklingError):
+            logger.warning("Corrupted index %s, rebuilding it", self.index_filename)
+            return
+        if state.get("protocol") != self.protocol or state.get("version") != AUTOTVM_LOG_VERSION:
+            return
+        if "count" not in state:
+            return
+        if state["size"] > os.path.getsize(self.filename):
+            # the data file was truncated or replaced, the index cannot be trusted
+            return
+        self._index = state["index"]
+        self._indexed_size = state["size"]
+        self._n_records = state["count"]
+
+    def _catch_up(self):
+        """Index the records appended after the last persisted index"""
+        size = os.path.getsize(self.filename)
+        if self._indexed_size >= size:
+            return
+        counter = 0
+        with open(self.filename, "rb") as fin:
+            fin.seek(self._indexed_size)
+            offset = self._indexed_size
+            while offset + _HEADER.size <= size:
+                header = fin.read(_HEADER.size)
+                payload_len, keys_len, error_no, cost = _HEADER.unpack(header)
+                if offset + _HEADER.size + keys_len + payload_len > size:
+                    # a partially written tail, leave it for the next catch up
+                    break
+                keys = pickle.loads(fin.read(keys_len))
+                fin.seek(payload_len, os.SEEK_CUR)
+                if error_no == 0:
+                    self._update_index(keys, offset, cost)
+                offset += _HEADER.size + keys_len + payload_len
+                counter += 1
+        self._indexed_size = offset
+        self._n_records += counter
+        self._dirty = True
+        logger.debug("Indexed %d new records in %s", counter, self.filename)
+
+    def _update_index(self, keys, offset, cost):
+        for key in keys:
+            best = self._index.get(key)
+            if best is None or best[1] > cost:
+                self._index[key] = (offset, cost)
+
+    def append(self, inp, res):
+        """Append a record to the store
+
+        Parameters
+        ----------
+        inp: autotvm.measure.MeasureInput
+        res: autotvm.measure.MeasureResult
+        """
+        if self._fout is None:
+            self._fout = open(self.filename, "ab")
+        keys = _index_keys(inp)
+        keys_blob = pickle.dumps(keys)
+        payload = encode(inp, res, self.protocol).encode()
+        cost = float(np.mean(res.costs)) if res.error_no == 0 else float("inf")
+
+        self._fout.seek(0, os.SEEK_END)
+        offset = self._fout.tell()
+        self._fout.write(_HEADER.pack(len(payload), len(keys_blob), res.error_no, cost))
+        self._fout.write(keys_blob)
+        self._fout.write(payload)
+
+        if offset == self._indexed_size:
+            if res.error_no == 0:
+                self._update_index(keys, offset, cost)
+            self._indexed_size = self._fout.tell()
+            self._n_records += 1
+            self._dirty = True
+        else:
+            # another writer appended in between, index its records together with ours
+            self._fout.flush()
+            self._catch_up()
+
+    def extend(self, records):
+        """Append a sequence of records to the store
+
+        Parameters
+        ----------
+        records: iterator of (autotvm.measure.MeasureInput, autotvm.measure.MeasureResult)
+        """
+        for inp, res in records:
+            self.append(inp, res)
+
+    def _read_at(self, offset):
+        if self._fout is not None:
+            self._fout.flush()
+        if self._fin is None:
+            self._fin = open(self.filename, "rb")
+        self._fin.seek(offset)
+        payload_len, keys_len, _, _ = _HEADER.unpack(self._fin.read(_HEADER.size))
+        self._fin.seek(keys_len, os.SEEK_CUR)
+        return decode(self._fin.read(payload_len).decode(), self.protocol)
+
+    def query(self, key, by_model=False):
+        """Get the best record of a key
+
+        Parameters
+        ----------
+        key: Tuple[str, Tuple]
+            A (target key, workload) pair, or a (target model, workload) pair if by_model
+        by_model: bool
+            Whether the first element of key is a target model instead of a target key
+
+        Returns
+        -------
+        ret: tuple(autotvm.measure.MeasureInput, autotvm.measure.MeasureResult) or None
+            The best valid record, or None if the store has no valid record for the key
+        """
+        best = self._index.get((by_model,) + tuple(key))
+        if best is None:
+            return None
+        return self._read_at(best[0])
+
+    def keys(self, by_model=False):
+        """All the (target key, workload) pairs, or (target model, workload) pairs
+        if by_model, that have a valid record"""
+        return [key[1:] for key in self._index if key[0] == by_model]
+
+    def best_records(self):
+        """Generator: decode the best record of every indexed key.
+        A record that is the best for several keys is yielded only once.
+
+        Yields
+        ------
+        input: autotvm.measure.MeasureInput
+        result: autotvm.measure.MeasureResult
+        """
+        for offset in sorted(set(offset for offset, _ in self._index.values())):
+            ret = self._read_at(offset)
+            if ret is not None:
+                yield ret
+
+    def __iter__(self):
+        """Generator: decode every record in the store in insertion order"""
+        self.flush()
+        with open(self.filename, "rb") as fin:
+            fin.seek(len(RECORD_STORE_MAGIC))
+            while True:
+                header = fin.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    break
+                payload_len, keys_len, _, _ = _HEADER.unpack(header)
+                fin.seek(keys_len, os.SEEK_CUR)
+                payload = fin.read(payload_len)
+                if len(payload) < payload_len:
+                    break
+                ret = decode(payload.decode(), self.protocol)
+                if ret is not None:
+                    yield ret
+
+    def flush(self):
+        """Flush appended records and persist the index"""
+        if self._fout is not None:
+            self._fout.flush()
+        if not self._dirty:
+            return
+        state = {
+            "version": AUTOTVM_LOG_VERSION,
+            "protocol": self.protocol,
+            "size": self._indexed_size,
+            "count": self._n_records,
+            "index": self._index,
+        }
+        tmp_filename = self.index_filename + ".tmp.%d" % os.getpid()
+        with open(tmp_filename, "wb") as fout:
+            pickle.dump(state, fout, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_filename, self.index_filename)
+        self._dirty = False
+
+    def close(self):
+        """Flush the store and release its file handles"""
+        self.flush()
+        for f in (self._fout, self._fin):
+            if f is not None:
+                f.close()
+        self._fout = self._fin = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, ptype, value, trace):
+        self.close()
+
+    def __len__(self):
+        """The number of indexed records, including the invalid ones"""
+        return self._n_records
+
+
+def convert_to_store(in_file, out_file, protocol="json"):
+    """Convert a text log of encoded records to a record store.
+    Records are appended if out_file is already a record store.
+
+    Parameters
+    ----------
+    in_file: str
+        The filename of the text log
+    out_file: str
+        The filename of the record store
+    protocol: str
+        The protocol of the text log, json or pickle
+
+    Returns
+    -------
+    store: RecordStore
+        The opened record store
+    """
+    store = RecordStore(out_file)
+    counter = 0
+    with open(in_file) as fin:
+        for row in fin:
+            if row and not row.startswith("#"):
+                ret = decode(row, protocol)
+                if ret is None:
+                    continue
+                store.append(*ret)
+                counter += 1
+    store.flush()
+    logger.info("Convert %d records from %s to %s", counter, in_file, out_file)
+    return store
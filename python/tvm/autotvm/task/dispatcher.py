@@ -186,8 +186,9 @@ class ApplyHistoryBest(DispatchContext):
     ----------
     records : str or iterator of (autotvm.measure.MeasureInput, autotvm.measure.MeasureResult)
         Collection of tuning records.
-        If is str, then it should be the filename of a records log file.
-        Each row of this file is an encoded record pair. Otherwise, it is an iterator.
+        If is str, then it should be the filename of a records log file or of a
+        record store. Each row of a log file is an encoded record pair.
+        Otherwise, it is an iterator or an autotvm.record_store.RecordStore.
     """
 
     def __init__(self, records):
@@ -196,6 +197,8 @@ class ApplyHistoryBest(DispatchContext):
         self.best_by_targetkey = {}
         self.best_by_model = {}
         self._best_user_defined = {}
+        self._stores = []
+        self._queried_keys = set()
 
         if records:
             self.load(records)
@@ -207,18 +210,27 @@ class ApplyHistoryBest(DispatchContext):
         ----------
         records : str or iterator of (autotvm.measure.MeasureInput, autotvm.measure.MeasureResult)
             Collection of tuning records.
-            If is str, then it should be the filename of a records log file.
-            Each row of this file is an encoded record pair. Otherwise, it is an iterator.
+            If is str, then it should be the filename of a records log file or of a
+            record store. Each row of a log file is an encoded record pair.
+            Otherwise, it is an iterator or an autotvm.record_store.RecordStore.
+            Records of a record store are only decoded when they are queried.
         """
         # pylint: disable=import-outside-toplevel
         from pathlib import Path
         from ..record import load_from_file
+        from ..record_store import RecordStore, is_record_store
 
         if isinstance(records, Path):
             records = str(records)
 
         if isinstance(records, str):
-            records = load_from_file(records)
+            if is_record_store(records):
+                records = RecordStore(records)
+            else:
+                records = load_from_file(records)
+        if isinstance(records, RecordStore):
+            self._stores.append(records)
+            return
         if not records:
             return
 
@@ -253,6 +265,18 @@ class ApplyHistoryBest(DispatchContext):
 
         logger.debug("Finish loading %d records", counter)
 
+    def _query_stores(self, key, by_model):
+        """Decode the best record of a key from the loaded record stores"""
+        best_map = self.best_by_model if by_model else self.best_by_targetkey
+        for store in self._stores:
+            ret = store.query(key, by_model)
+            if ret is None:
+                continue
+            if key not in best_map or np.mean(best_map[key][1].costs) > np.mean(ret[1].costs):
+                best_map[key] = ret
+        # the stores are immutable from our point of view, only query them once
+        self._queried_keys.add((by_model, key))
+
     def _query_inside(self, target, workload):
         if target is None:
             raise RuntimeError(
@@ -265,6 +289,8 @@ class ApplyHistoryBest(DispatchContext):
         key = (target.model, workload)
         if key in self._best_user_defined:
             return self._best_user_defined[key]
+        if self._stores and (True, key) not in self._queried_keys:
+            self._query_stores(key, True)
         if key in self.best_by_model:
             inp, _ = self.best_by_model[key]
             return inp.config
@@ -274,6 +300,8 @@ class ApplyHistoryBest(DispatchContext):
             key = (k, workload)
             if key in self._best_user_defined:
                 return self._best_user_defined[key]
+            if self._stores and (False, key) not in self._queried_keys:
+                self._query_stores(key, False)
             if key in self.best_by_targetkey:
                 inp, _ = self.best_by_targetkey[key]
                 return inp.config
@@ -32,7 +32,7 @@ logger = logging.getLogger("autotvm")
 
 
 # TODO(moreau89) find a more elegant way to lower for VTAs
-def _lower(mod, target, params):
+def _lower(mod, target, params, disable_cache=False):
     """Helper to lower VTA properly."""
     # pylint: disable=import-outside-toplevel
     from tvm import relay
@@ -51,10 +51,15 @@ def _lower(mod, target, params):
     # Try graph codegen first to extract autotvm tasks.
     # If failed to compile, then fallback to use VM compiler.
     # TODO: Currently VM compiler is likely to stack overflow for large models.
+    # Disabling the compile engine cache traces every appearance of a workload,
+    # which gives the weights of the tasks.
     try:
-        opt_mod, _ = relay.optimize(mod, target, params)
-        grc = graph_runtime_codegen.GraphRuntimeCodegen(None, target)
-        grc.codegen(opt_mod["main"])
+        with tvm.transform.PassContext(
+            config={"relay.backend.disable_compile_engine_cache": disable_cache}
+        ):
+            opt_mod, _ = relay.optimize(mod, target, params)
+            grc = graph_runtime_codegen.GraphRuntimeCodegen(None, target)
+            grc.codegen(opt_mod["main"])
     except tvm.TVMError as e:
         print(
             "Get errors with GraphRuntimeCodegen for task extraction. "
@@ -66,7 +71,7 @@ def _lower(mod, target, params):
         compiler.lower(mod, target=target)
 
 
-def extract_from_program(mod, params, target, target_host=None, ops=None):
+def extract_from_program(mod, params, target, target_host=None, ops=None, return_weights=False):
     """Extract tuning tasks from a relay program.
 
     This function is the single program version of extract_from_multiple_program.
@@ -83,16 +88,22 @@ def extract_from_program(mod, params, target, target_host=None, ops=None):
         The host compilation target
     ops: List[tvm.ir.Op] or None
         List of relay ops to be tuned. If not specified, all tunable ops will be extracted.
+    return_weights: bool
+        Whether to also return the weights of the tasks
 
     Returns
     -------
     task: Array of autotvm.task.Task
         collected tasks
+    weights: List[int]
+        The weight (i.e. the number of appearances) of every task, only if return_weights
     """
-    return extract_from_multiple_program([mod], [params], target, target_host, ops)
+    return extract_from_multiple_program([mod], [params], target, target_host, ops, return_weights)
 
 
-def extract_from_multiple_program(mods, params, target, target_host=None, ops=None):
+def extract_from_multiple_program(
+    mods, params, target, target_host=None, ops=None, return_weights=False
+):
     """Extract tuning tasks from multiple relay programs.
 
     This function collects tuning tasks by building a list of programs
@@ -110,11 +121,16 @@ def extract_from_multiple_program(mods, params, target, target_host=None, ops=No
         The host compilation target
     ops: List[tvm.ir.Op] or None
         List of relay ops to be tuned.  If not specified, all tunable ops will be extracted.
+    return_weights: bool
+        Whether to also return the weights of the tasks, which can be given to
+        :any:`autotvm.tuner.TaskScheduler`
 
     Returns
     -------
     task: Array of autotvm.task.Task
         collected tasks
+    weights: List[int]
+        The weight (i.e. the number of appearances) of every task, only if return_weights
     """
     # pylint: disable=import-outside-toplevel
     from tvm import relay
@@ -137,7 +153,9 @@ def extract_from_multiple_program(mods, params, target, target_host=None, ops=No
             ), "only support relay Module or Function to be tuned"
             relay.backend.compile_engine.get().clear()
             # wrap build call in thread to avoid multiprocessing problems
-            build_thread = threading.Thread(target=_lower, args=(mod, target, param))
+            build_thread = threading.Thread(
+                target=_lower, args=(mod, target, param, return_weights)
+            )
             build_thread.start()
             build_thread.join()
             relay.backend.compile_engine.get().clear()
@@ -150,11 +168,15 @@ def extract_from_multiple_program(mods, params, target, target_host=None, ops=No
 
     # create tasks for target
     tasks = []
+    weights = []
     for task_name, args in env.get_tasks():
         try:
             tsk = create(task_name, args, target=target, target_host=target_host)
             tasks.append(tsk)
+            weights.append(env.get_task_weight(task_name, args))
         except topi.InvalidShapeError:
             logger.warning("Invalid shape during AutoTVM task creation")
 
+    if return_weights:
+        return tasks, weights
     return tasks
@@ -672,6 +672,7 @@ class ConfigSpace(object):
         self.flop = 0
         self.cost = None
         self.is_fallback = False
+        self._feature_tables = None
 
     @staticmethod
     def axis(var):
@@ -837,9 +838,13 @@ class ConfigSpace(object):
 
     def __len__(self):
         if self._length is None:
-            self._length = int(np.prod([len(x) for x in self.space_map.values()]))
+            self._length = self._num_points()
         return self._length
 
+    def _num_points(self):
+        # python integers, the product of the dims can exceed int64
+        return functools.reduce(lambda x, y: x * y, self.dims, 1)
+
     def get(self, index):
         """Get a config entity with detailed parameters from this space
 
@@ -848,8 +853,9 @@ class ConfigSpace(object):
         index: int
             index in the space
         """
-        if index < 0 or index >= len(self):
-            raise IndexError("Index out of range: size {}, got index {}".format(len(self), index))
+        n_points = self._num_points()
+        if index < 0 or index >= n_points:
+            raise IndexError("Index out of range: size {}, got index {}".format(n_points, index))
         entities = OrderedDict()
         t = index
         for name, space in self.space_map.items():
@@ -858,6 +864,119 @@ class ConfigSpace(object):
         ret = ConfigEntity(index, self.code_hash, entities, self._constraints)
         return ret
 
+    @property
+    def dims(self):
+        """The number of entities of every knob, in the order of space_map"""
+        return [len(x) for x in self.space_map.values()]
+
+    def _index_dtype(self):
+        # indexes of spaces beyond int64 fall back to python integers,
+        # len(self) cannot tell as it raises OverflowError beyond sys.maxsize
+        return np.int64 if self._num_points() < 2 ** 63 else object
+
+    def _strides(self):
+        strides = []
+        stride = 1
+        for dim in self.dims:
+            strides.append(stride)
+            stride *= dim
+        return np.array(strides, dtype=self._index_dtype())
+
+    def get_knobs(self, indexes):
+        """Decode a batch of indexes to their knob form, without creating any config entity.
+        Column j of the result is the index of the entity of the j-th knob of space_map,
+        which is the same decomposition as :any:`get`.
+
+        Parameters
+        ----------
+        indexes: Array of int
+            indexes in the space
+
+        Returns
+        -------
+        knobs: np.ndarray
+            Two dimensional array of shape (len(indexes), len(space_map))
+        """
+        dtype = self._index_dtype()
+        indexes = np.asarray(indexes, dtype=dtype).reshape(-1)
+        n_points = self._num_points()
+        if indexes.size and (indexes.min() < 0 or indexes.max() >= n_points):
+            raise IndexError(
+                "Index out of range: size {}, got indexes in [{}, {}]".format(
+                    n_points, indexes.min(), indexes.max()
+                )
+            )
+        dims = np.array(self.dims, dtype=dtype)
+        return (indexes[:, None] // self._strides()) % dims
+
+    def get_indexes(self, knobs):
+        """Encode a batch of knob forms to their indexes. This is the inverse of :any:`get_knobs`.
+
+        Parameters
+        ----------
+        knobs: Array of Array of int
+            Two dimensional array of shape (n, len(space_map))
+
+        Returns
+        -------
+        indexes: np.ndarray
+            One dimensional array of indexes in the space
+        """
+        dtype = self._index_dtype()
+        knobs = np.asarray(knobs, dtype=dtype).reshape(-1, len(self.space_map))
+        if knobs.size and (np.any(knobs < 0) or np.any(knobs >= np.array(self.dims, dtype=dtype))):
+            raise IndexError("Knob out of range: dims {}".format(self.dims))
+        return (knobs * self._strides()).sum(axis=1, dtype=dtype)
+
+    def get_batch(self, indexes):
+        """Get config entities for a batch of indexes. The entities of the returned
+        configs are only materialized when they are accessed, e.g. when a schedule is
+        instantiated, so this is cheap for configs that are only used by their index.
+
+        Parameters
+        ----------
+        indexes: Array of int
+            indexes in the space
+
+        Returns
+        -------
+        configs: List[LazyConfigEntity]
+        """
+        knobs = self.get_knobs(indexes)
+        return [
+            LazyConfigEntity(int(index), self.code_hash, self.space_map, knob, self._constraints)
+            for index, knob in zip(np.asarray(indexes).reshape(-1), knobs)
+        ]
+
+    def get_flatten_features(self, indexes):
+        """Get the flatten features of a batch of indexes.
+        Row i is equal to ``self.get(indexes[i]).get_flatten_feature()``, but the features
+        are gathered from per-knob tables instead of being built entity by entity.
+
+        Parameters
+        ----------
+        indexes: Array of int
+            indexes in the space
+
+        Returns
+        -------
+        fea: np.ndarray
+            Two dimensional float32 array of shape (len(indexes), feature length)
+        """
+        if self._feature_tables is None:
+            self._feature_tables = [
+                np.array(
+                    [_flatten_entity(entity) for entity in space.entities], dtype=np.float32
+                ).reshape(len(space), -1)
+                for space in self.space_map.values()
+            ]
+        knobs = self.get_knobs(indexes).astype(np.int64)
+        if not self._feature_tables:
+            return np.empty((len(knobs), 0), dtype=np.float32)
+        return np.concatenate(
+            [table[knobs[:, j]] for j, table in enumerate(self._feature_tables)], axis=1
+        )
+
     def __iter__(self):
         return self._entity_map.__iter__()
 
@@ -894,6 +1013,26 @@ _ann_to_number = {
 }
 
 
+def _flatten_entity(entity):
+    """flatten a transform entity to a list of numbers, see ConfigEntity.get_flatten_feature"""
+    if isinstance(entity, SplitEntity):
+        return list(entity.size)
+    if isinstance(entity, ReorderEntity):
+        # use a naive way: directly copy the permutation
+        return list(entity.perm)
+    if isinstance(entity, AnnotateEntity):
+        # one-hot encoding
+        fea = []
+        for ann in entity.anns:
+            tmp = [0] * len(_ann_to_number)
+            tmp[_ann_to_number[ann]] = 1
+            fea.extend(tmp)
+        return fea
+    if isinstance(entity, OtherOptionEntity):
+        return [entity.val]
+    return []
+
+
 class ConfigEntity(ConfigSpace):
     """A configuration with detailed parameters
 
@@ -928,19 +1067,7 @@ class ConfigEntity(ConfigSpace):
         """
         fea = []
         for _, v in self._entity_map.items():
-            if isinstance(v, SplitEntity):
-                fea.extend(v.size)
-            elif isinstance(v, ReorderEntity):
-                # use a naive way: directly copy the permutation
-                fea.extend(v.perm)
-            elif isinstance(v, AnnotateEntity):
-                # one-hot encoding
-                for ann in v.anns:
-                    tmp = [0] * len(_ann_to_number)
-                    tmp[_ann_to_number[ann]] = 1
-                    fea.extend(tmp)
-            elif isinstance(v, OtherOptionEntity):
-                fea.append(v.val)
+            fea.extend(_flatten_entity(v))
         return np.array(fea, dtype=np.float32)
 
     def get_other_option(self):
@@ -1019,6 +1146,58 @@ class ConfigEntity(ConfigSpace):
         return "%s,%s,%d" % (str(self._entity_map)[12:-1], self.code_hash, self.index)
 
 
+class LazyConfigEntity(ConfigEntity):
+    """A configuration backed by a row of a knob matrix, see :any:`ConfigSpace.get_batch`.
+    Its entity map is only materialized on first access.
+    It is pickled as a plain ConfigEntity.
+
+    Parameters
+    ----------
+    index: int
+        index of this config in space
+    code_hash: str
+        hash of schedule code
+    space_map: dict
+        map name to transform space
+    knob: Array of int
+        index of the entity in every transform space
+    constraints : list
+        List of constraints
+    """
+
+    def __init__(self, index, code_hash, space_map, knob, constraints):
+        self._space_map_ref = space_map
+        self._knob = knob
+        self._entities = None
+        super(LazyConfigEntity, self).__init__(index, code_hash, None, constraints)
+
+    @property
+    def _entity_map(self):
+        if self._entities is None:
+            self._entities = OrderedDict(
+                (name, space[int(k)])
+                for (name, space), k in zip(self._space_map_ref.items(), self._knob)
+            )
+        return self._entities
+
+    @_entity_map.setter
+    def _entity_map(self, entity_map):
+        self._entities = entity_map
+
+    def __reduce__(self):
+        state = {
+            k: v
+            for k, v in self.__dict__.items()
+            if k not in ("_space_map_ref", "_knob", "_entities")
+        }
+        state["_entity_map"] = self._entity_map
+        return (
+            ConfigEntity,
+            (self.index, self.code_hash, state["_entity_map"], self._constraints),
+            state,
+        )
+
+
 class FallbackConfigEntity(ConfigSpace):
     """The config entity created to support fallback"""
 
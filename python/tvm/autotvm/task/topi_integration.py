@@ -49,12 +49,14 @@ class TaskExtractEnv:
     def __init__(self, allow_duplicate=False):
         self.allow_duplicate = allow_duplicate
         self.task_collection = []
+        self.task_weights = {}
         self.wanted_relay_ops = None
         self.modified_funcs = []
         self.tracing = False
 
     def __enter__(self):
         self.task_collection = []
+        self.task_weights = {}
         self.tracing = True
 
         return self
@@ -71,6 +73,7 @@ class TaskExtractEnv:
             The relay ops to be extracted
         """
         self.task_collection = []
+        self.task_weights = {}
         self.wanted_relay_ops = wanted_relay_ops
 
     def add_task(self, task_name, args):
@@ -85,6 +88,7 @@ class TaskExtractEnv:
             Arguments to the TOPI function.
         """
         key = (task_name, serialize_args(args))
+        self.task_weights[key] = self.task_weights.get(key, 0) + 1
         if self.allow_duplicate or key not in self.task_collection:
             self.task_collection.append(key)
 
@@ -98,6 +102,24 @@ class TaskExtractEnv:
         """
         return self.task_collection
 
+    def get_task_weight(self, task_name, args):
+        """Get the number of times a task was traced
+
+        Parameters
+        ----------
+        task_name: str
+            AutoTVM task name.
+
+        args: tuple
+            Arguments to the TOPI function, as returned by get_tasks.
+
+        Returns
+        -------
+        weight: int
+            The number of appearances of the task in the traced programs
+        """
+        return self.task_weights.get((task_name, args), 0)
+
     @staticmethod
     def get(allow_duplicate=False):
         """Get the single instance of TaskExtractEnv
@@ -75,8 +75,7 @@ def log_to_database(db):
 
     def _callback(_, inputs, results):
         """Callback implementation"""
-        for inp, result in zip(inputs, results):
-            db.save(inp, result)
+        db.save_batch(inputs, results)
 
     return _callback
 
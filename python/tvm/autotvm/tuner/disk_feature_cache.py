@@ -0,0 +1,281 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=invalid-name,protected-access
+"""Persistent feature cache shared by cost models across tuning sessions"""
+import hashlib
+import logging
+import os
+
+import numpy as np
+
+from tvm.contrib.utils import filelock
+from .model_based_tuner import FeatureCache
+
+logger = logging.getLogger("autotvm")
+
+# A row of the index file of a bucket.
+# offset is the position of the feature in the feature file, in float32 elements,
+# or -1 if the feature extraction failed. flop is NaN if unknown.
+_INDEX_DTYPE = np.dtype([("index", "<i8"), ("offset", "<i8"), ("length", "<i8"), ("flop", "<f8")])
+
+
+class FeatureBucket(object):
+    """Features of one feature type of one task, stored in an append-only
+    index file and an append-only memory-mapped float32 feature file.
+
+    The bucket behaves like the dictionary of :any:`FeatureCache`,
+    mapping config indexes to features (or None if the extraction failed).
+    New features are buffered until :any:`flush`.
+
+    Parameters
+    ----------
+    prefix: str
+        The path prefix of the files of this bucket
+    """
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self.index_file = prefix + ".idx"
+        self.feature_file = prefix + ".fea"
+        self.lock_file = prefix + ".lock"
+        self._reset()
+
+    def _reset(self):
+        self._entries = {}  # config index -> (offset, length, flop)
+        self._pending = {}  # config index -> (feature, flop)
+        self._read_bytes = 0
+        self._inode = None
+        self._map = None
+
+    def refresh(self):
+        """Load the entries appended by other processes, and mark this bucket as used"""
+        try:
+            stat = os.stat(self.index_file)
+        except OSError:
+            if self._inode is not None:
+                # evicted by another process
+                pending = self._pending
+                self._reset()
+                self._pending = pending
+            return
+        if self._inode is not None and (
+            stat.st_ino != self._inode or stat.st_size < self._read_bytes
+        ):
+            pending = self._pending
+            self._reset()
+            self._pending = pending
+        self._inode = stat.st_ino
+        if stat.st_size > self._read_bytes:
+            with open(self.index_file, "rb") as fin:
+                fin.seek(self._read_bytes)
+                n = (stat.st_size - self._read_bytes) // _INDEX_DTYPE.itemsize
+                rows = np.frombuffer(fin.read(n * _INDEX_DTYPE.itemsize), dtype=_INDEX_DTYPE)
+            for row in rows:
+                self._entries[int(row["index"])] = (
+                    int(row["offset"]),
+                    int(row["length"]),
+                    float(row["flop"]),
+                )
+            self._read_bytes += n * _INDEX_DTYPE.itemsize
+        try:
+            os.utime(self.index_file)
+        except OSError:
+            pass
+
+    def __contains__(self, index):
+        return index in self._pending or index in self._entries
+
+    def __len__(self):
+        return len(self._entries) + sum(1 for x in self._pending if x not in self._entries)
+
+    def __getitem__(self, index):
+        if index in self._pending:
+            return self._pending[index][0]
+        offset, length, _ = self._entries[index]
+        if offset < 0:
+            return None
+        if self._map is None or offset + length > len(self._map):
+            self._map = np.memmap(self.feature_file, dtype=np.float32, mode="r")
+        return np.array(self._map[offset : offset + length])
+
+    def __setitem__(self, index, feature):
+        self.put(index, feature)
+
+    def put(self, index, feature, flop=float("nan")):
+        """Add the feature of a config
+
+        Parameters
+        ----------
+        index: int
+            The index of the config in the config space
+        feature: Optional[np.ndarray]
+            The feature, None if the extraction failed
+        flop: float, optional
+            The number of float operations of the config, NaN if unknown
+        """
+        self._pending[int(index)] = (feature, flop)
+
+    def get_flop(self, index):
+        """Get the number of float operations of a config, NaN if unknown"""
+        if index in self._pending:
+            return self._pending[index][1]
+        return self._entries[index][2]
+
+    def flush(self):
+        """Append the pending features to the files of this bucket
+
+        Returns
+        -------
+        n_bytes: int
+            The number of bytes written
+        """
+        if not self._pending:
+            return 0
+        lock = filelock(self.lock_file)
+        try:
+            # pick up the offsets written by other processes before appending
+            self.refresh()
+            with open(self.feature_file, "ab") as fout:
+                offset = fout.tell() // 4
+                rows = np.empty(len(self._pending), dtype=_INDEX_DTYPE)
+                for i, (index, (feature, flop)) in enumerate(self._pending.items()):
+                    if feature is None:
+                        rows[i] = (index, -1, 0, flop)
+                        continue
+                    feature = np.ascontiguousarray(feature, dtype=np.float32).reshape(-1)
+                    fout.write(feature.tobytes())
+                    rows[i] = (index, offset, len(feature), flop)
+                    offset += len(feature)
+            with open(self.index_file, "ab") as fout:
+                fout.write(rows.tobytes())
+        finally:
+            lock.release()
+        n_bytes = sum(int(row["length"]) * 4 for row in rows) + rows.nbytes
+        self._pending = {}
+        self.refresh()
+        return n_bytes
+
+    def evict(self):
+        """Remove the files of this bucket"""
+        lock = filelock(self.lock_file)
+        try:
+            for path in (self.index_file, self.feature_file):
+                if os.path.exists(path):
+                    os.remove(path)
+        finally:
+            lock.release()
+        self._reset()
+
+
+class DiskFeatureCache(FeatureCache):
+    """Feature cache stored in a directory, keyed by (feature type, task, config index).
+
+    It can be shared by cost models of different tuners and different tuning sessions,
+    e.g. a tuning session resumed from a log or transfer learning from old logs does not
+    need to extract the features of the configs it has seen before.
+    When the total size of the directory grows beyond `max_bytes`, the least recently
+    used tasks are evicted.
+
+    Parameters
+    ----------
+    directory: str
+        The directory of the cache
+    max_bytes: int, optional
+        The maximum size of the cache in bytes
+    """
+
+    def __init__(self, directory, max_bytes=4 * 1024 ** 3):
+        super(DiskFeatureCache, self).__init__()
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._written_bytes = 0
+
+    def get(self, key, task_key=None):
+        """Get the feature bucket of a feature type and a task
+
+        Parameters
+        ----------
+        key: str
+            The key of a feature type
+        task_key: Hashable
+            The key of a task, e.g. its target and workload.
+            Its repr must be stable across processes.
+
+        Returns
+        -------
+        fea_cache: FeatureBucket
+            A dictionary-like bucket
+        """
+        buckets = self.feature_cache.setdefault(key, {})
+        if task_key not in buckets:
+            os.makedirs(os.path.join(self.directory, key), exist_ok=True)
+            digest = hashlib.sha1(repr(task_key).encode()).hexdigest()
+            buckets[task_key] = FeatureBucket(os.path.join(self.directory, key, digest))
+        bucket = buckets[task_key]
+        bucket.refresh()
+        return bucket
+
+    def size(self, key):
+        """Get the number of features of a feature type held in memory.
+        Flushed features are memory-mapped from disk and are not counted."""
+        return sum(len(bucket._pending) for bucket in self.feature_cache.get(key, {}).values())
+
+    def clear(self, key):
+        """Release the buckets of a feature type loaded in memory.
+        Features on disk are only removed by the size-based eviction."""
+        self.flush()
+        self.feature_cache[key] = {}
+
+    def flush(self):
+        for buckets in self.feature_cache.values():
+            for bucket in buckets.values():
+                self._written_bytes += bucket.flush()
+        # only scan the directory when enough has been written since the last eviction
+        if self._written_bytes > self.max_bytes // 16:
+            self.evict()
+
+    def evict(self):
+        """Remove the least recently used buckets until the cache fits in max_bytes"""
+        self._written_bytes = 0
+        buckets = []
+        total = 0
+        for key in os.listdir(self.directory):
+            sub_dir = os.path.join(self.directory, key)
+            if not os.path.isdir(sub_dir):
+                continue
+            for name in os.listdir(sub_dir):
+                if not name.endswith(".idx"):
+                    continue
+                prefix = os.path.join(sub_dir, name[:-4])
+                try:
+                    last_use = os.path.getmtime(prefix + ".idx")
+                    size = os.path.getsize(prefix + ".idx")
+                    if os.path.exists(prefix + ".fea"):
+                        size += os.path.getsize(prefix + ".fea")
+                except OSError:
+                    continue
+                buckets.append((last_use, size, prefix))
+                total += size
+
+        buckets.sort()
+        for _, size, prefix in buckets:
+            if total <= self.max_bytes:
+                break
+            logger.debug("Evict feature cache %s (%d bytes)", prefix, size)
+            FeatureBucket(prefix).evict()
+            total -= size
@@ -33,13 +33,16 @@ class FeatureCache(object):
     def __init__(self):
         self.feature_cache = {}
 
-    def get(self, key):
+    def get(self, key, task_key=None):
         """Get feature cache dictionary for a key
 
         Parameters
         ----------
         key: str
             The key of a feature type
+        task_key: Hashable, optional
+            The key of the task of the features. It is ignored by this in-memory cache,
+            which is only shared by the cost models of a single task.
 
         Returns
         -------
@@ -77,6 +80,9 @@ class FeatureCache(object):
         self.feature_cache[key] = {}
         gc.collect()
 
+    def flush(self):
+        """Persist the features added to the cache. Nothing to do for an in-memory cache."""
+
 
 class CostModel(object):
     """Cost model to predict the speed of a config"""
@@ -204,7 +210,7 @@ class ModelBasedTuner(Tuner):
         self.plan_size = plan_size
         self.space = task.config_space
         self.space_len = len(task.config_space)
-        self.dims = [len(x) for x in self.space.space_map.values()]
+        self.dims = self.space.dims
 
         self.cost_model = cost_model
         self.model_optimizer = model_optimizer
@@ -227,7 +233,7 @@ class ModelBasedTuner(Tuner):
         self.train_ct = 0
 
     def next_batch(self, batch_size):
-        ret = []
+        indexes = []
 
         counter = 0
         while counter < batch_size:
@@ -247,11 +253,11 @@ class ModelBasedTuner(Tuner):
                 while index in self.visited:
                     index = np.random.randint(len(self.space))
 
-            ret.append(self.space.get(index))
+            indexes.append(index)
             self.visited.add(index)
 
             counter += 1
-        return ret
+        return self.space.get_batch(indexes)
 
     def update(self, inputs, results):
         for inp, res in zip(inputs, results):
@@ -273,7 +279,7 @@ class ModelBasedTuner(Tuner):
                     self.cost_model, self.plan_size * self.diversity_filter_ratio, self.visited
                 )
                 scores = self.cost_model.predict(candidate)
-                knobs = [point2knob(x, self.dims) for x in candidate]
+                knobs = self.space.get_knobs(candidate)
                 pick_index = submodular_pick(0 * scores, knobs, self.plan_size, knob_weight=1)
                 maximums = np.array(candidate)[pick_index]
             else:
@@ -312,7 +318,16 @@ class ModelBasedTuner(Tuner):
 
 
 def point2knob(p, dims):
-    """convert point form (single integer) to knob form (vector)"""
+    """convert point form (single integer) to knob form (vector).
+    An array of points is converted to a knob matrix of shape (len(p), len(dims))."""
+    if np.ndim(p):
+        knobs = []
+        p = np.asarray(p)
+        for dim in dims:
+            knobs.append(p % dim)
+            p = p // dim
+        return np.stack(knobs, axis=1)
+
     knob = []
     for dim in dims:
         knob.append(p % dim)
@@ -321,11 +336,19 @@ def point2knob(p, dims):
 
 
 def knob2point(knob, dims):
-    """convert knob form (vector) to point form (single integer)"""
-    p = 0
-    for j, k in enumerate(knob):
-        p += int(np.prod(dims[:j])) * k
-    return p
+    """convert knob form (vector) to point form (single integer).
+    A knob matrix of shape (n, len(dims)) is converted to an array of n points."""
+    # python integers, the product of the dims can exceed int64
+    strides = []
+    stride = 1
+    for dim in dims:
+        strides.append(stride)
+        stride *= int(dim)
+
+    if np.ndim(knob) > 1:
+        dtype = np.int64 if stride < 2 ** 63 else object
+        return (np.asarray(knob, dtype=dtype) * np.array(strides, dtype=dtype)).sum(axis=1)
+    return sum(s * int(k) for s, k in zip(strides, knob))
 
 
 def submodular_pick(scores, knobs, n_pick, knob_weight=1.0):
@@ -345,31 +368,23 @@ def submodular_pick(scores, knobs, n_pick, knob_weight=1.0):
     knob_weight: float
         weight of an unique knob feature
     """
+    scores = np.asarray(scores, dtype=np.float64)
+    knobs = np.asarray(knobs)
     n = len(scores)
     assert n == len(knobs)
-    n_knobs = len(knobs[0])
 
-    knobs_set = [set() for _ in range(n_knobs)]
+    # unseen[x, i] tells whether the i-th knob of point x is not in the selected set yet
+    unseen = np.ones(knobs.shape, dtype=bool)
+    picked = np.zeros(n, dtype=bool)
 
     ret = []
-    remain = list(range(len(scores)))
-
-    for _ in range(n_pick):
-        max_x = -1
-        max_delta = -1e9
-
-        for x in remain:
-            tmp_delta = scores[x]
-            for i in range(n_knobs):
-                if knobs[x][i] not in knobs_set[i]:
-                    tmp_delta += knob_weight
-
-            if tmp_delta > max_delta:
-                max_delta, max_x = tmp_delta, x
+    for _ in range(min(n_pick, n)):
+        delta = scores + knob_weight * unseen.sum(axis=1)
+        delta[picked] = -np.inf
+        max_x = int(np.argmax(delta))
 
         ret.append(max_x)
-        remain.remove(max_x)
-        for i in range(n_knobs):
-            knobs_set[i].add(knobs[max_x][i])
+        picked[max_x] = True
+        unseen &= knobs != knobs[max_x]
 
     return ret
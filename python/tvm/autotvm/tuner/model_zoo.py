@@ -0,0 +1,195 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=invalid-name
+"""
+A directory of pretrained XGBoost cost models, keyed by target and template name.
+
+The models are pretrained offline from tuning logs, and used as the base model
+of :any:`XGBTuner` for new tasks of the same template on the same target,
+the same way as the transfer learning of :any:`Tuner.load_history`.
+"""
+import argparse
+from collections import Counter
+import hashlib
+import json
+import logging
+import os
+
+from ..env import GLOBAL_SCOPE
+from ..record import load_from_file
+from ..task import create
+from .xgboost_cost_model import XGBoostCostModel
+
+logger = logging.getLogger("autotvm")
+
+
+class CostModelZoo(object):
+    """A directory of pretrained cost models
+
+    Every model is stored as a booster file ``<key>.xgb`` and a json file ``<key>.json``
+    describing it, where the key is a digest of the target, the template name,
+    the feature type and the loss type.
+
+    Parameters
+    ----------
+    directory: str
+        The directory of the zoo
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _prefix(self, target, template, feature_type, loss_type):
+        key = json.dumps([str(target), template, feature_type, loss_type])
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest())
+
+    def save(self, model, n_samples=None):
+        """Save a trained cost model under the target and the template name of its task
+
+        Parameters
+        ----------
+        model: XGBoostCostModel
+            The trained model. It should not depend on a base model.
+        n_samples: int, optional
+            The number of records the model was trained on, for information
+        """
+        prefix = self._prefix(model.target, model.task.name, model.fea_type, model.loss_type)
+        model.save(prefix + ".xgb")
+        meta = {
+            "target": str(model.target),
+            "template": model.task.name,
+            "feature_type": model.fea_type,
+            "loss_type": model.loss_type,
+            "feature_length": len(model._get_feature([0])[0]),
+            "n_samples": n_samples,
+        }
+        with open(prefix + ".json", "w") as fout:
+            json.dump(meta, fout)
+
+    def load(self, upper_model):
+        """Load the pretrained base model of a cost model
+
+        Parameters
+        ----------
+        upper_model: XGBoostCostModel
+            The cost model of the task being tuned
+
+        Returns
+        -------
+        base_model: Optional[XGBoostCostModel]
+            The pretrained model of the same target, template, feature type and loss type,
+            bound to the task of upper_model. None if the zoo has no such model or
+            its features do not match the ones of the task.
+        """
+        prefix = self._prefix(
+            upper_model.target, upper_model.task.name, upper_model.fea_type, upper_model.loss_type
+        )
+        if not os.path.isfile(prefix + ".xgb") or not os.path.isfile(prefix + ".json"):
+            return None
+        with open(prefix + ".json") as fin:
+            meta = json.load(fin)
+
+        base_model = upper_model.spawn_base_model()
+        if len(base_model._get_feature([0])[0]) != meta["feature_length"]:
+            logger.warning(
+                "The pretrained model of %s has a different feature length, ignore it",
+                upper_model.task.name,
+            )
+            return None
+        base_model.load(prefix + ".xgb")
+        return base_model
+
+    def pretrain(self, log_files, feature_type="itervar", loss_type="rank", plan_size=64):
+        """Pretrain and save a cost model for every (target, template) pair in tuning logs
+
+        Parameters
+        ----------
+        log_files: str or List[str]
+            A log file, a directory of log files or a list of log files
+        feature_type: str
+            The feature type of the models, see :any:`XGBoostCostModel`
+        loss_type: str
+            The loss type of the models, see :any:`XGBoostCostModel`
+        plan_size: int
+            The plan size of the tuners that will use the models
+
+        Returns
+        -------
+        keys: List[Tuple[str, str]]
+            The (target, template name) pairs of the saved models
+        """
+        if isinstance(log_files, str):
+            if os.path.isdir(log_files):
+                log_files = [os.path.join(log_files, x) for x in sorted(os.listdir(log_files))]
+            else:
+                log_files = [log_files]
+
+        groups = {}
+        for log_file in log_files:
+            for inp, res in load_from_file(log_file):
+                groups.setdefault((str(inp.target), inp.task.name), []).append((inp, res))
+
+        # set in_tuning as True to make the feature extraction consistent
+        old_in_tuning = GLOBAL_SCOPE.in_tuning
+        GLOBAL_SCOPE.in_tuning = True
+        saved = []
+        try:
+            for (target, template), records in groups.items():
+                # the most tuned workload of the template represents it,
+                # records with a different feature length are dropped by fit_log
+                workload = Counter(inp.task.workload for inp, _ in records).most_common(1)[0][0]
+                inp = next(inp for inp, _ in records if inp.task.workload == workload)
+                try:
+                    task = create(template, inp.task.args, inp.target)
+                except Exception as e:  # pylint: disable=broad-except
+                    logger.warning("Cannot create a task of %s: %s", template, e)
+                    continue
+                model = XGBoostCostModel(task, feature_type, loss_type, log_interval=0)
+                success = model.fit_log(records, plan_size)
+                model._close_pool()
+                if not success:
+                    logger.info("Not enough records to pretrain %s on %s", template, target)
+                    continue
+                self.save(model, n_samples=len(records))
+                saved.append((target, template))
+                logger.info("Pretrained %s on %s from %d records", template, target, len(records))
+        finally:
+            GLOBAL_SCOPE.in_tuning = old_in_tuning
+        return saved
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logs", type=str, nargs="+", help="log files or directories of logs")
+    parser.add_argument("--zoo", type=str, help="the directory of the model zoo")
+    parser.add_argument("--feature-type", type=str, default="itervar")
+    parser.add_argument("--loss-type", type=str, default="rank")
+    parser.add_argument("--plan-size", type=int, default=64)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    # pylint: disable=unused-import
+    import tvm.topi  # register the templates of topi
+
+    files = []
+    for path in args.logs:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, x) for x in sorted(os.listdir(path)))
+        else:
+            files.append(path)
+    CostModelZoo(args.zoo).pretrain(files, args.feature_type, args.loss_type, args.plan_size)
@@ -21,6 +21,7 @@ Cost model optimizer based on simulated annealing
 
 import heapq
 import logging
+import multiprocessing
 import time
 
 import numpy as np
@@ -186,3 +187,238 @@ def random_walk(p, dims):
 
     # transform to index form
     return knob2point(new, dims)
+
+
+class BatchedSimulatedAnnealingOptimizer(SimulatedAnnealingOptimizer):
+    """parallel simulated annealing optimization algorithm on knob matrices
+
+    This is a drop-in replacement of :any:`SimulatedAnnealingOptimizer`.
+    The random walks, the acceptance test and the deduplicated top-k of all points
+    are computed with array operations on the knob matrix of the points,
+    see :any:`ConfigSpace.get_knobs`.
+
+    Parameters
+    ----------
+    task: Task
+        The tuning task
+    n_iter: int
+        The number of iterations of simulated annealing
+    temp: float or Array of float
+        If is a single float, then use a constant temperature.
+        If is an Array, then perform linear cooling from temp[0] to temp[1]
+    early_stop: int, optional
+        Stop iteration if the optimal set do not change in `early_stop` rounds
+    log_interval: int, optional
+        Print log every `log_interval` iterations
+    n_chains: int, optional
+        The number of independent chains. The `parallel_size` points are split between them.
+    n_parallel: int, optional
+        The number of processes that run the chains. If None, use one process per chain.
+        If 1, run all chains in the current process.
+        Chains are only run in other processes if they can be forked, and the cost model
+        must then be usable in a forked process (e.g. XGBoostCostModel with knob features).
+    """
+
+    def __init__(
+        self,
+        task,
+        n_iter=500,
+        temp=(1, 0),
+        persistent=True,
+        parallel_size=128,
+        early_stop=50,
+        log_interval=50,
+        n_chains=1,
+        n_parallel=None,
+    ):
+        super(BatchedSimulatedAnnealingOptimizer, self).__init__(
+            task, n_iter, temp, persistent, parallel_size, early_stop, log_interval
+        )
+        self.space = task.config_space
+        self.n_chains = max(1, min(n_chains, self.parallel_size))
+        self.n_parallel = n_parallel
+
+    def find_maximums(self, model, num, exclusive):
+        tic = time.time()
+        if self.persistent and self.points is not None:
+            points = self.points
+        else:
+            points = np.array(sample_ints(0, len(self.space), self.parallel_size))
+
+        exclusive = np.array(list(exclusive), dtype=points.dtype)
+        chains = np.array_split(points, self.n_chains)
+        seeds = np.random.randint(np.iinfo(np.int32).max, size=len(chains))
+        jobs = [(chain, num, exclusive, seed) for chain, seed in zip(chains, seeds)]
+
+        n_parallel = self.n_parallel or len(chains)
+        if len(chains) > 1 and n_parallel > 1 and _can_fork():
+            # pass the optimizer and the model to the forked processes in globals
+            global _chain_optimizer, _chain_model
+            _chain_optimizer, _chain_model = self, model
+            pool = multiprocessing.get_context("fork").Pool(min(n_parallel, len(chains)))
+            try:
+                outs = pool.map(_run_chain, jobs)
+            finally:
+                pool.close()
+                pool.join()
+                _chain_optimizer, _chain_model = None, None
+        else:
+            outs = [self._anneal(model, *job) for job in jobs]
+
+        best_points = np.concatenate([out[0] for out in outs])
+        best_scores = np.concatenate([out[1] for out in outs])
+        best_points, best_scores = _merge_top(best_points, best_scores, num, exclusive)
+        order = np.argsort(-best_scores, kind="stable")
+        best_points, best_scores = best_points[order], best_scores[order]
+        valid = best_scores >= 0
+
+        logger.debug(
+            "SA chains: %d\titer: %s\telapsed: %.2f",
+            len(chains),
+            [out[3] for out in outs],
+            time.time() - tic,
+        )
+        logger.debug("SA Maximums: %s", list(zip(best_scores[valid], best_points[valid])))
+
+        if self.persistent:
+            self.points = np.concatenate([out[2] for out in outs])
+
+        return [int(x) for x in best_points[valid]]
+
+    def _anneal(self, model, points, num, exclusive, seed):
+        """Run one chain of simulated annealing.
+
+        Returns
+        -------
+        best_points: np.ndarray
+            The deduplicated top-num points visited by this chain
+        best_scores: np.ndarray
+            The scores of best_points
+        points: np.ndarray
+            The points of the chain after the last iteration
+        k: int
+            The number of iterations
+        """
+        tic = time.time()
+        rng = np.random.RandomState(seed)
+        temp, n_iter, early_stop, log_interval = (
+            self.temp,
+            self.n_iter,
+            self.early_stop,
+            self.log_interval,
+        )
+        dims = np.array(self.dims, dtype=np.int64)
+
+        points = np.array(points)
+        knobs = self.space.get_knobs(points)
+        scores = np.asarray(model.predict(points))
+        best_points, best_scores = _merge_top(points, scores, num, exclusive)
+
+        k = 0
+        k_last_modify = 0
+
+        if isinstance(temp, (tuple, list, np.ndarray)):
+            t = temp[0]
+            cool = 1.0 * (temp[0] - temp[1]) / (n_iter + 1)
+        else:
+            t = temp
+            cool = 0
+
+        while k < n_iter and k < k_last_modify + early_stop:
+            new_knobs = random_walk_batch(knobs, dims, rng)
+            new_points = self.space.get_indexes(new_knobs)
+            new_scores = np.asarray(model.predict(new_points))
+
+            ac_prob = np.exp(np.minimum((new_scores - scores) / (t + 1e-5), 1))
+            ac_index = rng.random_sample(len(ac_prob)) < ac_prob
+
+            points[ac_index] = new_points[ac_index]
+            knobs[ac_index] = new_knobs[ac_index]
+            scores[ac_index] = new_scores[ac_index]
+
+            old_best = best_points
+            best_points, best_scores = _merge_top(
+                np.concatenate([best_points, new_points]),
+                np.concatenate([best_scores, new_scores]),
+                num,
+                exclusive,
+            )
+            if not np.array_equal(np.sort(old_best), np.sort(best_points)):
+                k_last_modify = k
+
+            k += 1
+            t -= cool
+
+            if log_interval and k % log_interval == 0:
+                logger.debug(
+                    "SA iter: %d\tlast_update: %d\tmax-0: %.2f\tmax-1: %.2f\ttemp: %.2f\t"
+                    "elapsed: %.2f",
+                    k,
+                    k_last_modify,
+                    np.min(best_scores) if len(best_scores) else float("-inf"),
+                    np.max(best_scores) if len(best_scores) else float("-inf"),
+                    t,
+                    time.time() - tic,
+                )
+
+        return best_points, best_scores, points, k
+
+
+# Global variables for passing the optimizer and the model to forked chains.
+_chain_optimizer = None
+_chain_model = None
+
+
+def _can_fork():
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+def _run_chain(args):
+    """run a chain of simulated annealing in a forked process"""
+    return _chain_optimizer._anneal(_chain_model, *args)
+
+
+def _merge_top(points, scores, num, exclusive):
+    """Keep the num points of highest score, excluding duplicated and exclusive points"""
+    if exclusive.size:
+        keep = ~np.isin(points, exclusive)
+        points, scores = points[keep], scores[keep]
+    points, first = np.unique(points, return_index=True)
+    scores = scores[first]
+    if len(points) > num:
+        top = np.argpartition(-scores, num - 1)[:num]
+        points, scores = points[top], scores[top]
+    return points, scores
+
+
+def random_walk_batch(knobs, dims, rng=np.random):
+    """random walk as local transition, for a batch of points in knob form.
+    Every point mutates one of its knobs to a different value.
+
+    Parameters
+    ----------
+    knobs: np.ndarray
+        Two dimensional array of shape (n, len(dims)), see ConfigSpace.get_knobs
+    dims: Array of int
+        sizes of each dimension
+    rng: np.random.RandomState, optional
+        The random number generator
+
+    Returns
+    -------
+    new_knobs: np.ndarray
+        new neighborhood points in knob form
+    """
+    dims = np.asarray(dims, dtype=np.int64)
+    new_knobs = knobs.copy()
+    mutable = np.flatnonzero(dims > 1)
+    if not mutable.size or not len(knobs):
+        return new_knobs
+
+    rows = np.arange(len(knobs))
+    cols = mutable[rng.randint(len(mutable), size=len(knobs))]
+    # draw from the other dims[col] - 1 values of the knob
+    values = (rng.random_sample(len(knobs)) * (dims[cols] - 1)).astype(np.int64)
+    values += values >= knobs[rows, cols].astype(np.int64)
+    new_knobs[rows, cols] = values
+    return new_knobs
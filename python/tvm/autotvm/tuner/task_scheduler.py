@@ -0,0 +1,357 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=invalid-name
+"""
+The task scheduler that allocates the measurement trials of several autotvm tasks,
+e.g. all the tasks extracted from a network by :any:`autotvm.task.extract_from_program`.
+
+The scheduler interleaves the tuners of the tasks round by round. After a warm-up round
+of every task, it picks the task whose tuning is expected to reduce the objective
+(the weighted sum of the latencies of all tasks) the most, which is the "gradient"
+strategy of :any:`auto_scheduler.TaskScheduler`.
+"""
+import logging
+
+import numpy as np
+
+from ..env import GLOBAL_SCOPE
+from ..record import load_from_file
+from .model_based_tuner import ModelBasedTuner
+from .index_based_tuner import GridSearchTuner, RandomTuner
+from .ga_tuner import GATuner
+from .xgboost_tuner import XGBTuner
+
+logger = logging.getLogger("autotvm")
+
+
+def create_tuner(task, tuner="xgb"):
+    """Create a tuner for a task
+
+    Parameters
+    ----------
+    task: autotvm.task.Task
+        The task to tune
+    tuner: str or callable
+        "xgb", "xgb_knob", "xgb_itervar", "xgb_curve", "ga", "random" or "gridsearch",
+        or a function that takes a task and returns a Tuner
+
+    Returns
+    -------
+    tuner: Tuner
+        The tuner of the task
+    """
+    if callable(tuner):
+        return tuner(task)
+    if tuner in ("xgb", "xgb_itervar"):
+        return XGBTuner(task, feature_type="itervar")
+    if tuner == "xgb_knob":
+        return XGBTuner(task, feature_type="knob")
+    if tuner == "xgb_curve":
+        return XGBTuner(task, feature_type="curve")
+    if tuner == "ga":
+        return GATuner(task)
+    if tuner == "random":
+        return RandomTuner(task)
+    if tuner == "gridsearch":
+        return GridSearchTuner(task)
+    raise ValueError("Invalid tuner: " + str(tuner))
+
+
+class TaskScheduler(object):
+    """
+    Allocate the measurement trials when tuning multiple autotvm tasks together.
+    This implements two strategies: "round-robin" and "gradient".
+
+    Parameters
+    ----------
+    tasks: List[autotvm.task.Task]
+        All tasks to tune
+    task_weights: Optional[List[float]]
+        The weights of tasks, e.g. the number of appearances of each task in the network
+        as returned by ``extract_from_program(..., return_weights=True)``.
+        The objective is sum(weight[t] * latency[t]).
+        If not provided, all tasks have the same weight.
+    tuner: str or callable
+        The tuner of every task, see :any:`create_tuner`
+    strategy: str = "gradient"
+        The scheduling strategy.
+        "round-robin": Tune tasks in round robin order.
+        "gradient" : Tune the task with the most negative estimated gradient of the objective.
+    load_log_file: Optional[str]
+        Load measurement records from this file. If it is not None, the status of the
+        task scheduler and of the model-based tuners is restored according to this file.
+    alpha: float = 0.2
+        The weight of the backward gradient in the 'gradient' strategy
+    beta: float = 2
+        The parameter used for 'gradient' strategy. A task is not expected to be faster
+        than beta times the speed (in FLOPS) of the fastest task of the same template.
+    backward_window_size: int = 3
+        The number of rounds used to estimate the backward gradient
+    """
+
+    def __init__(
+        self,
+        tasks,
+        task_weights=None,
+        tuner="xgb",
+        strategy="gradient",
+        load_log_file=None,
+        alpha=0.2,
+        beta=2,
+        backward_window_size=3,
+    ):
+        assert len(tasks) != 0, "No tasks"
+        assert strategy in ["round-robin", "gradient"], "Invalid strategy: " + strategy
+        self.tasks = tasks
+        self.task_weights = (
+            np.array(task_weights, dtype=float) if task_weights else np.ones(len(tasks))
+        )
+        self.tuners = [create_tuner(task, tuner) for task in tasks]
+        self.strategy = strategy
+        self.load_log_file = load_log_file
+        self.alpha = alpha
+        self.beta = beta
+        self.backward_window_size = backward_window_size
+
+        # task_cts[i] saves how many rounds task i is tuned
+        self.task_cts = [0 for _ in range(len(self.tasks))]
+
+        # task_costs_history[i] saves the latency history of task i
+        self.task_costs_history = [[] for _ in range(len(self.tasks))]
+
+        # best_costs[i] saves the best latency of task i
+        self.best_costs = 1e10 * np.ones(len(self.tasks))
+        self.cur_score = self._compute_score(self.best_costs)
+
+        self.ct = self.best_ct = 0
+        self.best_score = None
+        self.trials_per_round = None
+        self.dead_tasks = set()
+
+        # tasks of the same template form a similarity group
+        self.flop_cts = [max(task.flop, 1) for task in self.tasks]
+        self.group_task_ids = {}  # template name -> task ids
+        for i, task in enumerate(self.tasks):
+            self.group_task_ids.setdefault(task.name, []).append(i)
+
+        if self.load_log_file:
+            self._restore_status(self.load_log_file)
+
+    def tune(
+        self,
+        n_trial,
+        measure_option,
+        trials_per_round=64,
+        early_stopping=None,
+        callbacks=(),
+        pipeline=False,
+    ):
+        """Tune the tasks together.
+
+        Parameters
+        ----------
+        n_trial: int
+            The total number of measurement trials of all tasks
+        measure_option: dict
+            The options for how to measure generated code.
+            You should use the return value of autotvm.measure_option for this argument.
+        trials_per_round: int
+            The number of trials of a task in one round.
+            It is reduced so that every task is tuned at least once.
+        early_stopping: int, optional
+            Stop the tuning when the objective has not improved in this number of trials
+        callbacks: List of callable
+            The callback functions passed to :any:`Tuner.tune` of every round,
+            e.g. autotvm.callback.log_to_file
+        pipeline: bool
+            Whether the tuners overlap the build and the run of batches, see :any:`Tuner.tune`
+        """
+        early_stopping = early_stopping or 1e20
+        self.ct = self.best_ct = 0
+        self.trials_per_round = min(trials_per_round, n_trial // len(self.tasks))
+        if self.trials_per_round <= 0:
+            raise ValueError("n_trial is too small. Please set it to a higher value.")
+
+        # do a round robin first to warm up
+        for idx in range(len(self.tasks)):
+            # skip warming up this task if it has been tuned before (restored from the log file)
+            if not self.task_cts[idx]:
+                self._tune_task(idx, measure_option, callbacks, pipeline)
+        self.best_ct = self.ct
+        self.best_score = self.cur_score
+
+        task_idx = -1
+        while self.ct < n_trial and len(self.dead_tasks) < len(self.tasks):
+            if self.strategy == "round-robin":
+                task_idx = (task_idx + 1) % len(self.tasks)
+                while task_idx in self.dead_tasks:
+                    task_idx = (task_idx + 1) % len(self.tasks)
+            else:
+                gradients = [
+                    0 if i in self.dead_tasks else self._compute_gradient(i)
+                    for i in range(len(self.tasks))
+                ]
+                if max(gradients) == min(gradients):
+                    alive = [i for i in range(len(self.tasks)) if i not in self.dead_tasks]
+                    task_idx = alive[np.random.randint(len(alive))]
+                else:
+                    task_idx = int(np.argmin(gradients))
+
+            self._tune_task(task_idx, measure_option, callbacks, pipeline)
+            self._adjust_similarity_group(task_idx)
+
+            if self.cur_score < self.best_score:
+                self.best_score = self.cur_score
+                self.best_ct = self.ct
+            elif self.ct - self.best_ct >= early_stopping and all(
+                cost < 1e9 for cost in self.best_costs
+            ):
+                logger.info(
+                    "TaskScheduler: stop early since no improvement in the last %d trials",
+                    early_stopping,
+                )
+                break
+
+    def _tune_task(self, task_idx, measure_option, callbacks, pipeline):
+        """Tune the selected task for one round"""
+        tuner = self.tuners[task_idx]
+        n_measured = [0]
+
+        def _count(_, inputs, results):
+            n_measured[0] += len(results)
+            for inp, res in zip(inputs, results):
+                if res.error_no == 0:
+                    cost = np.mean(res.costs)
+                    self.best_costs[task_idx] = min(self.best_costs[task_idx], cost)
+
+        if tuner.has_next():
+            tuner.tune(
+                n_trial=self.trials_per_round,
+                measure_option=measure_option,
+                callbacks=[_count] + list(callbacks),
+                pipeline=pipeline,
+            )
+        if n_measured[0] == 0:
+            self.dead_tasks.add(task_idx)
+
+        self.task_cts[task_idx] += 1
+        self.task_costs_history[task_idx].append(self.best_costs[task_idx])
+        self.ct += n_measured[0]
+        self.cur_score = self._compute_score(self.best_costs)
+        logger.info(
+            "TaskScheduler: task %d (%s), %d trials in total, best latency %.4g ms, objective %.4g",
+            task_idx,
+            self.tasks[task_idx].name,
+            self.ct,
+            self.best_costs[task_idx] * 1e3,
+            self.cur_score,
+        )
+
+    def _compute_score(self, costs):
+        """compute the objective function"""
+        return float(np.dot(self.task_weights, costs))
+
+    def _compute_gradient(self, i):
+        """Estimate the change of the objective if task i is tuned for one more round"""
+        # chain rule : (delta f / delta g_i)
+        chain_grad = self.task_weights[i]
+
+        # (g_i(t_i) - g(t_i - \Delta t)) / (\Delta t)
+        ct = self.task_cts[i]
+        if ct - 1 < len(self.task_costs_history[i]) and ct - 1 - self.backward_window_size >= 0:
+            history = self.task_costs_history[i]
+            backward_grad = (
+                history[ct - 1] - history[ct - 1 - self.backward_window_size]
+            ) / self.backward_window_size
+        else:
+            backward_grad = 0
+
+        # (g_i(t_i + \Delta t) - g(t_i)) / (\Delta t)
+        g_next_1 = self.best_costs[i] - (self.best_costs[i] / max(ct, 1))
+        g_next_2 = self.beta * 1e30
+        group = self.group_task_ids.get(self.tasks[i].name, [])
+        if len(group) > 1:
+            best_flops = max(self.flop_cts[j] / self.best_costs[j] for j in group)
+            g_next_2 = self.beta * self.flop_cts[i] / best_flops
+        forward_grad = min(g_next_1, g_next_2) - self.best_costs[i]
+
+        return chain_grad * (self.alpha * backward_grad + (1 - self.alpha) * forward_grad)
+
+    def _adjust_similarity_group(self, task_idx):
+        """Remove a task from its similarity group if it stays much slower than the others"""
+        group = self.group_task_ids.get(self.tasks[task_idx].name, [])
+        if task_idx not in group or len(group) <= 1:
+            return
+
+        best_group_flops = max(self.flop_cts[j] / self.best_costs[j] for j in group)
+        cur_flops = self.flop_cts[task_idx] / self.best_costs[task_idx]
+        if cur_flops < best_group_flops / self.beta and self.task_cts[task_idx] > 5 + max(
+            self.task_cts[j] for j in group if j != task_idx
+        ):
+            group.remove(task_idx)
+
+    def _restore_status(self, log_file):
+        """Restore the best costs and the tuned rounds from a log file, and feed the records
+        to the model-based tuners so that they do not measure the same configs again"""
+        task_ids = {(str(t.target), t.workload): i for i, t in enumerate(self.tasks)}
+        history = [([], []) for _ in self.tasks]
+        total_ct = -1
+        for total_ct, (inp, res) in enumerate(load_from_file(log_file)):
+            task_idx = task_ids.get((str(inp.target), inp.task.workload))
+            if task_idx is None:
+                continue
+            history[task_idx][0].append(inp)
+            history[task_idx][1].append(res)
+            if res.error_no == 0:
+                self.best_costs[task_idx] = min(self.best_costs[task_idx], np.mean(res.costs))
+
+        # set in_tuning as True to make the feature extraction consistent
+        old_in_tuning = GLOBAL_SCOPE.in_tuning
+        GLOBAL_SCOPE.in_tuning = True
+        try:
+            for i, (inputs, results) in enumerate(history):
+                if not inputs:
+                    continue
+                tuner = self.tuners[i]
+                # use the configs of this task instead of the ones in the log
+                inputs = [inp._replace(task=self.tasks[i]) for inp in inputs]
+                if isinstance(tuner, ModelBasedTuner):
+                    for inp in inputs:
+                        tuner.visited.add(inp.config.index)
+                    tuner.update(inputs, results)
+                _update_best(tuner, inputs, results)
+                # the number of rounds is only an estimation, the last tuning
+                # may have used a different number of trials per round
+                self.task_cts[i] = 1
+                self.task_costs_history[i].append(self.best_costs[i])
+        finally:
+            GLOBAL_SCOPE.in_tuning = old_in_tuning
+
+        self.cur_score = self._compute_score(self.best_costs)
+        logger.info("TaskScheduler: Loaded %d measurement records from %s", total_ct + 1, log_file)
+
+
+def _update_best(tuner, inputs, results):
+    """Keep the best config of the records in a tuner, as Tuner.tune does"""
+    for inp, res in zip(inputs, results):
+        if res.error_no != 0:
+            continue
+        flops = inp.task.flop / np.mean(res.costs)
+        if flops > tuner.best_flops:
+            tuner.best_flops = flops
+            tuner.best_config = inp.config
+            tuner.best_measure_pair = (inp, res)
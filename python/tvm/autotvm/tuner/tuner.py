@@ -18,6 +18,7 @@
 """Base class of tuner"""
 import logging
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 
@@ -89,7 +90,71 @@ class Tuner(object):
             result for measurement
         """
 
-    def tune(self, n_trial, measure_option, early_stopping=None, callbacks=(), si_prefix="G"):
+    def _measure_batches(self, measure_batch, n_parallel, n_trial):
+        """Generator: propose, build and run the batches one after another
+
+        Yields
+        ------
+        inputs: List of MeasureInput
+        results: List of MeasureResult
+        """
+        i = 0
+        while i < n_trial:
+            if not self.has_next():
+                break
+
+            configs = self.next_batch(min(n_parallel, n_trial - i))
+
+            inputs = [MeasureInput(self.task.target, self.task, config) for config in configs]
+            results = measure_batch(inputs)
+            i += len(results)
+            yield inputs, results
+
+    def _measure_batches_pipelined(self, measure_batch, n_parallel, n_trial):
+        """Generator: propose and build the next batch while the previous batch runs.
+
+        At most one batch is running and one batch is built ahead of it, so the builder
+        cannot run away from the device. The batches are yielded in the order they were
+        proposed. A batch built ahead is dropped if the consumer stops early.
+
+        Yields
+        ------
+        inputs: List of MeasureInput
+        results: List of MeasureResult
+        """
+        executor = ThreadPoolExecutor(max_workers=1)
+        running = None  # (inputs, future of the results)
+        n_proposed = 0
+        try:
+            while True:
+                inputs = None
+                if n_proposed < n_trial and self.has_next():
+                    configs = self.next_batch(min(n_parallel, n_trial - n_proposed))
+                    inputs = [MeasureInput(self.task.target, self.task, c) for c in configs]
+                    build_results = measure_batch.build(inputs)
+                    n_proposed += len(inputs)
+
+                if running is not None:
+                    last_inputs, future = running
+                    running = None
+                    yield last_inputs, future.result()
+
+                if inputs is None:
+                    break
+                running = (inputs, executor.submit(measure_batch.run, inputs, build_results))
+        finally:
+            # wait for the device to be released before returning to the caller
+            executor.shutdown(wait=True)
+
+    def tune(
+        self,
+        n_trial,
+        measure_option,
+        early_stopping=None,
+        callbacks=(),
+        si_prefix="G",
+        pipeline=False,
+    ):
         """Begin tuning
 
         Parameters
@@ -108,6 +173,11 @@ class Tuner(object):
             every measurement pair. See autotvm/tuner/callback.py for some examples.
         si_prefix: str
             One of tvm.autotvm.utils.SI_PREFIXES. The SI prefix to use when reporting FLOPS.
+        pipeline: bool, optional
+            Whether to propose and build the next batch while the current batch is being
+            measured. The tuner then proposes a batch before it is updated with the results
+            of the previous one. This is meant for remote devices, since local builds
+            would disturb the measurement of a local runner.
         """
         measure_batch = create_measure_batch(self.task, measure_option)
         n_parallel = getattr(measure_batch, "n_parallel", 1)
@@ -123,15 +193,11 @@ class Tuner(object):
         GLOBAL_SCOPE.in_tuning = True
         i = error_ct = 0
         errors = []
-        while i < n_trial:
-            if not self.has_next():
-                break
-
-            configs = self.next_batch(min(n_parallel, n_trial - i))
-
-            inputs = [MeasureInput(self.task.target, self.task, config) for config in configs]
-            results = measure_batch(inputs)
-
+        if pipeline:
+            batches = self._measure_batches_pipelined(measure_batch, n_parallel, n_trial)
+        else:
+            batches = self._measure_batches(measure_batch, n_parallel, n_trial)
+        for inputs, results in batches:
             # keep best config
             for k, (inp, res) in enumerate(zip(inputs, results)):
                 config = inp.config
@@ -191,6 +257,7 @@ class Tuner(object):
                 self.task,
                 f,
             )
+        batches.close()
         GLOBAL_SCOPE.in_tuning = False
         del measure_batch
 
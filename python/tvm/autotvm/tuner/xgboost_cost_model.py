@@ -27,6 +27,7 @@ from .. import feature
 from ..utils import get_rank
 from .metric import max_curve, recall_curve, cover_curve
 from .model_based_tuner import CostModel, FeatureCache
+from .disk_feature_cache import DiskFeatureCache
 
 xgb = None
 
@@ -67,10 +68,21 @@ class XGBoostCostModel(CostModel):
         If is not none, the cost model will print training log every `log_interval` iterations.
     upper_model: XGBoostCostModel, optional
         The upper model used in transfer learning
+    feature_cache: str or FeatureCache, optional
+        The cache of extracted features. If is a str, use a DiskFeatureCache in this
+        directory, which is shared across tuning sessions. Defaults to an in-memory cache,
+        or to the cache of upper_model.
     """
 
     def __init__(
-        self, task, feature_type, loss_type, num_threads=None, log_interval=25, upper_model=None
+        self,
+        task,
+        feature_type,
+        loss_type,
+        num_threads=None,
+        log_interval=25,
+        upper_model=None,
+        feature_cache=None,
     ):
         global xgb
         super(XGBoostCostModel, self).__init__()
@@ -134,8 +146,10 @@ class XGBoostCostModel(CostModel):
 
         if upper_model:  # share a same feature cache with upper model
             self.feature_cache = upper_model.feature_cache
+        elif isinstance(feature_cache, str):
+            self.feature_cache = DiskFeatureCache(feature_cache)
         else:
-            self.feature_cache = FeatureCache()
+            self.feature_cache = feature_cache or FeatureCache()
         self.upper_model = upper_model
         self.feature_extra_ct = 0
         self.pool = None
@@ -247,7 +261,10 @@ class XGBoostCostModel(CostModel):
             feature_extract_func = _extract_curve_feature_log
         else:
             raise RuntimeError("Invalid feature type: " + self.fea_type)
-        res = pool.map(feature_extract_func, data)
+        if isinstance(self.feature_cache, DiskFeatureCache):
+            res = self._get_log_feature(data, feature_extract_func)
+        else:
+            res = pool.map(feature_extract_func, data)
 
         # filter out feature with different shapes
         fea_len = len(self._get_feature([0])[0])
@@ -304,6 +321,29 @@ class XGBoostCostModel(CostModel):
 
         return self.bst.predict(dtest, output_margin=output_margin)
 
+    def save(self, filename):
+        """Save the trained booster to a file
+
+        Parameters
+        ----------
+        filename: str
+            The filename
+        """
+        if self.bst is None:
+            raise RuntimeError("The cost model is not trained yet")
+        self.bst.save_model(filename)
+
+    def load(self, filename):
+        """Load a booster saved by :any:`save`
+
+        Parameters
+        ----------
+        filename: str
+            The filename
+        """
+        self.bst = xgb.Booster(params=self.xgb_params)
+        self.bst.load_model(filename)
+
     def load_basemodel(self, base_model):
         self.base_model = base_model
         self.base_model._close_pool()
@@ -314,18 +354,75 @@ class XGBoostCostModel(CostModel):
             self.task, self.fea_type, self.loss_type, self.num_threads, self.log_interval, self
         )
 
+    def _get_log_feature(self, data, feature_extract_func):
+        """get (x, y) of log records, run extraction for the configs missing in the
+        persistent feature cache"""
+        res = [None] * len(data)
+        need_extract = []
+        buckets = {}
+
+        def _get_bucket(inp):
+            task_key = (str(inp.target), inp.task.workload)
+            if task_key not in buckets:
+                buckets[task_key] = self.feature_cache.get(self.fea_type, task_key)
+            return buckets[task_key]
+
+        for i, (inp, result) in enumerate(data):
+            fea_cache = _get_bucket(inp)
+            index = inp.config.index
+            if index not in fea_cache:
+                need_extract.append(i)
+                continue
+            x = fea_cache[index]
+            if x is None:
+                continue
+            if result.error_no != 0:
+                res[i] = (x, 0.0)
+                continue
+            flop = fea_cache.get_flop(index)
+            if np.isnan(flop):  # only failed measurements of this config were seen
+                need_extract.append(i)
+                continue
+            res[i] = (x, flop / np.mean(result.costs))
+
+        if need_extract:
+            pool = self._get_pool()
+            extracted = pool.map(feature_extract_func, [data[i] for i in need_extract])
+            for i, ret in zip(need_extract, extracted):
+                inp, result = data[i]
+                fea_cache = _get_bucket(inp)
+                if ret is None:
+                    fea_cache.put(inp.config.index, None)
+                    continue
+                x, y = ret
+                flop = y * np.mean(result.costs) if result.error_no == 0 else float("nan")
+                fea_cache.put(inp.config.index, x, flop)
+                res[i] = ret
+            self.feature_cache.flush()
+
+        logger.debug("XGB feature cache hit %d/%d", len(data) - len(need_extract), len(data))
+        return [x for x in res if x is not None]
+
     def _get_feature(self, indexes):
         """get features for indexes, run extraction if we do not have cache for them"""
         # free feature cache
         if self.feature_cache.size(self.fea_type) >= 100000:
             self.feature_cache.clear(self.fea_type)
 
-        fea_cache = self.feature_cache.get(self.fea_type)
+        fea_cache = self.feature_cache.get(self.fea_type, (str(self.target), self.task.workload))
 
         indexes = np.array(indexes)
         need_extract = [x for x in indexes if x not in fea_cache]
 
-        if need_extract:
+        if need_extract and self.fea_type == "knob":
+            # knob features are gathered from the space in one batch, no need to fork
+            try:
+                feas = self.space.get_flatten_features(need_extract)
+            except (KeyError, TypeError, ValueError):  # knobs without a numerical feature
+                feas = [None] * len(need_extract)
+            for i, fea in zip(need_extract, feas):
+                fea_cache[i] = fea
+        elif need_extract:
             pool = self._get_pool()
             # If we are forking, we can pass arguments in globals for better performance
             if multiprocessing.get_start_method(False) == "fork":
@@ -335,6 +432,8 @@ class XGBoostCostModel(CostModel):
                 feas = pool.map(self.feature_extract_func, args)
             for i, fea in zip(need_extract, feas):
                 fea_cache[i] = fea
+        if need_extract:
+            self.feature_cache.flush()
 
         feature_len = None
         for idx in indexes:
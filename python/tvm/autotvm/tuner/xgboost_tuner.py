@@ -16,9 +16,11 @@
 # under the License.
 """Tuner that uses xgboost as cost model"""
 
+from ..env import GLOBAL_SCOPE
 from .model_based_tuner import ModelBasedTuner, ModelOptimizer
+from .model_zoo import CostModelZoo
 from .xgboost_cost_model import XGBoostCostModel
-from .sa_model_optimizer import SimulatedAnnealingOptimizer
+from .sa_model_optimizer import SimulatedAnnealingOptimizer, BatchedSimulatedAnnealingOptimizer
 
 
 class XGBTuner(ModelBasedTuner):
@@ -57,6 +59,7 @@ class XGBTuner(ModelBasedTuner):
     num_threads: int, optional
         The number of threads.  optimizer: str or ModelOptimizer, optional
         If is 'sa', use a default simulated annealing optimizer.
+        If is 'batched_sa', use a simulated annealing optimizer on knob matrices.
         Otherwise it should be a ModelOptimizer object.
 
     diversity_filter_ratio: int or float, optional
@@ -68,6 +71,15 @@ class XGBTuner(ModelBasedTuner):
         The verbose level.
         If is 0, output nothing.
         Otherwise, output debug information every `verbose` iterations.
+
+    feature_cache: str or FeatureCache, optional
+        The cache of extracted features.
+        If is a str, features are cached on disk in this directory and reused by
+        later tuning sessions, see :any:`DiskFeatureCache`.
+
+    model_zoo: str or CostModelZoo, optional
+        If the zoo has a model pretrained for the target and the template of the task,
+        the tuner starts from it as a base model, see :any:`CostModelZoo`.
     """
 
     def __init__(
@@ -80,6 +92,8 @@ class XGBTuner(ModelBasedTuner):
         optimizer="sa",
         diversity_filter_ratio=None,
         log_interval=50,
+        feature_cache=None,
+        model_zoo=None,
     ):
         cost_model = XGBoostCostModel(
             task,
@@ -87,9 +101,12 @@ class XGBTuner(ModelBasedTuner):
             loss_type=loss_type,
             num_threads=num_threads,
             log_interval=log_interval // 2,
+            feature_cache=feature_cache,
         )
         if optimizer == "sa":
             optimizer = SimulatedAnnealingOptimizer(task, log_interval=log_interval)
+        elif optimizer == "batched_sa":
+            optimizer = BatchedSimulatedAnnealingOptimizer(task, log_interval=log_interval)
         else:
             assert isinstance(optimizer, ModelOptimizer), (
                 "Optimizer must be " "a supported name string" "or a ModelOptimizer object."
@@ -99,6 +116,24 @@ class XGBTuner(ModelBasedTuner):
             task, cost_model, optimizer, plan_size, diversity_filter_ratio
         )
 
+        if model_zoo is not None:
+            if isinstance(model_zoo, str):
+                model_zoo = CostModelZoo(model_zoo)
+            # set in_tuning as True to make the feature extraction consistent
+            old_in_tuning = GLOBAL_SCOPE.in_tuning
+            GLOBAL_SCOPE.in_tuning = True
+            try:
+                base_model = model_zoo.load(cost_model)
+                if base_model is not None:
+                    # use the pretrained model to select the initial trials
+                    self.trials = self.model_optimizer.find_maximums(
+                        base_model, self.plan_size, self.visited
+                    )
+                    self.trial_pt = 0
+                    cost_model.load_basemodel(base_model)
+            finally:
+                GLOBAL_SCOPE.in_tuning = old_in_tuning
+
     def tune(self, *args, **kwargs):  # pylint: disable=arguments-differ
         super(XGBTuner, self).tune(*args, **kwargs)
 
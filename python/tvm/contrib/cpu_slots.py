@@ -0,0 +1,342 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Run jobs concurrently in worker processes pinned to disjoint CPU sets.
+
+This is used by the local runners of the tuners to measure several
+programs at once on a large host, one program per CPU set (slot).
+"""
+import concurrent.futures
+import os
+import queue
+import threading
+
+import numpy as np
+
+from .popen_pool import PopenWorker
+
+_SYS_CPU = "/sys/devices/system/cpu"
+_SYS_NODE = "/sys/devices/system/node"
+
+
+def _parse_cpu_list(text):
+    """Parse a cpu list of the Linux sysfs, e.g. "0-3,8,10-11"."""
+    cpus = []
+    for part in text.strip().split(","):
+        if not part:
+            continue
+        if "-" in part:
+            begin, end = part.split("-")
+            cpus.extend(range(int(begin), int(end) + 1))
+        else:
+            cpus.append(int(part))
+    return cpus
+
+
+def _read_cpu_list(path):
+    try:
+        with open(path) as fin:
+            return _parse_cpu_list(fin.read())
+    except (OSError, ValueError):
+        return None
+
+
+def available_cpus():
+    """Get the CPUs the current process is allowed to run on
+
+    Returns
+    -------
+    cpus : List[int]
+        The sorted ids of the CPUs
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def get_numa_nodes(cpus=None):
+    """Group CPUs by NUMA node
+
+    Parameters
+    ----------
+    cpus : List[int], optional
+        The CPUs to group. By default, the available CPUs of the current process.
+
+    Returns
+    -------
+    nodes : List[List[int]]
+        The CPUs of every NUMA node that has any of them.
+        All the CPUs are in one node if the NUMA topology is unknown.
+    """
+    cpus = available_cpus() if cpus is None else sorted(cpus)
+    nodes = []
+    if os.path.isdir(_SYS_NODE):
+        names = [x for x in os.listdir(_SYS_NODE) if x.startswith("node") and x[4:].isdigit()]
+        for name in sorted(names, key=lambda x: int(x[4:])):
+            node_cpus = _read_cpu_list(os.path.join(_SYS_NODE, name, "cpulist")) or []
+            node_cpus = [x for x in cpus if x in set(node_cpus)]
+            if node_cpus:
+                nodes.append(node_cpus)
+    covered = set(x for node in nodes for x in node)
+    if not nodes or len(covered) != len(cpus):
+        return [cpus]
+    return nodes
+
+
+def get_physical_cores(cpus):
+    """Group CPUs by physical core, so hyper-threading siblings stay together
+
+    Parameters
+    ----------
+    cpus : List[int]
+        The CPUs to group
+
+    Returns
+    -------
+    cores : List[List[int]]
+        The CPUs of every physical core, ordered by their first CPU.
+        Every CPU is a core of its own if the topology is unknown.
+    """
+    cores = {}
+    for cpu in cpus:
+        path = os.path.join(_SYS_CPU, "cpu%d" % cpu, "topology", "thread_siblings_list")
+        siblings = _read_cpu_list(path) or [cpu]
+        cores.setdefault(min(siblings), []).append(cpu)
+    return [cores[key] for key in sorted(cores)]
+
+
+def partition_cpus(n_slots=None, cores_per_slot=1, per_numa_node=True, cpus=None):
+    """Split CPUs into disjoint CPU sets, one per measurement slot.
+
+    Every set holds `cores_per_slot` physical cores, using the first hardware thread
+    of each core only, so the slots do not share the execution units of a core.
+    With `per_numa_node`, a set never crosses NUMA nodes, and the sets are taken
+    from the nodes in turn so the load is spread over the sockets.
+
+    Parameters
+    ----------
+    n_slots : int, optional
+        The number of sets. By default, as many as fit.
+    cores_per_slot : int
+        The number of physical cores in a set
+    per_numa_node : bool
+        Whether to keep every set inside one NUMA node
+    cpus : List[int], optional
+        The CPUs to split. By default, the available CPUs of the current process.
+
+    Returns
+    -------
+    cpu_sets : List[List[int]]
+        The CPU sets
+    """
+    cpus = available_cpus() if cpus is None else sorted(cpus)
+    nodes = get_numa_nodes(cpus) if per_numa_node else [cpus]
+
+    node_sets = []
+    for node in nodes:
+        cores = [core[0] for core in get_physical_cores(node)]
+        node_sets.append(
+            [
+                cores[i : i + cores_per_slot]
+                for i in range(0, len(cores) - cores_per_slot + 1, cores_per_slot)
+            ]
+        )
+
+    cpu_sets = []
+    for i in range(max((len(x) for x in node_sets), default=0)):
+        cpu_sets.extend(x[i] for x in node_sets if i < len(x))
+    if n_slots is not None:
+        if n_slots > len(cpu_sets):
+            raise ValueError(
+                "Cannot make %d slots of %d cores from %d CPUs"
+                % (n_slots, cores_per_slot, len(cpus))
+            )
+        cpu_sets = cpu_sets[:n_slots]
+    return cpu_sets
+
+
+def pin_current_process(cpus):
+    """Pin the current process to a CPU set.
+
+    The TVM runtime thread pool then runs one thread per CPU of the set,
+    and does not bind its threads to the first cores of the host.
+    This must be called before the runtime thread pool is created.
+
+    Parameters
+    ----------
+    cpus : List[int]
+        The CPU set
+    """
+    os.sched_setaffinity(0, cpus)
+    os.environ["TVM_NUM_THREADS"] = str(len(cpus))
+    os.environ["TVM_BIND_THREADS"] = "0"
+
+
+class CPUSlotExecutor:
+    """Run jobs in worker processes pinned to disjoint CPU sets.
+
+    Every CPU set (slot) has one persistent worker process, which runs one job at a time,
+    so several jobs run at once without sharing cores. A worker that times out or
+    crashes is killed and restarted on the same CPU set for the next job.
+
+    The executor also keeps the timing stability of every slot, as reported by
+    :any:`record`, so a noisy slot can be spotted.
+
+    Parameters
+    ----------
+    cpu_slots : int or List[List[int]]
+        The CPU sets, or the number of sets made by :any:`partition_cpus`.
+        A non-positive number makes as many sets as fit.
+    cores_per_slot : int
+        The number of physical cores of a set made by :any:`partition_cpus`
+    per_numa_node : bool
+        Whether to keep every set made by :any:`partition_cpus` inside one NUMA node
+    timeout : float, optional
+        Timeout value for each job
+    """
+
+    def __init__(self, cpu_slots, cores_per_slot=1, per_numa_node=True, timeout=None):
+        if isinstance(cpu_slots, int):
+            cpu_slots = partition_cpus(
+                cpu_slots if cpu_slots > 0 else None, cores_per_slot, per_numa_node
+            )
+        if not cpu_slots:
+            raise ValueError("At least one CPU set is needed")
+        self.cpu_sets = [sorted(x) for x in cpu_slots]
+        self._timeout = timeout
+        self._workers = [PopenWorker(pin_current_process, (cpus,)) for cpus in self.cpu_sets]
+        self._free_slots = queue.Queue()
+        for slot in range(len(self.cpu_sets)):
+            self._free_slots.put(slot)
+        self._threadpool = concurrent.futures.ThreadPoolExecutor(max_workers=len(self.cpu_sets))
+        self._lock = threading.Lock()
+        self._stats = [{"n_runs": 0, "n_errors": 0, "cv": []} for _ in self.cpu_sets]
+
+    def __del__(self):
+        self.kill_workers()
+        self._threadpool.shutdown()
+
+    def kill_workers(self):
+        """Kill the worker processes, e.g. to release the CPU sets they are pinned to.
+        The executor stays usable, a worker is restarted by the next job of its slot."""
+        for worker in self._workers:
+            try:
+                worker.kill()
+            except ImportError:
+                pass
+
+    def __len__(self):
+        return len(self.cpu_sets)
+
+    def _run(self, fn, args, kwargs):
+        slot = self._free_slots.get()
+        try:
+            worker = self._workers[slot]
+            worker.send(fn, args, kwargs, self._timeout)
+            return slot, worker.recv()
+        except Exception:
+            self.record(slot, None)
+            raise
+        finally:
+            self._free_slots.put(slot)
+
+    def submit(self, fn, *args, **kwargs):
+        """Submit a job to the next free slot
+
+        Parameters
+        ----------
+        fn : function
+            The function to be invoked in the worker process.
+        args : list
+            Positional argument.
+        kwargs : dict
+            Keyword arguments
+
+        Returns
+        -------
+        future : concurrent.futures.Future
+            A future of the (slot, return value) pair of the job.
+            A job that raises, times out or crashes its worker is recorded as an error.
+        """
+        return self._threadpool.submit(self._run, fn, args, kwargs)
+
+    def record(self, slot, costs):
+        """Record the repeated timings of a measurement made by a slot
+
+        Parameters
+        ----------
+        slot : int
+            The slot
+        costs : Optional[List[float]]
+            The repeated costs of the measurement, None if it failed
+        """
+        with self._lock:
+            stats = self._stats[slot]
+            if costs is None:
+                stats["n_errors"] += 1
+                return
+            stats["n_runs"] += 1
+            costs = np.array(costs, dtype="float64")
+            if len(costs) > 1 and np.mean(costs) > 0:
+                stats["cv"].append(float(np.std(costs) / np.mean(costs)))
+
+    def slot_stats(self):
+        """Get the timing stability of every slot
+
+        Returns
+        -------
+        stats : List[Dict[str, Any]]
+            For every slot: its CPU set, the numbers of successful and failed measurements,
+            and the mean and maximum coefficient of variation of the repeated costs
+            of a measurement (NaN if no measurement was repeated).
+        """
+        ret = []
+        with self._lock:
+            for cpus, stats in zip(self.cpu_sets, self._stats):
+                cv = stats["cv"]
+                ret.append(
+                    {
+                        "cpus": cpus,
+                        "n_runs": stats["n_runs"],
+                        "n_errors": stats["n_errors"],
+                        "mean_cv": float(np.mean(cv)) if cv else float("nan"),
+                        "max_cv": float(np.max(cv)) if cv else float("nan"),
+                    }
+                )
+        return ret
+
+    def text_summary(self):
+        """Get a table of the timing stability of every slot
+
+        Returns
+        -------
+        summary : str
+            The table
+        """
+        lines = ["slot  runs  errors  mean cv   max cv  cpus"]
+        for i, stats in enumerate(self.slot_stats()):
+            lines.append(
+                "%4d  %4d  %6d  %7.4f  %7.4f  %s"
+                % (
+                    i,
+                    stats["n_runs"],
+                    stats["n_errors"],
+                    stats["mean_cv"],
+                    stats["max_cv"],
+                    ",".join(str(x) for x in stats["cpus"]),
+                )
+            )
+        return "\n".join(lines)
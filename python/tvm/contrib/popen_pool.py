@@ -22,6 +22,7 @@ with additional timeout support.
 """
 import os
 import sys
+import select
 import struct
 import threading
 import subprocess
@@ -83,10 +84,34 @@ class PopenWorker:
 
     PopenWorker provides a low-level
     API to interact with a separate process via Popen.
+
+    Parameters
+    ----------
+    initializer : callable, optional
+        A function called with initargs in every new process,
+        e.g. to import heavy modules once.
+
+    initargs : tuple
+        The arguments of initializer.
+
+    maximum_uses : int, optional
+        The number of tasks a process runs before it is restarted.
+
+    max_rss_bytes : int, optional
+        Restart the process after a task if its resident memory grows beyond this size.
     """
 
-    def __init__(self):
+    # extra seconds the main process waits for a worker that does not answer its own timeout
+    HANG_GRACE_PERIOD = 5
+
+    def __init__(self, initializer=None, initargs=(), maximum_uses=None, max_rss_bytes=None):
         self._proc = None
+        self._initializer = initializer
+        self._initargs = initargs
+        self._maximum_uses = maximum_uses
+        self._max_rss_bytes = max_rss_bytes
+        self._remaining_uses = None
+        self._timeout = None
 
     def __del__(self):
         try:
@@ -172,12 +197,20 @@ class PopenWorker:
         order to make sure the timeout and child process exit
         won't affect the later requests.
         """
+        if self._proc is None:
+            self._start()
+            self._remaining_uses = self._maximum_uses
+            if self._initializer is not None:
+                self._send(self._initializer, self._initargs, None, None)
+                self._recv()
+        self._send(fn, args, kwargs, timeout)
+
+    def _send(self, fn, args, kwargs, timeout):
         # use cloud pickle
         # pylint: disable=import-outside-toplevel
         import cloudpickle
 
-        if self._proc is None:
-            self._start()
+        self._timeout = timeout
         kwargs = {} if not kwargs else kwargs
         data = cloudpickle.dumps((fn, args, kwargs, timeout), protocol=pickle.HIGHEST_PROTOCOL)
         try:
@@ -207,9 +240,46 @@ class PopenWorker:
         TimeoutError: if timeout happens
         Exception: if other exception happens during the execution.
         """
+        try:
+            return self._recv()
+        finally:
+            self._recycle()
+
+    def _recycle(self):
+        """Kill the process if it ran out of uses or grew too large.
+        It is lazily restarted in the next send."""
+        if self._proc is None:
+            return
+        if self._remaining_uses is not None:
+            self._remaining_uses -= 1
+            if self._remaining_uses <= 0:
+                self.kill()
+                return
+        if self._max_rss_bytes is not None:
+            # pylint: disable=import-outside-toplevel
+            import psutil
+
+            try:
+                rss = psutil.Process(self._proc.pid).memory_info().rss
+            except psutil.NoSuchProcess:
+                return
+            if rss > self._max_rss_bytes:
+                self.kill()
+
+    def _recv(self):
         # pylint: disable=import-outside-toplevel
         import cloudpickle
 
+        if self._timeout is not None and sys.platform != "win32":
+            # guard against a worker that hangs without releasing the GIL,
+            # in which case it cannot answer its own timeout
+            ready, _, _ = select.select(
+                [self._reader], [], [], self._timeout + self.HANG_GRACE_PERIOD
+            )
+            if not ready:
+                self.kill()
+                raise TimeoutError()
+
         try:
             len_data = self._reader.read(4)
         except IOError:
@@ -244,31 +314,68 @@ class PopenPoolExecutor:
 
     timeout : float
         Timeout value for each function submit.
+
+    initializer : callable, optional
+        A function called with initargs in every new worker process,
+        e.g. to import heavy modules once per process instead of once per task.
+
+    initargs : tuple
+        The arguments of initializer.
+
+    maximum_process_uses : int, optional
+        The number of tasks a worker process runs before it is restarted.
+
+    max_process_rss : int, optional
+        Restart a worker process after a task if its resident memory
+        grows beyond this number of bytes.
     """
 
-    def __init__(self, max_workers, timeout=None):
+    def __init__(
+        self,
+        max_workers,
+        timeout=None,
+        initializer=None,
+        initargs=(),
+        maximum_process_uses=None,
+        max_process_rss=None,
+    ):
         # Use an internal thread pool to send to popen workers
         self._threadpool = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
         self._timeout = timeout
+        self._initializer = initializer
+        self._initargs = initargs
+        self._maximum_process_uses = maximum_process_uses
+        self._max_process_rss = max_process_rss
         self._worker_map = {}
         self._lock = threading.Lock()
 
     def __del__(self):
+        self.kill_workers()
+        self._threadpool.shutdown()
+
+    def kill_workers(self):
+        """Kill the worker processes, e.g. to release the resources they hold.
+        The pool stays usable, new workers are started by the next submits."""
         self._lock.acquire()
         for worker in self._worker_map.values():
             try:
                 worker.kill()
             except ImportError:
                 pass
+        self._worker_map.clear()
         self._lock.release()
-        self._threadpool.shutdown()
 
     def _worker_run(self, fn, args, kwargs):
         """Internal thread runner."""
         self._lock.acquire()
         tid = threading.get_ident()
         if tid not in self._worker_map:
-            proc = PopenWorker()
+            proc = PopenWorker(
+                self._initializer,
+                self._initargs,
+                self._maximum_process_uses,
+                self._max_process_rss,
+            )
             self._worker_map[tid] = proc
         else:
             proc = self._worker_map[tid]
@@ -51,6 +51,7 @@ def main(args):
         load_library=args.load_library,
         custom_addr=args.custom_addr,
         silent=args.silent,
+        module_cache_size=args.module_cache_size,
     )
     server.proc.join()
 
@@ -81,6 +82,13 @@ if __name__ == "__main__":
     parser.add_argument(
         "--custom-addr", type=str, help="Custom IP Address to Report to RPC Tracker"
     )
+    parser.add_argument(
+        "--module-cache-size",
+        type=int,
+        default=128 * 1024 * 1024,
+        help="The maximum size in bytes of the uploaded files kept across sessions, "
+        "0 to disable the cache.",
+    )
 
     parser.set_defaults(fork=True)
     args = parser.parse_args()
@@ -20,14 +20,20 @@ from __future__ import absolute_import
 
 import logging
 import argparse
+import functools
 import multiprocessing
 import sys
-from ..rpc.tracker import Tracker
+from ..rpc.tracker import Tracker, FairShareScheduler
 
 
 def main(args):
     """Main funciton"""
-    tracker = Tracker(args.host, port=args.port, port_end=args.port_end, silent=args.silent)
+    scheduler = None
+    if args.scheduler == "fair":
+        scheduler = functools.partial(FairShareScheduler, max_lease=args.max_lease)
+    tracker = Tracker(
+        args.host, port=args.port, port_end=args.port_end, silent=args.silent, scheduler=scheduler
+    )
     tracker.proc.join()
 
 
@@ -45,6 +51,20 @@ if __name__ == "__main__":
                          and ROCM compilers.",
     )
     parser.add_argument("--silent", action="store_true", help="Whether run in silent mode.")
+    parser.add_argument(
+        "--scheduler",
+        type=str,
+        default="priority",
+        choices=["priority", "fair"],
+        help="The scheduler of the devices, by priority then FIFO, "
+        "or by priority then fair share of the users.",
+    )
+    parser.add_argument(
+        "--max-lease",
+        type=float,
+        default=None,
+        help="The maximum duration in seconds of a session with the fair scheduler.",
+    )
 
     parser.set_defaults(fork=True)
     args = parser.parse_args()
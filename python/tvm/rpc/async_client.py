@@ -0,0 +1,312 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""asyncio client of the RPC tracker and the RPC sessions.
+
+The tracker protocol is spoken on asyncio streams, so one event loop can hold
+hundreds of outstanding device requests. Every request has its own tracker
+connection, which is closed when the request is cancelled or times out, so the
+tracker hands the device to the next request.
+
+The remote calls of a session go through the blocking RPC runtime. They run in
+a thread pool of the client, so they can be awaited, cancelled and timed out
+from the event loop.
+
+Examples
+--------
+Measure on all the boards of a farm from one process
+
+.. code-block:: python
+
+    async def measure(tracker, path):
+        sess = await tracker.request("rasp4b", session_timeout=60, timeout=600)
+        await sess.upload(path)
+        func = await sess.load_module(os.path.basename(path))
+        return await sess.call(lambda: func.time_evaluator(func.entry_name, sess.cpu(0))())
+
+    tracker = AsyncTrackerSession(("localhost", 9190))
+    results = loop.run_until_complete(asyncio.gather(*[measure(tracker, x) for x in paths]))
+"""
+import asyncio
+import concurrent.futures
+import functools
+import json
+import struct
+
+from tvm._ffi.base import TVMError
+
+from . import base
+from .client import connect
+
+
+async def _sendjson(writer, data):
+    data = json.dumps(data).encode("utf-8")
+    writer.write(struct.pack("<i", len(data)))
+    writer.write(data)
+    await writer.drain()
+
+
+async def _recvjson(reader):
+    size = struct.unpack("<i", await reader.readexactly(4))[0]
+    return json.loads((await reader.readexactly(size)).decode("utf-8"))
+
+
+class AsyncRPCSession(object):
+    """asyncio wrapper of a RPC session.
+
+    Parameters
+    ----------
+    sess : RPCSession
+        The session
+
+    executor : concurrent.futures.Executor
+        The executor of the remote calls
+    """
+
+    def __init__(self, sess, executor):
+        self.session = sess
+        self._executor = executor
+
+    def __getattr__(self, name):
+        # the calls that stay local, e.g. context and cpu
+        return getattr(self.session, name)
+
+    async def call(self, func, *args, timeout=None):
+        """Run a blocking function, e.g. of remote calls, in the thread pool of the client.
+
+        Parameters
+        ----------
+        func : function
+            The function
+
+        args : list
+            The arguments of the function
+
+        timeout : float, optional
+            The timeout in seconds. The remote call keeps running in its thread
+            after a timeout or a cancellation, the session should be dropped then,
+            and its server kills it after the session timeout.
+
+        Returns
+        -------
+        value : object
+            The return value of the function
+        """
+        loop = asyncio.get_event_loop()
+        future = loop.run_in_executor(self._executor, functools.partial(func, *args))
+        return await asyncio.wait_for(future, timeout)
+
+    async def upload(self, data, target=None, timeout=None):
+        """Upload a file to the remote, see :any:`RPCSession.upload`"""
+        return await self.call(self.session.upload, data, target, timeout=timeout)
+
+    async def download(self, path, timeout=None):
+        """Download a file from the remote, see :any:`RPCSession.download`"""
+        return await self.call(self.session.download, path, timeout=timeout)
+
+    async def remove(self, path, timeout=None):
+        """Remove a file from the remote, see :any:`RPCSession.remove`"""
+        return await self.call(self.session.remove, path, timeout=timeout)
+
+    async def load_module(self, path, timeout=None):
+        """Load an uploaded module on the remote, see :any:`RPCSession.load_module`"""
+        return await self.call(self.session.load_module, path, timeout=timeout)
+
+    async def get_function(self, name, timeout=None):
+        """Get a function of the remote, see :any:`RPCSession.get_function`"""
+        return await self.call(self.session.get_function, name, timeout=timeout)
+
+
+class AsyncTrackerSession(object):
+    """asyncio client of the RPC tracker.
+
+    Parameters
+    ----------
+    addr : tuple
+        The address tuple of the tracker
+
+    max_remote_calls : int, optional
+        The maximum number of blocking remote calls, including the connections
+        to the servers, running at once for the sessions of this client.
+    """
+
+    def __init__(self, addr, max_remote_calls=256):
+        self._addr = addr
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_remote_calls)
+
+    def __del__(self):
+        self._executor.shutdown(wait=False)
+
+    async def _open(self):
+        reader, writer = await asyncio.open_connection(self._addr[0], self._addr[1])
+        writer.write(struct.pack("<i", base.RPC_TRACKER_MAGIC))
+        await writer.drain()
+        magic = struct.unpack("<i", await reader.readexactly(4))[0]
+        if magic != base.RPC_TRACKER_MAGIC:
+            writer.close()
+            raise RuntimeError("%s is not RPC Tracker" % str(self._addr))
+        return reader, writer
+
+    async def _call_tracker(self, data, timeout):
+        """Send a message on a new connection and wait for the answer.
+        The connection is closed when the call is cancelled or times out."""
+
+        async def _call():
+            reader, writer = await self._open()
+            try:
+                await _sendjson(writer, data)
+                return await _recvjson(reader)
+            finally:
+                writer.close()
+
+        return await asyncio.wait_for(_call(), timeout)
+
+    async def _connect(self, value, session_timeout):
+        url, port, matchkey = value
+        loop = asyncio.get_event_loop()
+        sess = await loop.run_in_executor(
+            self._executor, connect, url, port, matchkey, session_timeout
+        )
+        return AsyncRPCSession(sess, self._executor)
+
+    async def summary(self, timeout=None):
+        """Get the summary dict of the tracker, see :any:`TrackerSession.summary`"""
+        value = await self._call_tracker([base.TrackerCode.SUMMARY], timeout)
+        if value[0] != base.TrackerCode.SUCCESS:
+            raise RuntimeError("Invalid return value %s" % str(value))
+        return value[1]
+
+    async def request(self, key, priority=1, session_timeout=0, user="", timeout=None):
+        """Request a new connection from the tracker.
+
+        Parameters
+        ----------
+        key : str
+            The type key of the device.
+
+        priority : int, optional
+            The priority of the request.
+
+        session_timeout : float, optional
+            The duration of the session, allows server to kill
+            the connection when duration is longer than this value.
+            When duration is zero, it means the request must always be kept alive.
+
+        user : str, optional
+            The user the device time is accounted to by a fair-share tracker.
+
+        timeout : float, optional
+            The timeout in seconds of waiting for a device.
+            The request is withdrawn from the tracker on a timeout or a cancellation.
+
+        Returns
+        -------
+        sess : AsyncRPCSession
+            The connected session.
+        """
+        value = await self._call_tracker([base.TrackerCode.REQUEST, key, user, priority], timeout)
+        if value[0] != base.TrackerCode.SUCCESS:
+            raise RuntimeError("Invalid return value %s" % str(value))
+        return await self._connect(value[1], session_timeout)
+
+    async def request_batch(self, key, count, priority=1, session_timeout=0, user="", timeout=None):
+        """Request several connections that the tracker grants together,
+        see :any:`TrackerSession.request_batch`.
+
+        Returns
+        -------
+        sessions : List[AsyncRPCSession]
+            The connected sessions.
+        """
+        value = await self._call_tracker(
+            [base.TrackerCode.REQUEST_BATCH, key, user, priority, count], timeout
+        )
+        if value == base.TrackerCode.FAIL:
+            raise RuntimeError("The tracker does not grant batches of %s" % key)
+        if value[0] != base.TrackerCode.SUCCESS:
+            raise RuntimeError("Invalid return value %s" % str(value))
+        return await asyncio.gather(*[self._connect(x, session_timeout) for x in value[1]])
+
+    async def request_and_run(
+        self, key, func, priority=1, session_timeout=0, max_retry=2, user="", timeout=None
+    ):
+        """Request a device from the tracker and run a coroutine function on its session.
+
+        A new device is requested and func is run again when the session fails,
+        see :any:`TrackerSession.request_and_run`.
+
+        Parameters
+        ----------
+        key : str
+            The type key of the device.
+
+        func : function of AsyncRPCSession -> awaitable
+            A stateless coroutine function
+
+        priority : int, optional
+            The priority of the request.
+
+        session_timeout : float, optional
+            The duration of the session, allows server to kill
+            the connection when duration is longer than this value.
+
+        max_retry : int, optional
+            Maximum number of times to retry the function before give up.
+
+        user : str, optional
+            The user the device time is accounted to by a fair-share tracker.
+
+        timeout : float, optional
+            The timeout in seconds of waiting for a device.
+        """
+        last_err = None
+        loop = asyncio.get_event_loop()
+        for _ in range(max_retry):
+            sess = await self.request(key, priority, session_timeout, user, timeout)
+            tstart = loop.time()
+            try:
+                return await func(sess)
+            except TVMError as err:
+                duration = loop.time() - tstart
+                # roughly estimate if the error is due to timeout termination
+                if session_timeout and duration >= session_timeout * 0.95:
+                    raise RuntimeError("Session timeout when running %s" % func.__name__)
+                last_err = err
+        raise RuntimeError(
+            "Failed to run on %s after %d retry, last_error:%s" % (key, max_retry, str(last_err))
+        )
+
+
+def connect_tracker_async(url, port, max_remote_calls=256):
+    """Create an asyncio client of a RPC tracker.
+
+    Parameters
+    ----------
+    url : str
+        The url of the host
+
+    port : int
+        The port to connect to
+
+    max_remote_calls : int, optional
+        The maximum number of blocking remote calls running at once.
+
+    Returns
+    -------
+    sess : AsyncTrackerSession
+        The tracker client.
+    """
+    return AsyncTrackerSession((url, port), max_remote_calls)
@@ -53,6 +53,7 @@ class TrackerCode(object):
     UPDATE_INFO = 5
     SUMMARY = 6
     GET_PENDING_MATCHKEYS = 7
+    REQUEST_BATCH = 8
 
 
 RPC_SESS_MASK = 128
@@ -15,6 +15,7 @@
 # specific language governing permissions and limitations
 # under the License.
 """RPC client tools"""
+import hashlib
 import os
 import stat
 import socket
@@ -42,6 +43,9 @@ class RPCSession(object):
         self._sess = sess
         self._tbl_index = _ffi_api.SessTableIndex(sess)
         self._remote_funcs = {}
+        # whether the remote keeps a module cache, None if it is not queried yet
+        self._module_cache = None
+        self.n_cached_uploads = 0
 
     def system_lib(self):
         """Get system-wide library module.
@@ -92,7 +96,7 @@ class RPCSession(object):
         ctx._rpc_sess = self
         return ctx
 
-    def upload(self, data, target=None):
+    def upload(self, data, target=None, use_cache=True):
         """Upload file to remote runtime temp folder
 
         Parameters
@@ -102,6 +106,11 @@ class RPCSession(object):
 
         target : str, optional
             The path in remote
+
+        use_cache : bool, optional
+            Whether to look the content up in the module cache of the remote first,
+            so that a file the remote already holds is not sent again.
+            The uploads served by the cache are counted in `n_cached_uploads`.
         """
         if isinstance(data, bytearray):
             if not target:
@@ -112,10 +121,37 @@ class RPCSession(object):
             if not target:
                 target = os.path.basename(data)
 
+        if use_cache and self._has_module_cache():
+            digest = hashlib.sha256(blob).hexdigest()
+            found = self._remote_funcs["fetch_cached"](target, digest)
+            if found == 1:
+                self.n_cached_uploads += 1
+                return
+            if found == 0:
+                self._remote_funcs["upload_cached"](target, digest, blob)
+                return
+            # the server keeps no cache
+            self._module_cache = False
+
         if "upload" not in self._remote_funcs:
             self._remote_funcs["upload"] = self.get_function("tvm.rpc.server.upload")
         self._remote_funcs["upload"](target, blob)
 
+    def _has_module_cache(self):
+        """Check whether the remote may keep a module cache, older servers do not."""
+        if self._module_cache is None:
+            try:
+                self._remote_funcs["fetch_cached"] = self.get_function(
+                    "tvm.rpc.server.fetch_cached"
+                )
+                self._remote_funcs["upload_cached"] = self.get_function(
+                    "tvm.rpc.server.upload_cached"
+                )
+                self._module_cache = True
+            except (AttributeError, TVMError):
+                self._module_cache = False
+        return self._module_cache
+
     def download(self, path):
         """Download file from remote temp folder.
 
@@ -360,9 +396,55 @@ class TrackerSession(object):
                     pending,
                 )
         res += separate_line
+
+        # the statistics of the schedulers that keep leases, e.g. FairShareScheduler
+        keys = [k for k in keys if "utilization" in queue_info[k]]
+        if keys:
+            res += "\n"
+            res += "Utilization\n"
+            title = (
+                "%%-%ds" % max_key_len + "   leased  grants  mean-wait  max-wait  utilization\n"
+            ) % "key"
+            separate_line = "-" * len(title) + "\n"
+            res += separate_line + title + separate_line
+            for k in keys:
+                info = queue_info[k]
+                res += ("%%-%ds" % max_key_len + "   %-6d  %-6d  %8.2fs  %7.2fs  %10.1f%%\n") % (
+                    k,
+                    info["leased"],
+                    info["grants"],
+                    info["mean_wait"],
+                    info["max_wait"],
+                    info["utilization"] * 100,
+                )
+            res += separate_line
+
+            users = {}
+            for k in keys:
+                for user, info in queue_info[k]["users"].items():
+                    item = users.setdefault(user or "<anonymous>", [0.0, 0, 0])
+                    item[0] += info["usage"]
+                    item[1] += info["leased"]
+                    item[2] += info["pending"]
+            if users:
+                max_user_len = max([len(u) for u in users] + [len("user")])
+                res += "\n"
+                res += "User Share\n"
+                title = ("%%-%ds" % max_user_len + "   usage(s)  leased  pending\n") % "user"
+                separate_line = "-" * len(title) + "\n"
+                res += separate_line + title + separate_line
+                for user in sorted(users):
+                    usage, leased, pending = users[user]
+                    res += ("%%-%ds" % max_user_len + "   %-8.1f  %-6d  %-7d\n") % (
+                        user,
+                        usage,
+                        leased,
+                        pending,
+                    )
+                res += separate_line
         return res
 
-    def request(self, key, priority=1, session_timeout=0, max_retry=5):
+    def request(self, key, priority=1, session_timeout=0, max_retry=5, user=""):
         """Request a new connection from the tracker.
 
         Parameters
@@ -380,13 +462,16 @@ class TrackerSession(object):
 
         max_retry : int, optional
             Maximum number of times to retry before give up.
+
+        user : str, optional
+            The user the device time is accounted to by a fair-share tracker.
         """
         last_err = None
         for _ in range(max_retry):
             try:
                 if self._sock is None:
                     self._connect()
-                base.sendjson(self._sock, [base.TrackerCode.REQUEST, key, "", priority])
+                base.sendjson(self._sock, [base.TrackerCode.REQUEST, key, user, priority])
                 value = base.recvjson(self._sock)
                 if value[0] != base.TrackerCode.SUCCESS:
                     raise RuntimeError("Invalid return value %s" % str(value))
@@ -401,6 +486,44 @@ class TrackerSession(object):
             "Cannot request %s after %d retry, last_error:%s" % (key, max_retry, str(last_err))
         )
 
+    def request_batch(self, key, count, priority=1, session_timeout=0, user=""):
+        """Request several connections that the tracker grants together,
+        e.g. to measure on several devices at once.
+
+        Parameters
+        ----------
+        key : str
+            The type key of the devices.
+
+        count : int
+            The number of devices.
+
+        priority : int, optional
+            The priority of the request.
+
+        session_timeout : float, optional
+            The duration of the sessions, allows server to kill
+            the connection when duration is longer than this value.
+            When duration is zero, it means the request must always be kept alive.
+
+        user : str, optional
+            The user the device time is accounted to by a fair-share tracker.
+
+        Returns
+        -------
+        sessions : List[RPCSession]
+            The connected sessions.
+        """
+        if self._sock is None:
+            self._connect()
+        base.sendjson(self._sock, [base.TrackerCode.REQUEST_BATCH, key, user, priority, count])
+        value = base.recvjson(self._sock)
+        if value == base.TrackerCode.FAIL:
+            raise RuntimeError("The tracker does not grant batches of %s" % key)
+        if value[0] != base.TrackerCode.SUCCESS:
+            raise RuntimeError("Invalid return value %s" % str(value))
+        return [connect(url, port, matchkey, session_timeout) for url, port, matchkey in value[1]]
+
     def request_and_run(self, key, func, priority=1, session_timeout=0, max_retry=2):
         """Request a resource from tracker and run the func.
 
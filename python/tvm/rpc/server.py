@@ -27,6 +27,8 @@ Server is TCP based with the following protocol:
 # pylint: disable=invalid-name
 import os
 import ctypes
+import hashlib
+import shutil
 import socket
 import select
 import struct
@@ -50,7 +52,88 @@ from .base import TrackerCode
 logger = logging.getLogger("RPCServer")
 
 
-def _server_env(load_library, work_path=None):
+class ModuleCache(object):
+    """A bounded cache of uploaded files, keyed by the hash of their content.
+
+    The cache lives in a directory that is shared by the sessions of a server,
+    so a client can skip uploading a file the server already holds.
+    The least recently used files are evicted when the cache grows beyond its size.
+
+    Parameters
+    ----------
+    path : str
+        The directory of the cached files
+
+    max_bytes : int
+        The maximum total size of the cached files
+    """
+
+    def __init__(self, path, max_bytes):
+        self.path = path
+        self.max_bytes = max_bytes
+
+    def _entry(self, digest):
+        # the digest comes from the client, do not let it escape the cache directory
+        if len(digest) != 64 or any(c not in "0123456789abcdef" for c in digest):
+            raise ValueError("Invalid content hash %s" % digest)
+        return os.path.join(self.path, digest)
+
+    def fetch(self, digest, file_path):
+        """Copy the cached file with a content hash to a path.
+
+        Parameters
+        ----------
+        digest : str
+            The sha256 hex digest of the content
+
+        file_path : str
+            The path to copy the file to
+
+        Returns
+        -------
+        found : bool
+            Whether the file is cached
+        """
+        entry = self._entry(digest)
+        if not os.path.isfile(entry):
+            return False
+        # the modification time orders the entries for eviction
+        os.utime(entry)
+        shutil.copyfile(entry, file_path)
+        return True
+
+    def add(self, digest, file_path):
+        """Add a file to the cache and evict the least recently used files beyond the size.
+
+        Parameters
+        ----------
+        digest : str
+            The sha256 hex digest of the content
+
+        file_path : str
+            The path of the file
+        """
+        entry = self._entry(digest)
+        if os.path.getsize(file_path) > self.max_bytes:
+            return
+        shutil.copyfile(file_path, entry + ".tmp")
+        os.replace(entry + ".tmp", entry)
+
+        entries = []
+        for name in os.listdir(self.path):
+            stat = os.stat(os.path.join(self.path, name))
+            entries.append((stat.st_mtime, stat.st_size, name))
+        entries.sort()
+        total = sum(x[1] for x in entries)
+        for _, size, name in entries:
+            if total <= self.max_bytes:
+                break
+            if name != digest:
+                os.remove(os.path.join(self.path, name))
+                total -= size
+
+
+def _server_env(load_library, work_path=None, module_cache=None):
     """Server environment function return temp dir"""
     if work_path:
         temp = work_path
@@ -62,6 +145,26 @@ def _server_env(load_library, work_path=None):
     def get_workpath(path):
         return temp.relpath(path)
 
+    @tvm._ffi.register_func("tvm.rpc.server.fetch_cached", override=True)
+    def fetch_cached(file_name, digest):
+        """Copy a file from the module cache by its content hash.
+        Return 1 if it is cached, 0 if not, and -1 if the server keeps no cache."""
+        if module_cache is None:
+            return -1
+        return int(module_cache.fetch(digest, temp.relpath(file_name)))
+
+    @tvm._ffi.register_func("tvm.rpc.server.upload_cached", override=True)
+    def upload_cached(file_name, digest, blob):
+        """Upload a file and add it to the module cache.
+        The content hash sent by the client is checked, so it cannot poison the cache."""
+        if hashlib.sha256(blob).hexdigest() != digest:
+            raise ValueError("Content hash mismatch for %s" % file_name)
+        path = temp.relpath(file_name)
+        with open(path, "wb") as out_file:
+            out_file.write(blob)
+        if module_cache is not None:
+            module_cache.add(digest, path)
+
     @tvm._ffi.register_func("tvm.rpc.server.load_module", override=True)
     def load_module(file_name):
         """Load module from remote side."""
@@ -111,10 +214,10 @@ def _server_env(load_library, work_path=None):
     return temp
 
 
-def _serve_loop(sock, addr, load_library, work_path=None):
+def _serve_loop(sock, addr, load_library, work_path=None, module_cache=None):
     """Server loop"""
     sockfd = sock.fileno()
-    temp = _server_env(load_library, work_path)
+    temp = _server_env(load_library, work_path, module_cache)
     _ffi_api.ServerLoop(sockfd)
     if not work_path:
         temp.remove()
@@ -126,11 +229,23 @@ def _parse_server_opt(opts):
     ret = {}
     for kv in opts:
         if kv.startswith("-timeout="):
-            ret["timeout"] = float(kv[9:])
+            # the tracker can bound the timeout of the client by a lease duration
+            timeout = float(kv[9:])
+            ret["timeout"] = min(timeout, ret.get("timeout", timeout))
     return ret
 
 
-def _listen_loop(sock, port, rpc_key, tracker_addr, load_library, custom_addr):
+def _module_cache_env(module_cache_size):
+    """Create the directory of the module cache shared by the sessions of a server."""
+    if not module_cache_size:
+        return None, None
+    cache_dir = utils.tempdir()
+    return cache_dir, ModuleCache(cache_dir.temp_dir, module_cache_size)
+
+
+def _listen_loop(
+    sock, port, rpc_key, tracker_addr, load_library, custom_addr, module_cache_size=0
+):
     """Listening loop of the server."""
 
     def _accept_conn(listen_sock, tracker_conn, ping_period=2):
@@ -203,6 +318,8 @@ def _listen_loop(sock, port, rpc_key, tracker_addr, load_library, custom_addr):
             return conn, addr, _parse_server_opt(arr[1:])
 
     # Server logic
+    # pylint: disable=unused-variable
+    cache_dir, module_cache = _module_cache_env(module_cache_size)
     tracker_conn = None
     while True:
         try:
@@ -233,7 +350,7 @@ def _listen_loop(sock, port, rpc_key, tracker_addr, load_library, custom_addr):
         work_path = utils.tempdir()
         logger.info("connection from %s", addr)
         server_proc = multiprocessing.Process(
-            target=_serve_loop, args=(conn, addr, load_library, work_path)
+            target=_serve_loop, args=(conn, addr, load_library, work_path, module_cache)
         )
 
         server_proc.start()
@@ -256,8 +373,10 @@ def _listen_loop(sock, port, rpc_key, tracker_addr, load_library, custom_addr):
         work_path.remove()
 
 
-def _connect_proxy_loop(addr, key, load_library):
+def _connect_proxy_loop(addr, key, load_library, module_cache_size=0):
     key = "server:" + key
+    # pylint: disable=unused-variable
+    cache_dir, module_cache = _module_cache_env(module_cache_size)
     retry_count = 0
     max_retry = 5
     retry_period = 5
@@ -280,7 +399,9 @@ def _connect_proxy_loop(addr, key, load_library):
             remote_key = py_str(base.recvall(sock, keylen))
             opts = _parse_server_opt(remote_key.split()[1:])
             logger.info("connected to %s", str(addr))
-            process = multiprocessing.Process(target=_serve_loop, args=(sock, addr, load_library))
+            process = multiprocessing.Process(
+                target=_serve_loop, args=(sock, addr, load_library, None, module_cache)
+            )
             process.start()
             sock.close()
             process.join(opts.get("timeout", None))
@@ -348,6 +469,11 @@ class Server(object):
 
     silent: bool, optional
         Whether run this server in silent mode.
+
+    module_cache_size: int, optional
+        The maximum size in bytes of the files kept across sessions, so that the clients
+        can skip uploading the files the server already holds. The least recently used
+        files are evicted beyond this size. 0 to disable the cache.
     """
 
     def __init__(
@@ -362,6 +488,7 @@ class Server(object):
         load_library=None,
         custom_addr=None,
         silent=False,
+        module_cache_size=128 * 1024 * 1024,
     ):
         try:
             if _ffi_api.ServerLoop is None:
@@ -395,6 +522,7 @@ class Server(object):
                 cmd += ["--custom-addr", custom_addr]
             if silent:
                 cmd += ["--silent"]
+            cmd += ["--module-cache-size=%d" % module_cache_size]
 
             # prexec_fn is not thread safe and may result in deadlock.
             # python 3.2 introduced the start_new_session parameter as
@@ -429,12 +557,21 @@ class Server(object):
             self.sock = sock
             self.proc = multiprocessing.Process(
                 target=_listen_loop,
-                args=(self.sock, self.port, key, tracker_addr, load_library, self.custom_addr),
+                args=(
+                    self.sock,
+                    self.port,
+                    key,
+                    tracker_addr,
+                    load_library,
+                    self.custom_addr,
+                    module_cache_size,
+                ),
             )
             self.proc.start()
         else:
             self.proc = multiprocessing.Process(
-                target=_connect_proxy_loop, args=((host, port), key, load_library)
+                target=_connect_proxy_loop,
+                args=((host, port), key, load_library, module_cache_size),
             )
             self.proc.start()
 
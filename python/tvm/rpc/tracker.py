@@ -38,9 +38,14 @@ List of available APIs:
 - REQUEST: request a new resource from tracker
   - input: [TrackerCode.REQUEST, [key, user, priority]]
   - return: [TrackerCode.SUCCESS, [url, port, match-key]]
+- REQUEST_BATCH: request several resources that are granted together
+  - input: [TrackerCode.REQUEST_BATCH, key, user, priority, count]
+  - return: [TrackerCode.SUCCESS, [[url, port, match-key], ...]]
+  - note: returns TrackerCode.FAIL if the scheduler does not grant batches.
 """
 # pylint: disable=invalid-name
 
+import collections
 import heapq
 import time
 import logging
@@ -97,6 +102,26 @@ class Scheduler(object):
         """
         raise NotImplementedError()
 
+    def request_batch(self, user, priority, count, callback):
+        """Request several resources that are granted together.
+
+        Parameters
+        ----------
+        user : str
+            The user who is requesting the resources.
+
+        priority : int
+            The job priority
+
+        count : int
+            The number of resources
+
+        callback : function: List[value]->bool
+            Callback function to receive the resources when ready
+            returns True if the resources are consumed.
+        """
+        raise NotImplementedError()
+
     def remove(self, value):
         """Remove a resource in the scheduler
 
@@ -147,6 +172,162 @@ class PriorityScheduler(Scheduler):
         return {"free": len(self._values), "pending": len(self._requests)}
 
 
+class FairShareScheduler(Scheduler):
+    """Fair-share scheduler with bounded leases.
+
+    The requests of a higher priority are served first. Among the requests of the same
+    priority, the user who used the least device time recently is served first, then FIFO.
+    A resource is leased to a user from its grant until its server reports it again.
+
+    Parameters
+    ----------
+    key : str
+        The key of the resources
+
+    max_lease : float, optional
+        The maximum duration of a lease in seconds. It is passed to the server along with
+        the match key, which then kills a longer session, so that the resource is reclaimed.
+        A lease that is not returned within this duration is dropped from the accounting.
+        None for unbounded leases.
+
+    usage_half_life : float, optional
+        The half life in seconds of the device time a user is accounted for.
+    """
+
+    # extra seconds a lease is kept beyond max_lease for its server to report again
+    RECLAIM_GRACE_PERIOD = 10
+
+    def __init__(self, key, max_lease=None, usage_half_life=3600.0):
+        self._key = key
+        self._max_lease = max_lease
+        self._half_life = usage_half_life
+        self._values = collections.deque()
+        # pending requests: [priority, request time, user, count, callback]
+        self._requests = []
+        # the leased resources: server connection -> (user, grant time)
+        self._leases = {}
+        # the decayed device time of every user: user -> (seconds, update time)
+        self._usage = {}
+        self._start_time = self._last_tick = time.time()
+        self._device_seconds = 0.0
+        self._busy_seconds = 0.0
+        self._n_grants = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._n_reclaimed = 0
+
+    def _tick(self):
+        """Integrate the device time up to now and drop the expired leases."""
+        now = time.time()
+        elapsed = now - self._last_tick
+        self._device_seconds += elapsed * (len(self._values) + len(self._leases))
+        self._busy_seconds += elapsed * len(self._leases)
+        self._last_tick = now
+        if self._max_lease is not None:
+            deadline = now - self._max_lease - self.RECLAIM_GRACE_PERIOD
+            for conn in [c for c, (_, start) in self._leases.items() if start < deadline]:
+                logger.warning("Lease of %s on %s expired", self._leases[conn][0], self._key)
+                self._end_lease(conn)
+                self._n_reclaimed += 1
+        return now
+
+    def _user_usage(self, user, now):
+        seconds, tstamp = self._usage.get(user, (0.0, now))
+        usage = seconds * 0.5 ** ((now - tstamp) / self._half_life)
+        for lease_user, start in self._leases.values():
+            if lease_user == user:
+                usage += now - start
+        return usage
+
+    def _end_lease(self, conn):
+        if conn not in self._leases:
+            return
+        now = time.time()
+        user, start = self._leases.pop(conn)
+        self._usage[user] = (self._user_usage(user, now) + now - start, now)
+
+    def _schedule(self):
+        now = self._tick()
+        n_devices = len(self._values) + len(self._leases)
+        while self._requests and self._values:
+            # a batch larger than all the known resources waits without blocking the others
+            candidates = [x for x in self._requests if x[3] <= n_devices]
+            if not candidates:
+                return
+            usage = {x[2]: self._user_usage(x[2], now) for x in candidates}
+            item = min(candidates, key=lambda x: (-x[0], usage[x[2]], x[1]))
+            _, tstamp, user, count, callback = item
+            if count > len(self._values):
+                # keep the resources for the next request in line
+                return
+            self._requests.remove(item)
+            values = [self._values.popleft() for _ in range(count)]
+            grants = []
+            for value in values:
+                matchkey = value[-1]
+                if self._max_lease is not None:
+                    matchkey += " -timeout=%g" % self._max_lease
+                grants.append(value[1:-1] + (matchkey,))
+            if not callback(grants):
+                # the requester is gone
+                self._values.extendleft(reversed(values))
+                continue
+            for value in values:
+                value[0].pending_matchkeys.remove(value[-1])
+                self._leases[value[0]] = (user, now)
+            self._n_grants += 1
+            self._total_wait += now - tstamp
+            self._max_wait = max(self._max_wait, now - tstamp)
+
+    def put(self, value):
+        self._tick()
+        # a server reports its resource again when its session ends
+        self._end_lease(value[0])
+        self._values.append(value)
+        self._schedule()
+
+    def request(self, user, priority, callback):
+        self._requests.append([priority, time.time(), user, 1, lambda x: callback(x[0])])
+        self._schedule()
+
+    def request_batch(self, user, priority, count, callback):
+        self._requests.append([priority, time.time(), user, count, callback])
+        self._schedule()
+
+    def remove(self, value):
+        self._tick()
+        self._end_lease(value[0])
+        if value in self._values:
+            self._values.remove(value)
+        self._schedule()
+
+    def summary(self):
+        """Get summary information of the scheduler, including the waiting time
+        of the granted requests and the utilization of the resources."""
+        now = self._tick()
+        users = {}
+        for user in set(self._usage) | {x[0] for x in self._leases.values()}:
+            users[user] = {"usage": self._user_usage(user, now), "leased": 0, "pending": 0}
+        for user, _ in self._leases.values():
+            users[user]["leased"] += 1
+        for item in self._requests:
+            users.setdefault(item[2], {"usage": 0.0, "leased": 0, "pending": 0})
+            users[item[2]]["pending"] += 1
+        mean_wait = self._total_wait / self._n_grants if self._n_grants else 0.0
+        utilization = self._busy_seconds / self._device_seconds if self._device_seconds else 0.0
+        return {
+            "free": len(self._values),
+            "pending": len(self._requests),
+            "leased": len(self._leases),
+            "grants": self._n_grants,
+            "reclaimed": self._n_reclaimed,
+            "mean_wait": mean_wait,
+            "max_wait": self._max_wait,
+            "utilization": utilization,
+            "users": users,
+        }
+
+
 class TCPEventHandler(tornado_util.TCPHandler):
     """Base asynchronize message handler.
 
@@ -255,6 +436,22 @@ class TCPEventHandler(tornado_util.TCPHandler):
                 return True
 
             self._tracker.request(key, user, priority, _cb)
+        elif code == TrackerCode.REQUEST_BATCH:
+            key, user, priority, count = args[1:5]
+
+            def _batch_cb(values):
+                if not self._sock:
+                    return False
+                try:
+                    self.ret_value([TrackerCode.SUCCESS, values])
+                except (socket.error, IOError):
+                    return False
+                return True
+
+            try:
+                self._tracker.request_batch(key, user, priority, count, _batch_cb)
+            except NotImplementedError:
+                self.ret_value(TrackerCode.FAIL)
         elif code == TrackerCode.PING:
             self.ret_value(TrackerCode.SUCCESS)
         elif code == TrackerCode.GET_PENDING_MATCHKEYS:
@@ -287,8 +484,9 @@ class TCPEventHandler(tornado_util.TCPHandler):
 class TrackerServerHandler(object):
     """Tracker that tracks the resources."""
 
-    def __init__(self, sock, stop_key):
+    def __init__(self, sock, stop_key, scheduler=None):
         self._scheduler_map = {}
+        self._scheduler = scheduler or PriorityScheduler
         self._sock = sock
         self._sock.setblocking(0)
         self._ioloop = ioloop.IOLoop.current()
@@ -311,7 +509,7 @@ class TrackerServerHandler(object):
 
     def create_scheduler(self, key):
         """Create a new scheduler."""
-        return PriorityScheduler(key)
+        return self._scheduler(key)
 
     def put(self, key, value):
         """Report a new resource to the tracker."""
@@ -325,6 +523,12 @@ class TrackerServerHandler(object):
             self._scheduler_map[key] = self.create_scheduler(key)
         self._scheduler_map[key].request(user, priority, callback)
 
+    def request_batch(self, key, user, priority, count, callback):
+        """Request several resources that are granted together."""
+        if key not in self._scheduler_map:
+            self._scheduler_map[key] = self.create_scheduler(key)
+        self._scheduler_map[key].request_batch(user, priority, count, callback)
+
     def close(self, conn):
         self._connections.remove(conn)
         if "key" in conn._info:
@@ -357,8 +561,8 @@ class TrackerServerHandler(object):
         self._ioloop.start()
 
 
-def _tracker_server(listen_sock, stop_key):
-    handler = TrackerServerHandler(listen_sock, stop_key)
+def _tracker_server(listen_sock, stop_key, scheduler=None):
+    handler = TrackerServerHandler(listen_sock, stop_key, scheduler)
     handler.run()
 
 
@@ -380,9 +584,14 @@ class Tracker(object):
 
     silent: bool, optional
         Whether run in silent mode
+
+    scheduler: function: str->Scheduler, optional
+        The factory of the scheduler of every key, e.g. a Scheduler class, or a
+        functools.partial of FairShareScheduler with its options.
+        By default, PriorityScheduler.
     """
 
-    def __init__(self, host, port=9190, port_end=9199, silent=False):
+    def __init__(self, host, port=9190, port_end=9199, silent=False, scheduler=None):
         if silent:
             logger.setLevel(logging.WARN)
 
@@ -402,7 +611,9 @@ class Tracker(object):
             raise ValueError("cannot bind to any port in [%d, %d)" % (port, port_end))
         logger.info("bind to %s:%d", host, self.port)
         sock.listen(1)
-        self.proc = multiprocessing.Process(target=_tracker_server, args=(sock, self.stop_key))
+        self.proc = multiprocessing.Process(
+            target=_tracker_server, args=(sock, self.stop_key, scheduler)
+        )
         self.proc.start()
         self.host = host
         # close the socket on this process
@@ -162,9 +162,17 @@ class NDArray(NDArrayBase):
     def __str__(self):
         return str(self.asnumpy())
 
-    def asnumpy(self):
+    def asnumpy(self, copy=True):
         """Convert this array to numpy array
 
+        Parameters
+        ----------
+        copy : bool, optional
+            Whether to copy the data. If False, return a numpy array that views the memory
+            of this array, which must be a compact array on CPU. The view keeps this array
+            alive, and writes to the view change this array.
+            The array passed to a callback is only valid during the call, so is its view.
+
         Returns
         -------
         np_arr : numpy.ndarray
@@ -176,6 +184,8 @@ class NDArray(NDArrayBase):
             shape = shape + (t.lanes,)
             t.lanes = 1
             dtype = str(t)
+        if not copy:
+            return np.asarray(_NumpyView(self, shape, dtype))
         np_arr = np.empty(shape, dtype=dtype)
         assert np_arr.flags["C_CONTIGUOUS"]
         data = np_arr.ctypes.data_as(ctypes.c_void_p)
@@ -199,6 +209,83 @@ class NDArray(NDArrayBase):
         raise ValueError("Unsupported target type %s" % str(type(target)))
 
 
+# the device types whose memory is host memory, kDLCPU and kDLCPUPinned
+_HOST_DEVICE_TYPES = (1, 3)
+# the alignment of the data that the generated code assumes, kAllocAlignment
+_ALLOC_ALIGNMENT = 64
+
+
+class _NumpyView(object):
+    """Expose the memory of a CPU NDArray through the numpy array interface.
+    The numpy arrays made from it refer to it as their base, so the NDArray stays alive."""
+
+    def __init__(self, nd_arr, shape, dtype):
+        contents = nd_arr.handle.contents
+        if contents.ctx.device_type not in _HOST_DEVICE_TYPES:
+            raise ValueError("Cannot view the memory of an array on %s" % nd_arr.ctx)
+        if contents.strides:
+            expected = 1
+            for i in reversed(range(contents.ndim)):
+                if contents.shape[i] != 1 and contents.strides[i] != expected:
+                    raise ValueError("Cannot view the memory of a non-compact array")
+                expected *= contents.shape[i]
+        self._nd_arr = nd_arr
+        self.__array_interface__ = {
+            "shape": shape,
+            "typestr": np.dtype(dtype).str,
+            "data": ((contents.data or 0) + contents.byte_offset, False),
+            "version": 3,
+        }
+
+
+class _DLManagedTensor(ctypes.Structure):
+    """DLManagedTensor of DLPack, for the arrays sharing numpy memory"""
+
+
+_DLPackDeleter = ctypes.CFUNCTYPE(None, ctypes.POINTER(_DLManagedTensor))
+_DLManagedTensor._fields_ = [
+    ("dl_tensor", TVMArray),
+    ("manager_ctx", ctypes.c_void_p),
+    ("deleter", _DLPackDeleter),
+]
+
+# the numpy arrays shared by NDArrays, by the address of their DLManagedTensor
+_SHARED_NUMPY_ARRAYS = {}
+
+
+def _release_numpy_array(managed):
+    if _SHARED_NUMPY_ARRAYS is not None:
+        _SHARED_NUMPY_ARRAYS.pop(ctypes.addressof(managed.contents), None)
+
+
+_c_release_numpy_array = _DLPackDeleter(_release_numpy_array)
+
+
+def _share_numpy_array(np_arr):
+    """Create an NDArray on CPU that shares the memory of a numpy array,
+    the numpy array is kept alive until the NDArray is freed."""
+    if not np_arr.flags["C_CONTIGUOUS"] or not np_arr.flags["WRITEABLE"]:
+        raise ValueError("Cannot share a numpy array that is not contiguous and writeable")
+    if np_arr.ctypes.data % _ALLOC_ALIGNMENT:
+        raise ValueError(
+            "Cannot share a numpy array that is not aligned to %d bytes, "
+            "e.g. use the numpy view of tvm.nd.empty instead" % _ALLOC_ALIGNMENT
+        )
+    arr, shape = numpyasarray(np_arr)
+    managed = _DLManagedTensor()
+    managed.dl_tensor = arr
+    managed.deleter = _c_release_numpy_array
+    address = ctypes.addressof(managed)
+    _SHARED_NUMPY_ARRAYS[address] = (managed, shape, np_arr)
+    handle = TVMArrayHandle()
+    try:
+        check_call(_LIB.TVMArrayFromDLPack(ctypes.byref(managed), ctypes.byref(handle)))
+    except:
+        _SHARED_NUMPY_ARRAYS.pop(address)
+        raise
+    return _make_array(handle, False, False)
+
+
 def context(dev_type, dev_id=0):
     """Construct a TVM context with given device type and id.
 
@@ -495,7 +582,7 @@ cl = opencl
 mtl = metal
 
 
-def array(arr, ctx=cpu(0)):
+def array(arr, ctx=cpu(0), copy=True):
     """Create an array from source arr.
 
     Parameters
@@ -506,6 +593,11 @@ def array(arr, ctx=cpu(0)):
     ctx : TVMContext, optional
         The device context to create the array
 
+    copy : bool, optional
+        Whether to copy the data. If False, the created array shares the memory of arr,
+        which must be a contiguous, writeable numpy array aligned to 64 bytes, and ctx
+        must be a CPU. arr is kept alive as long as the created array.
+
     Returns
     -------
     ret : NDArray
@@ -513,6 +605,12 @@ def array(arr, ctx=cpu(0)):
     """
     if not isinstance(arr, (np.ndarray, NDArray)):
         arr = np.array(arr)
+    if not copy:
+        if isinstance(arr, NDArray) and arr.ctx == ctx:
+            return arr
+        if not isinstance(arr, np.ndarray) or ctx.device_type not in _HOST_DEVICE_TYPES:
+            raise ValueError("Only numpy arrays can be shared by arrays on CPU")
+        return _share_numpy_array(arr)
     return empty(arr.shape, arr.dtype, ctx).copyfrom(arr)
 
 
@@ -23,9 +23,13 @@
  */
 
 #include <tvm/auto_scheduler/measure.h>
+#include <tvm/driver/driver_api.h>
+#include <tvm/node/structural_hash.h>
 #include <tvm/runtime/registry.h>
 
 #include <algorithm>
+#include <chrono>
+#include <sstream>
 
 #include "search_policy/empty_policy.h"
 #include "search_policy/sketch_policy.h"
@@ -143,7 +147,7 @@ Array<MeasureResult> LocalRunnerNode::Run(const Array<MeasureInput>& inputs,
   if (const auto* f = runtime::Registry::Get("auto_scheduler.local_runner.run")) {
     Array<MeasureResult> results =
         (*f)(inputs, build_results, timeout, number, repeat, min_repeat_ms, cooldown_interval,
-             enable_cpu_cache_flush, verbose);
+             enable_cpu_cache_flush, verbose, GetRef<LocalRunner>(this));
     return results;
   }
   LOG(FATAL) << "auto_scheduler.local_runner.run is not registered. "
@@ -176,7 +180,8 @@ Array<MeasureResult> RPCRunnerNode::Run(const Array<MeasureInput>& inputs,
   if (const auto* f = runtime::Registry::Get("auto_scheduler.rpc_runner.run")) {
     Array<MeasureResult> results =
         (*f)(inputs, build_results, key, host, port, priority, n_parallel, timeout, number, repeat,
-             min_repeat_ms, cooldown_interval, enable_cpu_cache_flush, verbose);
+             min_repeat_ms, cooldown_interval, enable_cpu_cache_flush, verbose,
+             GetRef<RPCRunner>(this));
     return results;
   } else {
     LOG(FATAL) << "auto_scheduler.rpc_runner.run is not registered. "
@@ -208,7 +213,7 @@ void PythonBasedMeasureCallbackNode::Callback(const SearchPolicy& policy,
 /********** ProgramMeasurer **********/
 ProgramMeasurer::ProgramMeasurer(ProgramBuilder builder, ProgramRunner runner,
                                  Optional<Array<MeasureCallback>> callbacks, int verbose,
-                                 int max_continuous_error) {
+                                 int max_continuous_error, bool cache_results) {
   auto node = make_object<ProgramMeasurerNode>();
   node->builder = std::move(builder);
   node->runner = std::move(runner);
@@ -217,6 +222,8 @@ ProgramMeasurer::ProgramMeasurer(ProgramBuilder builder, ProgramRunner runner,
   node->max_continuous_error = max_continuous_error < 0
                                    ? ProgramMeasurerNode::DEFAULT_MAX_CONTINUOUS_ERROR
                                    : max_continuous_error;
+  node->cache_results = cache_results;
+  node->cache_query_ct = node->cache_hit_ct = 0;
   data_ = std::move(node);
 }
 
@@ -228,6 +235,37 @@ void ProgramMeasurerNode::Reset() {
   has_valid.clear();
 }
 
+std::string ProgramMeasurerNode::GetProgramKey(const MeasureInput& input) {
+  const SearchTask& task = input->task;
+  try {
+    te::Schedule sch;
+    Array<te::Tensor> tensors;
+    std::tie(sch, tensors) = task->compute_dag.ApplySteps(input->state->transform_steps, nullptr,
+                                                          nullptr, task->layout_rewrite_option);
+    IRModule mod = lower(sch, tensors, "main", std::unordered_map<te::Tensor, tir::Buffer>());
+    std::ostringstream key;
+    key << StructuralHash()(mod) << "/" << task->target->str() << "/"
+        << (task->target_host.defined() ? task->target_host->str() : "");
+    return key.str();
+  } catch (dmlc::Error& e) {
+    return "";
+  }
+}
+
+void ProgramMeasurerNode::AddToResultCache(const Array<MeasureInput>& inputs,
+                                           const Array<MeasureResult>& results) {
+  ICHECK_EQ(inputs.size(), results.size());
+  for (size_t i = 0; i < inputs.size(); ++i) {
+    if (results[i]->error_no != static_cast<int>(MeasureErrorNO::kNoError)) {
+      continue;
+    }
+    std::string key = GetProgramKey(inputs[i]);
+    if (!key.empty()) {
+      result_cache[key] = results[i];
+    }
+  }
+}
+
 Array<MeasureResult> ProgramMeasurerNode::Measure(const SearchTask& task,
                                                   const SearchPolicy& policy,
                                                   const Array<MeasureInput>& inputs,
@@ -314,13 +352,68 @@ void ProgramMeasurerNode::SilentMeasure(const SearchTask& task, const Array<Meas
   results->clear();
   results->reserve(inputs.size());
 
-  // Call builder and runner
-  Array<BuildResult> build_res_batch = builder->Build(inputs, verbose);
-  Array<MeasureResult> result_batch = runner->Run(inputs, build_res_batch, verbose);
+  if (!cache_results) {
+    // Call builder and runner
+    Array<BuildResult> build_res_batch = builder->Build(inputs, verbose);
+    Array<MeasureResult> result_batch = runner->Run(inputs, build_res_batch, verbose);
 
-  // Store result batch
-  for (auto& res : result_batch) {
-    results->push_back(res);
+    // Store result batch
+    for (auto& res : result_batch) {
+      results->push_back(res);
+    }
+    return;
+  }
+
+  // Only build and run the programs that are neither in the result cache nor duplicates of
+  // another program of this batch
+  std::vector<std::string> keys;
+  std::vector<int> new_index(inputs.size(), -1);  // the index of the program in new_inputs
+  std::vector<bool> is_new(inputs.size(), false);
+  std::unordered_map<std::string, int> key_to_new_index;
+  Array<MeasureInput> new_inputs;
+  for (size_t i = 0; i < inputs.size(); ++i) {
+    keys.push_back(GetProgramKey(inputs[i]));
+    const std::string& key = keys.back();
+    if (!key.empty()) {
+      cache_query_ct++;
+      auto it = key_to_new_index.find(key);
+      if (it != key_to_new_index.end()) {
+        new_index[i] = it->second;
+        continue;
+      }
+      if (result_cache.count(key)) {
+        continue;
+      }
+      key_to_new_index[key] = new_inputs.size();
+    }
+    new_index[i] = new_inputs.size();
+    is_new[i] = true;
+    new_inputs.push_back(inputs[i]);
+  }
+
+  Array<MeasureResult> new_results;
+  if (!new_inputs.empty()) {
+    Array<BuildResult> build_res_batch = builder->Build(new_inputs, verbose);
+    new_results = runner->Run(new_inputs, build_res_batch, verbose);
+  }
+
+  double timestamp = static_cast<double>(std::chrono::duration_cast<std::chrono::seconds>(
+                                             std::chrono::system_clock::now().time_since_epoch())
+                                             .count());
+  for (size_t i = 0; i < inputs.size(); ++i) {
+    if (is_new[i]) {
+      const MeasureResult& res = new_results[new_index[i]];
+      if (!keys[i].empty() && res->error_no == static_cast<int>(MeasureErrorNO::kNoError)) {
+        result_cache[keys[i]] = res;
+      }
+      results->push_back(res);
+    } else {
+      // the same program is measured before or in this batch, nothing is spent on it
+      cache_hit_ct++;
+      const MeasureResult& res =
+          new_index[i] >= 0 ? new_results[new_index[i]] : result_cache.at(keys[i]);
+      results->push_back(MeasureResult(res->costs, res->error_no, res->error_msg, 0, timestamp));
+    }
   }
 }
 
@@ -387,10 +480,38 @@ TVM_REGISTER_GLOBAL("auto_scheduler.PythonBasedMeasureCallback")
       return PythonBasedMeasureCallback(callback_func);
     });
 
+TVM_REGISTER_GLOBAL("auto_scheduler.MeasureCallbackCallback")
+    .set_body_typed([](MeasureCallback callback, SearchPolicy policy,
+                       const Array<MeasureInput>& inputs, const Array<MeasureResult>& results) {
+      callback->Callback(policy, inputs, results);
+    });
+
 TVM_REGISTER_GLOBAL("auto_scheduler.ProgramMeasurer")
     .set_body_typed([](ProgramBuilder builder, ProgramRunner runner,
-                       Array<MeasureCallback> callbacks, int verbose, int max_continuous_error) {
-      return ProgramMeasurer(builder, runner, callbacks, verbose, max_continuous_error);
+                       Array<MeasureCallback> callbacks, int verbose, int max_continuous_error,
+                       bool cache_results) {
+      return ProgramMeasurer(builder, runner, callbacks, verbose, max_continuous_error,
+                             cache_results);
+    });
+
+TVM_REGISTER_GLOBAL("auto_scheduler.ProgramMeasurerAddToResultCache")
+    .set_body_typed([](ProgramMeasurer measurer, const Array<MeasureInput>& inputs,
+                       const Array<MeasureResult>& results) {
+      measurer->AddToResultCache(inputs, results);
+    });
+
+TVM_REGISTER_GLOBAL("auto_scheduler.ProgramMeasurerSilentMeasure")
+    .set_body_typed([](ProgramMeasurer measurer, const SearchTask& task,
+                       const Array<MeasureInput>& inputs) {
+      Array<MeasureResult> results;
+      measurer->SilentMeasure(task, inputs, &results);
+      return results;
+    });
+
+TVM_REGISTER_GLOBAL("auto_scheduler.ProgramMeasurerResultCacheStats")
+    .set_body_typed([](ProgramMeasurer measurer) {
+      return Array<Integer>{measurer->cache_query_ct, measurer->cache_hit_ct,
+                            static_cast<int>(measurer->result_cache.size())};
     });
 
 TVM_REGISTER_GLOBAL("auto_scheduler.ProgramBuilderBuild")
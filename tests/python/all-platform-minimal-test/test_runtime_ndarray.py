@@ -19,6 +19,7 @@
 import tvm
 from tvm import te
 import numpy as np
+import pytest
 import tvm.testing
 
 
@@ -39,6 +40,38 @@ def test_nd_create():
         ctx.sync()
 
 
+@tvm.testing.requires_llvm
+def test_nd_zero_copy():
+    x = tvm.nd.empty((3, 4), "float32")
+    view = x.asnumpy(copy=False)
+    view[:] = np.arange(12).reshape(3, 4)
+    np.testing.assert_equal(x.asnumpy(), view)
+
+    # the view keeps the array alive
+    del x
+    np.testing.assert_equal(view, np.arange(12).reshape(3, 4))
+
+    # the array keeps the numpy array alive
+    y = tvm.nd.array(view, copy=False)
+    y_view = y.asnumpy(copy=False)
+    assert y_view.ctypes.data == view.ctypes.data
+    del view
+    np.testing.assert_equal(y.asnumpy(), np.arange(12).reshape(3, 4))
+
+    A = te.placeholder((12,), name="A")
+    B = te.compute(A.shape, lambda i: A[i] + 1.0, name="B")
+    func = tvm.build(te.create_schedule(B.op), [A, B], "llvm")
+    a = tvm.nd.empty((12,), "float32").asnumpy(copy=False)
+    b = tvm.nd.empty((12,), "float32").asnumpy(copy=False)
+    a[:] = np.arange(12)
+    func(tvm.nd.array(a, copy=False), tvm.nd.array(b, copy=False))
+    np.testing.assert_equal(b, a + 1)
+
+    # misaligned numpy arrays are not shared
+    with pytest.raises(ValueError):
+        tvm.nd.array(a[1:], copy=False)
+
+
 def test_fp16_conversion():
     n = 100
 
@@ -67,5 +100,6 @@ def test_dtype():
 
 if __name__ == "__main__":
     test_nd_create()
+    test_nd_zero_copy()
     test_fp16_conversion()
     test_dtype()
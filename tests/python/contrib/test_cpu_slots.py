@@ -0,0 +1,69 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Test CPUSlotExecutor."""
+import os
+import pytest
+from tvm.contrib.cpu_slots import (
+    CPUSlotExecutor,
+    _parse_cpu_list,
+    available_cpus,
+    partition_cpus,
+)
+
+
+def test_partition_cpus():
+    assert _parse_cpu_list("0-3,8,10-11\n") == [0, 1, 2, 3, 8, 10, 11]
+
+    cpus = available_cpus()
+    cpu_sets = partition_cpus(cpus=cpus)
+    assert len(cpu_sets) >= 1
+    assert all(len(x) == 1 for x in cpu_sets)
+    flatten = [x for cpu_set in cpu_sets for x in cpu_set]
+    assert len(flatten) == len(set(flatten))
+    assert set(flatten).issubset(cpus)
+
+    assert partition_cpus(n_slots=1, cpus=cpus) == cpu_sets[:1]
+    with pytest.raises(ValueError):
+        partition_cpus(n_slots=len(cpus) + 1, cpus=cpus)
+
+
+@pytest.mark.skipif(not hasattr(os, "sched_setaffinity"), reason="needs sched_setaffinity")
+def test_cpu_slot_executor():
+    cpu_sets = partition_cpus(n_slots=min(2, len(partition_cpus())))
+    executor = CPUSlotExecutor(cpu_sets, timeout=60)
+    assert len(executor) == len(cpu_sets)
+
+    # every job runs pinned to the CPU set of its slot
+    futures = [executor.submit(os.sched_getaffinity, 0) for _ in range(4)]
+    for future in futures:
+        slot, cpus = future.result()
+        assert sorted(cpus) == cpu_sets[slot]
+    slot, num_threads = executor.submit(os.getenv, "TVM_NUM_THREADS").result()
+    assert num_threads == str(len(cpu_sets[slot]))
+
+    executor.record(0, [1.0, 1.1, 0.9])
+    executor.record(0, None)
+    stats = executor.slot_stats()
+    assert stats[0]["n_runs"] == 1
+    assert stats[0]["n_errors"] == 1
+    assert stats[0]["mean_cv"] > 0
+    assert len(executor.text_summary().split("\n")) == len(cpu_sets) + 1
+
+
+if __name__ == "__main__":
+    test_partition_cpus()
+    test_cpu_slot_executor()
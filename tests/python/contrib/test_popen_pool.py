@@ -15,6 +15,7 @@
 # specific language governing permissions and limitations
 # under the License.
 """Test PopenPoolExecutor."""
+import os
 import pytest
 import time
 from tvm.contrib.popen_pool import PopenWorker, PopenPoolExecutor
@@ -66,6 +67,54 @@ def test_popen_pool_executor():
         assert val.value == idx
 
 
+def test_popen_worker_recycle():
+    proc = PopenWorker(maximum_uses=2)
+    pids = []
+    for _ in range(4):
+        proc.send(os.getpid)
+        pids.append(proc.recv())
+    assert pids[0] == pids[1]
+    assert pids[2] == pids[3]
+    assert pids[1] != pids[2]
+
+    # a worker that grows beyond the limit is restarted after the task
+    proc = PopenWorker(max_rss_bytes=1)
+    proc.send(os.getpid)
+    pid = proc.recv()
+    proc.send(os.getpid)
+    assert proc.recv() != pid
+
+
+def test_popen_pool_executor_initializer():
+    pool = PopenPoolExecutor(
+        max_workers=2,
+        timeout=0.01,
+        initializer=lambda key, value: os.environ.update({key: value}),
+        initargs=("TVM_TEST_POPEN_INIT", "1"),
+        maximum_process_uses=3,
+    )
+    values = [pool.submit(lambda: os.environ.get("TVM_TEST_POPEN_INIT")) for _ in range(8)]
+    assert all(value.result() == "1" for value in values)
+
+    # the respawned worker after a timeout runs the initializer again
+    with pytest.raises(TimeoutError):
+        pool.submit(identity_after, 1, 100).result()
+    assert pool.submit(lambda: os.environ.get("TVM_TEST_POPEN_INIT")).result() == "1"
+
+
+def test_popen_pool_executor_kill_workers():
+    pool = PopenPoolExecutor(max_workers=1)
+    pid = pool.submit(os.getpid).result()
+    assert pool.submit(os.getpid).result() == pid
+
+    # the pool stays usable with new workers
+    pool.kill_workers()
+    assert pool.submit(os.getpid).result() != pid
+
+
 if __name__ == "__main__":
     test_popen_worker()
     test_popen_pool_executor()
+    test_popen_worker_recycle()
+    test_popen_pool_executor_initializer()
+    test_popen_pool_executor_kill_workers()
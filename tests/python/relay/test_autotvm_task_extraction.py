@@ -102,5 +102,20 @@ def test_task_extraction():
     assert len(tasks) == 31
 
 
+def test_task_extraction_weights():
+    target = "llvm"
+    conv2d = relay.op.get("nn.conv2d")
+
+    mod, params, _ = get_network("resnet-18", batch_size=1)
+    tasks, weights = autotvm.task.extract_from_program(
+        mod, target=target, params=params, ops=(conv2d,), return_weights=True
+    )
+    assert len(tasks) == len(weights) == 12
+    assert all(weight >= 1 for weight in weights)
+    # several residual blocks share the same conv2d workload
+    assert sum(weights) > len(tasks)
+
+
 if __name__ == "__main__":
     test_task_extraction()
+    test_task_extraction_weights()
@@ -22,6 +22,7 @@ import tempfile
 import numpy as np
 
 import tvm
+import tvm.testing
 from tvm import auto_scheduler
 
 from test_auto_scheduler_common import matmul_auto_scheduler_test
@@ -78,6 +79,70 @@ def test_xgb_model():
         model.load(fp.name)
 
 
+def test_xgb_model_incremental():
+    task, inputs, results = get_sample_records(60)
+
+    model = auto_scheduler.XGBModel(
+        num_warmup_sample=-1, incremental_training=True, full_refit_interval=2
+    )
+    model.update(inputs[:20], results[:20])
+    assert model.num_incremental_updates == 0
+    n_trees = len(model.bst.get_dump())
+
+    # the next updates boost the current model on the new records only
+    model.update(inputs[20:40], results[20:40])
+    assert model.num_incremental_updates == 1
+    assert len(model.bst.get_dump()) > n_trees
+    assert len(model.inputs_feature_cache) == 40
+    model.update(inputs[40:50], results[40:50])
+    assert model.num_incremental_updates == 2
+
+    # then a new model is trained on all records
+    model.update(inputs[50:], results[50:])
+    assert model.num_incremental_updates == 0
+    preds = model.predict(task, [x.state for x in inputs])
+    assert len(preds) == len(inputs)
+
+
+def test_mlp_model():
+    task, inputs, results = get_sample_records(50)
+    states = [x.state for x in inputs]
+    costs = [np.mean([x.value for x in res.costs]) for res in results]
+    throughputs = np.min(costs) / costs
+
+    for hidden_size in [64, 0]:
+        model = auto_scheduler.MLPModel(hidden_size=hidden_size, n_epochs=200, num_warmup_sample=-1)
+        model.update(inputs[:30], results[:30])
+        # online update on new records
+        model.update(inputs[30:], results[30:])
+        preds = model.predict(task, states)
+        assert len(preds) == len(inputs)
+
+        # test regression quality
+        rmse = np.sqrt(np.mean(np.square(preds - throughputs)))
+        assert rmse <= 0.3
+
+        # the stage scores sum up to the scores of the states
+        breakdown = model.predict_stages(task, states)
+        offset = len(states)
+        for pred in preds:
+            n_stages = int(breakdown[offset])
+            tvm.testing.assert_allclose(
+                np.sum(breakdown[offset + 1 : offset + 1 + n_stages]), pred, rtol=1e-4
+            )
+            offset += n_stages + 1
+        assert offset == len(breakdown)
+
+        # test model serialization
+        with tempfile.NamedTemporaryFile() as fp:
+            model.save(fp.name)
+            new_model = auto_scheduler.MLPModel()
+            new_model.load(fp.name)
+            tvm.testing.assert_allclose(new_model.predict(task, states), preds, rtol=1e-5)
+
+
 if __name__ == "__main__":
     test_random_model()
     test_xgb_model()
+    test_xgb_model_incremental()
+    test_mlp_model()
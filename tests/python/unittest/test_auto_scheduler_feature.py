@@ -18,8 +18,11 @@
 """Test feature extraction"""
 
 import math
+import struct
 import tempfile
 
+import numpy as np
+
 import tvm
 from tvm import te, auto_scheduler
 
@@ -200,7 +203,43 @@ def test_gpu_feature():
         assert fequal(fea_dicts[0]["is_gpu"], 1.0)
 
 
+def test_unpack_feature_csr():
+    vec_len = auto_scheduler.feature.DEFAULT_FEATURE_VEC_LEN
+    # three programs with 2 stages, 0 stage (failed to lower) and 1 stage
+    stages = [np.random.rand(2, vec_len), None, np.random.rand(1, vec_len)]
+    sizes = [0 if x is None else x.size + 1 for x in stages]
+    byte_arr = bytearray(struct.pack("%di" % (len(stages) + 3), len(stages), *sizes, 3, 3))
+    for x in stages:
+        if x is not None:
+            byte_arr += struct.pack("%df" % (x.size + 1), len(x), *x.flatten())
+    byte_arr += struct.pack("3f", 0.5, 1.0, 0.25)
+    byte_arr += struct.pack("3i", 0, 1, 0)
+
+    features, throughputs, task_ids = auto_scheduler.feature.unpack_feature_csr(byte_arr)
+    assert features.data.dtype == np.float32 and features.data.shape == (4, vec_len)
+    np.testing.assert_equal(features.offsets, [0, 2, 3, 4])
+    np.testing.assert_equal(features.pack_ids(), [0, 0, 1, 2])
+    np.testing.assert_equal(features.invalid_mask(), [False, True, False])
+    np.testing.assert_allclose(features[0], stages[0], rtol=1e-6)
+    np.testing.assert_equal(features[1], np.zeros((1, vec_len)))
+    np.testing.assert_allclose(throughputs, [0.5, 1.0, 0.25])
+    np.testing.assert_equal(task_ids, [0, 1, 0])
+
+    # the legacy format holds the same values
+    legacy = auto_scheduler.feature.unpack_feature(byte_arr)[0]
+    for x, y in zip(legacy, features):
+        np.testing.assert_equal(x, y)
+
+    selected = features.take([2, 0])
+    np.testing.assert_equal(selected.offsets, [0, 1, 3])
+    np.testing.assert_equal(selected[1], features[0])
+    merged = auto_scheduler.feature.CSRFeatures.concatenate([selected, features[1:2]])
+    np.testing.assert_equal(merged.offsets, [0, 1, 3, 4])
+    np.testing.assert_equal(merged.invalid_mask(), [False, False, True])
+
+
 if __name__ == "__main__":
     test_cpu_matmul()
     test_cpu_fusion()
     test_gpu_feature()
+    test_unpack_feature_csr()
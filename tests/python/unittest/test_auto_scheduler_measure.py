@@ -17,6 +17,8 @@
 
 """ Test measurement and log serialization. """
 import json
+import os
+import time
 
 import multiprocessing
 import tvm
@@ -234,6 +236,96 @@ def test_workload_dis_factor():
     assert calc(decode(target_wkl_key), decode(wkl_key)) == float("inf")
 
 
+def test_apply_history_best_compatible():
+    target = tvm.target.Target("llvm")
+    best = auto_scheduler.ApplyHistoryBest([], include_compatible=True)
+
+    def add_record(args, state, cost):
+        workload_key = json.dumps(["func1"] + args)
+        entry, _, workload_args = best.get_workload_entry(
+            best.best_by_targetkey, "cpu", workload_key
+        )
+        entry[workload_args] = (state, cost)
+
+    add_record([[1, 3, 224, 224], [0, 0], "float32"], "batch1", 1.0)
+    add_record([[2, 3, 224, 224], [0, 0], "float32"], "batch2", 1.5)
+    add_record([[4, 3, 224, 224], [0, 0], "float32"], "batch4", 1.4)
+    add_record([[8, 3, 224, 224], [0, 0], "int8"], "int8", 0.1)
+    add_record([[8, 3, 224, 224], [1, 1], "float32"], "padded", 0.1)
+
+    def query(args):
+        return best._query_inside(target, json.dumps(["func1"] + args))
+
+    # Exact match
+    assert query([[2, 3, 224, 224], [0, 0], "float32"]) == "batch2"
+
+    # Compatible match with the lowest scaled cost: 1.4 * 2 < 1.5 * 4 < 1.0 * 8
+    assert query([[8, 3, 224, 224], [0, 0], "float32"]) == "batch4"
+    assert query([[6, 3, 224, 224], [0, 0], "float32"]) == "batch2"
+    assert query([[8, 3, 224, 224], [0, 0], "int16"]) is None
+    assert query([[8, 3, 112, 224], [0, 0], "float32"]) is None
+
+    # Memoized queries are dropped by update
+    workload_key = json.dumps(["func1", [8, 3, 224, 224], [0, 0], "float32"])
+    best.update(target, workload_key, "user")
+    assert best._query_inside(target, workload_key) == "user"
+
+    best.include_compatible = False
+    best._invalidate()
+    assert query([[6, 3, 224, 224], [0, 0], "float32"]) is None
+
+
+def test_parallel_best_record_and_distill():
+    tasks = [
+        auto_scheduler.SearchTask(func=matmul_auto_scheduler_test, args=(n, n, n), target="llvm")
+        for n in (128, 256)
+    ]
+    costs = [[0.5, 0.3, 0.4, 0.3], [0.2, 0.6, 0.1, 0.7]]
+    inputs, results = [], []
+    for _ in range(4):
+        for task, task_costs in zip(tasks, costs):
+            inputs.append(auto_scheduler.measure.MeasureInput(task, task.compute_dag.init_state))
+            results.append(auto_scheduler.measure.MeasureResult([task_costs[0]], 0, "", 0.2, 1))
+            task_costs.append(task_costs.pop(0))
+    # a failed record is never the best
+    inputs.append(auto_scheduler.measure.MeasureInput(tasks[0], tasks[0].compute_dag.init_state))
+    results.append(auto_scheduler.measure.MeasureResult([0.01], 2, "", 0.2, 1))
+
+    min_range_bytes = auto_scheduler.measure_record._MIN_RANGE_BYTES
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        log_file = tmp_dir + "/log.json"
+        auto_scheduler.save_records(log_file, inputs, results)
+
+        ranges = auto_scheduler.measure_record._split_byte_ranges(log_file, 4)
+        assert len(ranges) == 4
+        assert ranges[0][0] == 0 and ranges[-1][1] == os.path.getsize(log_file)
+        assert all(x[1] == y[0] for x, y in zip(ranges[:-1], ranges[1:]))
+
+        try:
+            # split the small log into ranges handled by worker processes
+            auto_scheduler.measure_record._MIN_RANGE_BYTES = 1
+            for n_parallel in [1, 3]:
+                _, res = auto_scheduler.load_best_record(
+                    log_file, tasks[1].workload_key, n_parallel=n_parallel
+                )
+                assert res.costs[0].value == 0.1
+                _, res = auto_scheduler.load_best_record(log_file, n_parallel=n_parallel)
+                assert res.costs[0].value == 0.1
+
+                out_file = tmp_dir + "/best_%d.json" % n_parallel
+                auto_scheduler.measure_record.distill_record_file(log_file, out_file, n_parallel)
+                _, best_results = auto_scheduler.RecordReader(out_file).read_lines()
+                assert sorted(x.costs[0].value for x in best_results) == [0.1, 0.3]
+
+            # the existing records of the output file are merged
+            auto_scheduler.save_records(out_file, inputs[1:2], results[1:2])
+            auto_scheduler.measure_record.distill_record_file(log_file, out_file, 3)
+            _, best_results = auto_scheduler.RecordReader(out_file).read_lines()
+            assert sorted(x.costs[0].value for x in best_results) == [0.1, 0.3]
+        finally:
+            auto_scheduler.measure_record._MIN_RANGE_BYTES = min_range_bytes
+
+
 def test_measure_local_builder_runner():
     if not tvm.testing.device_enabled("llvm"):
         return
@@ -255,6 +347,170 @@ def test_measure_local_builder_runner():
         assert mress[0].error_no == 0
 
 
+def test_measure_local_builder_persistent_pool():
+    if not tvm.testing.device_enabled("llvm"):
+        return
+
+    task = auto_scheduler.SearchTask(
+        func=matmul_auto_scheduler_test, args=(128, 128, 128), target="llvm"
+    )
+    minp = auto_scheduler.MeasureInput(task, task.compute_dag.init_state)
+
+    # The workers are kept across builds
+    local_builder = auto_scheduler.LocalBuilder(timeout=60, n_parallel=2)
+    bress = local_builder.build([minp, minp])
+    assert all(res.error_no == 0 for res in bress)
+    pool = auto_scheduler.measure.LocalBuildPool.pool
+    bress = local_builder.build([minp])
+    assert bress[0].error_no == 0
+    assert auto_scheduler.measure.LocalBuildPool.pool is pool
+
+    # A hanging build is killed, and the worker is restarted for the next build
+    def slow_build(*args, **kwargs):
+        time.sleep(10)
+
+    slow_build.output_format = "so"
+    slow_builder = auto_scheduler.LocalBuilder(timeout=1, n_parallel=1, build_func=slow_build)
+    bress = slow_builder.build([minp, minp])
+    assert all(res.error_no == auto_scheduler.measure.MeasureErrorNo.BUILD_TIMEOUT for res in bress)
+
+
+def test_measure_local_runner_cpu_slots():
+    if not tvm.testing.device_enabled("llvm"):
+        return
+
+    task = auto_scheduler.SearchTask(
+        func=matmul_auto_scheduler_test, args=(128, 128, 128), target="llvm"
+    )
+    minp = auto_scheduler.MeasureInput(task, task.compute_dag.init_state)
+    local_builder = auto_scheduler.LocalBuilder()
+    slot_runner = auto_scheduler.LocalRunner(timeout=60, cpu_slots=1)
+    # A runner created later, e.g. the default one of TuningOptions, keeps its own executor
+    plain_runner = auto_scheduler.LocalRunner(timeout=60)
+
+    mress = slot_runner.run([minp, minp], local_builder.build([minp, minp]))
+    assert all(res.error_no == 0 for res in mress)
+    assert sum(x["n_runs"] for x in slot_runner.slot_stats()) == 2
+
+    mress = plain_runner.run([minp], local_builder.build([minp]))
+    assert mress[0].error_no == 0
+    assert plain_runner.slot_stats() == []
+    assert sum(x["n_runs"] for x in slot_runner.slot_stats()) == 2
+
+    # Closing the runner kills its pinned workers and forgets its executor
+    executor = auto_scheduler.measure.LocalRunSlots.get(slot_runner)
+    with slot_runner:
+        pass
+    assert auto_scheduler.measure.LocalRunSlots.get(slot_runner) is None
+    assert all(worker._proc is None for worker in executor._workers)
+    assert slot_runner.slot_stats() == []
+
+
+def test_measure_local_runner_early_abort():
+    if not tvm.testing.device_enabled("llvm"):
+        return
+
+    task = auto_scheduler.SearchTask(
+        func=matmul_auto_scheduler_test, args=(128, 128, 128), target="llvm"
+    )
+    minp = auto_scheduler.MeasureInput(task, task.compute_dag.init_state)
+    local_builder = auto_scheduler.LocalBuilder()
+    local_runner = auto_scheduler.LocalRunner(timeout=60, repeat=3, early_abort_ratio=1.0)
+    run_cutoff = auto_scheduler.measure.RunCutoff.of(local_runner)
+
+    # The first program is timed fully and sets the cutoff of the task
+    mress = local_runner.run([minp], local_builder.build([minp]))
+    assert mress[0].error_no == 0 and len(mress[0].costs) == 3
+    assert mress[0].error_msg != auto_scheduler.measure.CENSORED_MSG
+
+    # A ratio below 1 would censor programs faster than the best
+    try:
+        auto_scheduler.LocalRunner(timeout=60, early_abort_ratio=0.5)
+        assert False, "a ratio below 1 should be rejected"
+    except ValueError:
+        pass
+
+    # The same program is slower than a tiny best cost, so it is censored
+    run_cutoff.update(minp, ([1e-12], auto_scheduler.measure.MeasureErrorNo.NO_ERROR, ""))
+    mress = local_runner.run([minp], local_builder.build([minp]))
+    assert mress[0].error_no == 0 and len(mress[0].costs) == 1
+    assert mress[0].error_msg == auto_scheduler.measure.CENSORED_MSG
+    assert run_cutoff.n_censored == 1
+
+    # The state belongs to the runner, a new runner times the program fully
+    other_runner = auto_scheduler.LocalRunner(timeout=60, repeat=3, early_abort_ratio=1.0)
+    mress = other_runner.run([minp], local_builder.build([minp]))
+    assert mress[0].error_no == 0 and len(mress[0].costs) == 3
+    assert auto_scheduler.measure.RunCutoff.of(local_runner) is run_cutoff
+
+
+def test_measure_result_cache():
+    if not tvm.testing.device_enabled("llvm"):
+        return
+
+    dag, tiled_state = get_tiled_matmul()
+    task = auto_scheduler.SearchTask(compute_dag=dag, workload_key="test", target="llvm")
+    state = dag.get_init_state()
+    inputs = [
+        auto_scheduler.MeasureInput(task, state),
+        auto_scheduler.MeasureInput(task, state),
+        auto_scheduler.MeasureInput(task, tiled_state),
+    ]
+    results = [auto_scheduler.MeasureResult([0.1], 0, "", 0.2, 1) for _ in inputs]
+
+    # The same program is cached once, failed results are not cached
+    measurer = auto_scheduler.measure.ProgramMeasurer(
+        auto_scheduler.LocalBuilder(), auto_scheduler.LocalRunner(), [], 0, cache_results=True
+    )
+    measurer.add_to_result_cache(inputs[:2], results[:2])
+    assert measurer.result_cache_stats()["size"] == 1
+    failed = auto_scheduler.MeasureResult([1e10], 4, "", 0.2, 1)
+    measurer.add_to_result_cache(inputs[2:], [failed])
+    assert measurer.result_cache_stats()["size"] == 1
+
+    # A duplicate program is built and run once, its copied result spends nothing
+    task = auto_scheduler.SearchTask(
+        func=matmul_auto_scheduler_test, args=(64, 64, 64), target="llvm"
+    )
+    minp = auto_scheduler.MeasureInput(task, task.compute_dag.init_state)
+    measurer = auto_scheduler.measure.ProgramMeasurer(
+        auto_scheduler.LocalBuilder(), auto_scheduler.LocalRunner(), [], 0, cache_results=True
+    )
+    mress = measurer.measure(task, [minp, minp])
+    assert [res.error_no for res in mress] == [0, 0]
+    stats = measurer.result_cache_stats()
+    assert stats["queries"] == 2 and stats["hits"] == 1 and stats["size"] == 1
+    assert mress[0].all_cost > 0 and mress[1].all_cost == 0
+    assert [x.value for x in mress[1].costs] == [x.value for x in mress[0].costs]
+
+    # and a later measurement of it is a hit of the cache
+    mress = measurer.measure(task, [minp])
+    assert mress[0].error_no == 0 and mress[0].all_cost == 0
+    assert measurer.result_cache_stats()["hits"] == 2
+
+    # The records of a previous tuning are not measured again
+    with tempfile.NamedTemporaryFile() as fp:
+        log_file = fp.name
+        tune_option = auto_scheduler.TuningOptions(
+            num_measure_trials=4,
+            num_measures_per_round=2,
+            measure_callbacks=[auto_scheduler.RecordToFile(log_file)],
+        )
+        task_scheduler = auto_scheduler.TaskScheduler([task], cache_measure_results=True)
+        task_scheduler.tune(tune_option, search_policy="sketch.random")
+        stats = task_scheduler.measurer.result_cache_stats()
+        assert 0 < stats["queries"] <= 4
+        n_valid = sum(res.error_no == 0 for _, res in auto_scheduler.load_records(log_file))
+        assert stats["size"] <= n_valid
+
+        task_scheduler = auto_scheduler.TaskScheduler(
+            [task], load_log_file=log_file, cache_measure_results=True
+        )
+        tune_option = auto_scheduler.TuningOptions(num_measure_trials=2, num_measures_per_round=2)
+        task_scheduler.tune(tune_option, search_policy="sketch.random")
+        assert task_scheduler.measurer.result_cache_stats()["size"] >= stats["size"]
+
+
 def test_measure_local_builder_rpc_runner():
     if not tvm.testing.device_enabled("llvm"):
         return
@@ -324,6 +580,12 @@ if __name__ == "__main__":
     test_record_pragma_storage_align_rfactor()
     test_recover_measure_input()
     test_workload_dis_factor()
+    test_apply_history_best_compatible()
+    test_parallel_best_record_and_distill()
     test_measure_local_builder_runner()
+    test_measure_local_builder_persistent_pool()
+    test_measure_local_runner_cpu_slots()
+    test_measure_local_runner_early_abort()
+    test_measure_result_cache()
     test_measure_local_builder_rpc_runner()
     test_measure_target_host()
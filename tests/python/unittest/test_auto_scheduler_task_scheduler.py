@@ -137,7 +137,60 @@ def test_task_scheduler_gradient():
         del measure_ctx
 
 
+@tvm.testing.requires_llvm
+def test_distributed_task_scheduler():
+    tasks = []
+    for n in [2, 4, 8]:
+        tasks.append(
+            auto_scheduler.SearchTask(
+                func=matmul_auto_scheduler_test, args=(n, n, n), target="llvm"
+            )
+        )
+
+    with tempfile.NamedTemporaryFile() as fp:
+        log_file = fp.name
+        num_trials_per_task = 2
+
+        # Tune all tasks on two local workers
+        tune_option = auto_scheduler.TuningOptions(
+            num_measure_trials=num_trials_per_task * len(tasks),
+            num_measures_per_round=1,
+            measure_callbacks=[auto_scheduler.RecordToFile(log_file)],
+        )
+        task_scheduler = auto_scheduler.DistributedTaskScheduler(
+            tasks, n_local_workers=2, strategy="round-robin"
+        )
+        task_scheduler.tune(tune_option, search_policy="sketch.random")
+
+        # The records of the workers are logged by the coordinator
+        counters = {task.workload_key: 0 for task in tasks}
+        for inp, _ in auto_scheduler.load_records(log_file):
+            counters[inp.task.workload_key] += 1
+        # the split among the tasks depends on the order the rounds finish in,
+        # but every task is tuned in the warm-up
+        for task in tasks:
+            assert counters[task.workload_key] >= 1
+        assert sum(counters.values()) == num_trials_per_task * len(tasks)
+        assert task_scheduler.ct == num_trials_per_task * len(tasks)
+
+        # test continuous tuning (restoring the status)
+        task_scheduler = auto_scheduler.DistributedTaskScheduler(
+            tasks, n_local_workers=2, strategy="round-robin", load_log_file=log_file
+        )
+        tune_option = auto_scheduler.TuningOptions(
+            num_measure_trials=len(tasks),
+            num_measures_per_round=1,
+            measure_callbacks=[auto_scheduler.RecordToFile(log_file)],
+        )
+        task_scheduler.tune(tune_option, search_policy="sketch.random")
+        assert sum(task_scheduler.task_cts) == (num_trials_per_task + 1) * len(tasks)
+        assert len(list(auto_scheduler.load_records(log_file))) == (
+            (num_trials_per_task + 1) * len(tasks)
+        )
+
+
 if __name__ == "__main__":
     test_task_scheduler_round_robin()
     test_task_scheduler_round_robin_spawn()
     test_task_scheduler_gradient()
+    test_distributed_task_scheduler()
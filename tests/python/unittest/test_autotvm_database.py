@@ -17,9 +17,11 @@
 """Test database"""
 import copy
 import logging
+import multiprocessing
 
 from tvm.autotvm import database
 from tvm.autotvm.record import encode, MeasureResult
+from tvm.contrib import utils
 
 from test_autotvm_common import get_sample_records
 
@@ -116,9 +118,62 @@ def test_db_filter():
     assert len(records) == 2
 
 
+def test_sqlite_db():
+    logging.info("test sqlite db ...")
+    temp = utils.tempdir()
+    records = get_sample_records(5)
+    _db = database.SQLiteDatabase(temp.relpath("records.db"))
+    _db.save_batch(*zip(*records))
+
+    for inp, res in records:
+        assert _db.load(inp) == res
+
+    inp1, res1 = records[0]
+    res2 = MeasureResult(res1.costs, res1.error_no, res1.all_cost, res1.timestamp + 1)
+    _db.save(inp1, res2, extend=True)
+    assert _db.load(inp1) == res2
+    assert _db.load(inp1, get_all=True) == [res1, res2]
+    _db.save(inp1, res1)
+    assert _db.load(inp1, get_all=True) == [res1]
+
+    assert len(_db.filter(lambda inp, ress: any(r.costs[0] <= 2 for r in ress))) == 2
+    assert len(_db.filter(task_name=inp1.task.name, workload=inp1.task.workload)) == 5
+    assert len(_db.filter(task_name="unknown")) == 0
+    _db.flush()
+    assert _db.load(inp1) is None
+
+
+def _sqlite_writer(filename, records):
+    _db = database.SQLiteDatabase(filename)
+    for inp, res in records:
+        _db.save(inp, res, extend=True)
+
+
+def test_sqlite_db_concurrent_writers():
+    logging.info("test sqlite db with concurrent writers ...")
+    temp = utils.tempdir()
+    filename = temp.relpath("records.db")
+    records = get_sample_records(5)
+    database.SQLiteDatabase(filename)
+
+    procs = [
+        multiprocessing.Process(target=_sqlite_writer, args=(filename, records)) for _ in range(4)
+    ]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+
+    _db = database.SQLiteDatabase(filename)
+    for inp, _ in records:
+        assert len(_db.load(inp, get_all=True)) == 4
+
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
     test_save_load()
     test_db_hash()
     test_db_latest_all()
     test_db_filter()
+    test_sqlite_db()
+    test_sqlite_db_concurrent_writers()
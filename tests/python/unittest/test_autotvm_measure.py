@@ -17,15 +17,20 @@
 """Test builder and runner"""
 import logging
 import multiprocessing
+import os
 import time
 
 import numpy as np
 
 import tvm
+import tvm.testing
 from tvm import te
+from tvm.contrib.cpu_slots import partition_cpus
 from test_autotvm_common import DummyRunner, bad_matmul, get_sample_task
 from tvm import autotvm
+from tvm.autotvm.env import GLOBAL_SCOPE
 from tvm.autotvm.measure.measure import MeasureErrorNo, MeasureResult
+from tvm.autotvm.measure.measure_methods import BuildResult
 
 
 def test_task_tuner_without_measurement():
@@ -47,6 +52,167 @@ def test_task_tuner_without_measurement():
         assert tuner.best_flops > 1
 
 
+def test_task_tuner_pipeline():
+    """test that the pipelined tuning loop measures the same configs in the same order"""
+    task, _ = get_sample_task()
+    measure_option = autotvm.measure_option(
+        builder=autotvm.LocalBuilder(n_parallel=2), runner=DummyRunner()
+    )
+
+    def _tune(pipeline):
+        records = []
+        tuner = autotvm.tuner.GridSearchTuner(task)
+        tuner.tune(
+            n_trial=9,
+            measure_option=measure_option,
+            callbacks=[lambda _, inputs, results: records.extend(zip(inputs, results))],
+            pipeline=pipeline,
+        )
+        return tuner, records
+
+    _, records = _tune(False)
+    tuner_pipelined, records_pipelined = _tune(True)
+    assert len(records_pipelined) == len(records) == 9
+    assert [inp.config.index for inp, _ in records_pipelined] == [
+        inp.config.index for inp, _ in records
+    ]
+    assert tuner_pipelined.best_flops > 1
+
+
+def test_local_builder_global_scope():
+    """test that the build workers see the current global scope and are reused"""
+    task, target = get_sample_task()
+    inp = autotvm.MeasureInput(target, task, task.config_space.get(0))
+
+    def build_func(measure_input, tmp_dir, **kwargs):
+        # pylint: disable=import-outside-toplevel
+        from tvm.autotvm.env import GLOBAL_SCOPE as scope
+
+        return BuildResult((scope.silent, scope.in_tuning, os.getpid()), None, None, 0)
+
+    builder = autotvm.LocalBuilder(n_parallel=1)
+    builder.build_func = build_func
+    old_silent, old_in_tuning = GLOBAL_SCOPE.silent, GLOBAL_SCOPE.in_tuning
+    try:
+        # the pool is started with the default scope, the later changes reach the builds
+        GLOBAL_SCOPE.silent = True
+        GLOBAL_SCOPE.in_tuning = True
+        (res,) = builder.build([inp])
+        assert res.filename[:2] == (True, True)
+
+        GLOBAL_SCOPE.in_tuning = False
+        (new_res,) = builder.build([inp])
+        assert new_res.filename[:2] == (True, False)
+        # the same worker process runs both builds
+        assert new_res.filename[2] == res.filename[2] != os.getpid()
+    finally:
+        GLOBAL_SCOPE.silent = old_silent
+        GLOBAL_SCOPE.in_tuning = old_in_tuning
+
+
+@tvm.testing.requires_llvm
+def test_local_runner_cpu_slots():
+    """test that the local runner measures concurrently in pinned worker processes"""
+    task, _ = get_sample_task()
+    n_slots = min(2, len(partition_cpus()))
+    runner = autotvm.LocalRunner(number=2, repeat=3, cooldown_interval=0, cpu_slots=n_slots)
+    measure_option = autotvm.measure_option(builder=autotvm.LocalBuilder(), runner=runner)
+
+    results = []
+    tuner = autotvm.tuner.RandomTuner(task)
+    tuner.tune(
+        n_trial=4,
+        measure_option=measure_option,
+        callbacks=[lambda _, inputs, res: results.extend(res)],
+    )
+    assert tuner.best_flops > 0
+
+    stats = runner.slot_stats()
+    assert len(stats) == n_slots
+    n_measured = sum(1 for res in results if res.error_no == MeasureErrorNo.NO_ERROR)
+    assert sum(x["n_runs"] for x in stats) == n_measured
+
+
+def test_local_runner_early_abort():
+    """test that the runner stops timing the candidates slower than the cutoff"""
+    task, target = get_sample_task()
+    runner = autotvm.LocalRunner(number=2, repeat=3, cooldown_interval=0, early_abort_ratio=1.0)
+    inp = autotvm.MeasureInput(target, task, task.config_space.get(0))
+    assert runner.get_cutoff(inp) is None
+    runner.update_cutoff(inp, MeasureResult((2e-3,), MeasureErrorNo.NO_ERROR, 0, 0))
+    assert runner.get_cutoff(inp) == 2e-3
+    runner.update_cutoff(inp, MeasureResult((3e-3,), MeasureErrorNo.NO_ERROR, 0, 0, True))
+    assert runner.n_censored == 1
+    assert runner.get_cutoff(inp) == 2e-3
+
+    # a ratio below 1 would censor candidates faster than the best
+    try:
+        autotvm.LocalRunner(early_abort_ratio=0.5)
+        assert False, "a ratio below 1 should be rejected"
+    except ValueError:
+        pass
+
+    # with a tiny best cost, every candidate is censored
+    runner = autotvm.LocalRunner(number=2, repeat=4, cooldown_interval=0, early_abort_ratio=1.0)
+    runner.update_cutoff(inp, MeasureResult((1e-12,), MeasureErrorNo.NO_ERROR, 0, 0))
+    measure_option = autotvm.measure_option(builder=autotvm.LocalBuilder(), runner=runner)
+    results = []
+    tuner = autotvm.tuner.RandomTuner(task)
+    tuner.tune(
+        n_trial=8,
+        measure_option=measure_option,
+        callbacks=[lambda _, inputs, res: results.extend(res)],
+    )
+    assert tuner.best_flops > 0
+    valid = [res for res in results if res.error_no == 0]
+    assert valid
+    assert all(res.censored for res in valid)
+    assert runner.n_censored == len(valid)
+    assert runner.get_cutoff(inp) == 1e-12
+    # a censored candidate is timed by a single probe
+    assert all(len(res.costs) == 1 for res in valid)
+
+
+@tvm.testing.requires_llvm
+def test_rpc_runner_session_pool():
+    """test that the measurements reuse the leased remote sessions"""
+    # pylint: disable=import-outside-toplevel
+    from tvm.autotvm.measure import measure_methods
+
+    task, _ = get_sample_task()
+    runner = autotvm.LocalRunner(
+        number=2, repeat=3, cooldown_interval=0, session_pool=True, max_session_uses=3
+    )
+    server, tracker = runner.set_task(task)
+
+    remote_args = (runner.key, runner.host, runner.port, 0, 10)
+    lease = measure_methods.lease_remote(remote_args, 2)
+    assert measure_methods.lease_remote(remote_args, 2) is lease
+    assert lease.n_uses == 2
+    # recycled after max_uses measurements
+    new_lease = measure_methods.lease_remote(remote_args, 2)
+    assert new_lease is not lease and new_lease.is_alive()
+    # the session is short, and recycled before a measurement could outlive it
+    assert new_lease.deadline <= time.time() + 2 * 10
+    new_lease.deadline = time.time() + 5
+    assert measure_methods.lease_remote(remote_args, 2) is not new_lease
+    measure_methods.recycle_remote(remote_args)
+    assert remote_args not in measure_methods._LEASED_SESSIONS
+    del server, tracker
+
+    measure_option = autotvm.measure_option(builder=autotvm.LocalBuilder(), runner=runner)
+    results = []
+    tuner = autotvm.tuner.RandomTuner(task)
+    tuner.tune(
+        n_trial=8,
+        measure_option=measure_option,
+        callbacks=[lambda _, inputs, res: results.extend(res)],
+    )
+    assert len(results) == 8
+    assert tuner.best_flops > 0
+    runner.release_sessions()
+
+
 def task_tuner_spawn():
     assert multiprocessing.get_start_method(False) == "spawn"
     test_task_tuner_without_measurement()
@@ -65,3 +231,8 @@ if __name__ == "__main__":
 
     test_task_tuner_without_measurement()
     test_task_tuner_without_measurement_spawn()
+    test_task_tuner_pipeline()
+    test_local_builder_global_scope()
+    test_local_runner_cpu_slots()
+    test_local_runner_early_abort()
+    test_rpc_runner_session_pool()
@@ -47,6 +47,13 @@ def test_load_dump():
         assert result.costs == result_2.costs
         assert result.error_no == result_2.error_no
         assert result.timestamp == result_2.timestamp
+        assert not result_2.censored
+
+    # censored results stay marked
+    result = result._replace(costs=(2.0,), censored=True)
+    for protocol in ["json", "pickle"]:
+        _, result_2 = decode(encode(inp, result, protocol=protocol), protocol=protocol)
+        assert result_2.censored
 
 
 def test_file_io():
@@ -87,7 +94,102 @@ def test_apply_history_best():
     assert str(x) == str(tsk.config_space.get(2))
 
 
+def test_record_store():
+    temp = utils.tempdir()
+    log_path = temp.relpath("temp.log")
+    store_path = temp.relpath("temp.tvmrec")
+
+    tsk, target = get_sample_task()
+    inputs = [MeasureInput(target, tsk, tsk.config_space.get(i)) for i in range(0, 10)]
+    results = [MeasureResult((10 - i,), 0, 0, 0) for i in range(0, 10)]
+    results[-1] = MeasureResult((1e9,), MeasureErrorNo.RUNTIME_DEVICE, 0, 0)
+
+    with open(log_path, "w") as fo:
+        autotvm.callback.log_to_file(fo)(None, inputs[:5], results[:5])
+    autotvm.record_store.convert_to_store(log_path, store_path).close()
+    assert autotvm.record_store.is_record_store(store_path)
+    assert not autotvm.record_store.is_record_store(log_path)
+    with open(store_path + ".idx", "rb") as fin:
+        old_index = fin.read()
+
+    # append to the persisted index
+    with autotvm.record_store.RecordStore(store_path) as store:
+        store.extend(zip(inputs[5:], results[5:]))
+        assert len(list(store)) == len(store) == 10
+
+    # the best valid record is picked without decoding the others
+    store = autotvm.record_store.RecordStore(store_path)
+    best_inp, best_res = store.query((target.keys[0], tsk.workload))
+    assert str(best_inp.config) == str(inputs[8].config)
+    assert best_res.costs == results[8].costs
+
+    hist_best = ApplyHistoryBest(store_path)
+    x = hist_best.query(target, tsk.workload)
+    assert str(x) == str(inputs[8].config)
+
+    # a stale index catches up with the records appended after it was saved
+    with open(store_path + ".idx", "wb") as fout:
+        fout.write(old_index)
+    store = autotvm.record_store.RecordStore(store_path)
+    best_inp, _ = store.query((target.keys[0], tsk.workload))
+    assert str(best_inp.config) == str(inputs[8].config)
+    assert len(store) == 10
+
+
+def test_distill_log():
+    temp = utils.tempdir()
+    log_path = temp.relpath("temp.log")
+    best_path = temp.relpath("temp.best.log")
+
+    tsk, target = get_sample_task()
+    inputs = [MeasureInput(target, tsk, tsk.config_space.get(i)) for i in range(0, 20)]
+    results = [MeasureResult(((i * 7) % 20 + 1,), 0, 0, 0) for i in range(0, 20)]
+    with open(log_path, "w") as fo:
+        autotvm.callback.log_to_file(fo)(None, inputs, results)
+
+    # tiny chunks to exercise the split of lines across workers
+    for n_parallel in [1, 4]:
+        n_best = autotvm.record.distill_log(log_path, best_path, n_parallel, chunk_size=97)
+        records = list(autotvm.record.load_from_file(best_path))
+        assert n_best == len(records) == 1
+        assert str(records[0][0].config) == str(inputs[0].config)
+
+    # the existing best of the output file is kept
+    with open(best_path, "w") as fo:
+        autotvm.callback.log_to_file(fo)(None, inputs[5:6], [MeasureResult((0.5,), 0, 0, 0)])
+    autotvm.record.pick_best(log_path, best_path)
+    records = list(autotvm.record.load_from_file(best_path))
+    assert len(records) == 1
+    assert str(records[0][0].config) == str(inputs[5].config)
+
+
+def test_split_workload():
+    temp = utils.tempdir()
+    log_path = temp.relpath("temp.log")
+
+    records = []
+    for n in [16, 32, 64]:
+        tsk, target = get_sample_task(n)
+        for i in range(3):
+            records.append((MeasureInput(target, tsk, tsk.config_space.get(i)), i))
+    # interleave the workloads so that the output files are closed and reopened
+    records.sort(key=lambda x: x[1])
+    inputs = [inp for inp, _ in records]
+    results = [MeasureResult((1,), 0, 0, 0) for _ in records]
+    with open(log_path, "w") as fo:
+        autotvm.callback.log_to_file(fo)(None, inputs + inputs[:1], results + results[:1])
+
+    autotvm.record.split_workload(log_path, max_open_files=1)
+    for i in range(3):
+        split = list(autotvm.record.load_from_file(log_path + ".%03d.wkl" % i))
+        assert len(split) == 3
+        assert len(set(measure_str_key(inp, False) for inp, _ in split)) == 1
+
+
 if __name__ == "__main__":
     test_load_dump()
     test_apply_history_best()
     test_file_io()
+    test_record_store()
+    test_distill_log()
+    test_split_workload()
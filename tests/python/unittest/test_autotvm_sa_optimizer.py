@@ -0,0 +1,70 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Test the simulated annealing model optimizers"""
+import numpy as np
+
+from tvm.autotvm.tuner.model_based_tuner import CostModel
+from tvm.autotvm.tuner.sa_model_optimizer import (
+    BatchedSimulatedAnnealingOptimizer,
+    random_walk_batch,
+)
+
+from test_autotvm_common import get_sample_task
+
+
+class _ClosenessModel(CostModel):
+    """A cost model that prefers indexes close to a target index"""
+
+    def __init__(self, target):
+        super(_ClosenessModel, self).__init__()
+        self.target = target
+
+    def predict(self, xs, output_margin=False):
+        return 1.0 / (1.0 + np.abs(np.asarray(xs, dtype=np.float64) - self.target))
+
+
+def test_random_walk_batch():
+    task, _ = get_sample_task()
+    space = task.config_space
+    knobs = space.get_knobs(np.arange(len(space)))
+    new_knobs = random_walk_batch(knobs, space.dims)
+    # every point moves along exactly one knob, and stays in the space
+    assert np.all(np.sum(new_knobs != knobs, axis=1) == 1)
+    assert np.all(new_knobs < np.array(space.dims))
+    space.get_indexes(new_knobs)
+
+
+def test_batched_sa_optimizer():
+    task, _ = get_sample_task()
+    space = task.config_space
+    model = _ClosenessModel(len(space) // 2)
+
+    for n_chains, n_parallel in [(1, None), (4, 1), (4, 2)]:
+        optimizer = BatchedSimulatedAnnealingOptimizer(
+            task, n_iter=100, parallel_size=32, n_chains=n_chains, n_parallel=n_parallel
+        )
+        exclusive = {len(space) // 2}
+        maximums = optimizer.find_maximums(model, 8, exclusive)
+        assert len(maximums) == len(set(maximums)) == 8
+        assert not exclusive.intersection(maximums)
+        scores = model.predict(maximums)
+        assert np.all(scores[:-1] >= scores[1:])
+
+
+if __name__ == "__main__":
+    test_random_walk_batch()
+    test_batched_sa_optimizer()
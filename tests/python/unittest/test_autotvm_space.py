@@ -15,10 +15,14 @@
 # specific language governing permissions and limitations
 # under the License.
 """Test space definition primitives"""
+import pickle
+
+import numpy as np
 
 import tvm
 from tvm import te
-from tvm.autotvm.task.space import ConfigSpace, FallbackConfigEntity
+from tvm.autotvm.task.space import ConfigSpace, ConfigEntity, FallbackConfigEntity
+from tvm.autotvm.tuner.model_based_tuner import knob2point, point2knob, submodular_pick
 
 
 def gemm_func(cfg, N):
@@ -100,5 +104,81 @@ def test_split():
         pass
 
 
+def test_batch_decode():
+    cfg = ConfigSpace()
+    gemm_func(cfg, 128)
+    cfg.define_reorder("reorder", [cfg.axis(4), cfg.axis(4), cfg.axis(4)], policy="all")
+    cfg.define_annotate("ann", [cfg.axis(4)], policy="try_unroll")
+    cfg.define_knob("auto_unroll_max_step", [0, 512, 1500])
+
+    indexes = np.random.randint(len(cfg), size=64)
+    knobs = cfg.get_knobs(indexes)
+    assert knobs.shape == (64, len(cfg.space_map))
+    np.testing.assert_equal(cfg.get_indexes(knobs), indexes)
+
+    features = cfg.get_flatten_features(indexes)
+    for i, (index, config) in enumerate(zip(indexes, cfg.get_batch(indexes))):
+        ref = cfg.get(index)
+        assert str(config) == str(ref)
+        np.testing.assert_equal(features[i], ref.get_flatten_feature())
+
+    # lazy configs are pickled as plain configs
+    config = pickle.loads(pickle.dumps(cfg.get_batch([indexes[0]])[0]))
+    assert type(config) is ConfigEntity
+    assert str(config) == str(cfg.get(indexes[0]))
+
+    try:
+        cfg.get_knobs([len(cfg)])
+        assert False
+    except IndexError:
+        pass
+
+
+def test_batch_decode_large_space():
+    cfg = ConfigSpace()
+    for i in range(70):
+        cfg.define_knob("knob_%d" % i, [0, 1, 2])
+    n_points = 3 ** 70
+    assert n_points > 2 ** 63
+
+    indexes = [0, 1, 2 ** 63 + 5, n_points - 1]
+    knobs = cfg.get_knobs(indexes)
+    assert knobs.shape == (4, 70)
+    assert list(cfg.get_indexes(knobs)) == indexes
+    assert list(knob2point(knobs, cfg.dims)) == indexes
+    for index, knob in zip(indexes, knobs):
+        assert list(knob) == point2knob(index, cfg.dims)
+        assert knob2point(list(knob), cfg.dims) == index
+        assert str(cfg.get(index)) == str(cfg.get_batch([index])[0])
+
+    np.testing.assert_equal(point2knob(np.array([7, 8]), [2, 3, 4]), [[1, 0, 1], [0, 1, 1]])
+
+
+def test_submodular_pick():
+    def pick_reference(scores, knobs, n_pick):
+        knobs_set = [set() for _ in knobs[0]]
+        ret = []
+        remain = list(range(len(scores)))
+        for _ in range(n_pick):
+            max_x, max_delta = -1, -1e9
+            for x in remain:
+                delta = scores[x] + sum(k not in s for k, s in zip(knobs[x], knobs_set))
+                if delta > max_delta:
+                    max_delta, max_x = delta, x
+            ret.append(max_x)
+            remain.remove(max_x)
+            for k, s in zip(knobs[max_x], knobs_set):
+                s.add(k)
+        return ret
+
+    knobs = np.random.randint(4, size=(64, 5))
+    scores = np.random.randint(3, size=64).astype("float64")
+    assert submodular_pick(scores, knobs, 16) == pick_reference(scores, knobs, 16)
+    assert submodular_pick(0 * scores, knobs, 16) == pick_reference(0 * scores, knobs, 16)
+
+
 if __name__ == "__main__":
     test_split()
+    test_batch_decode()
+    test_batch_decode_large_space()
+    test_submodular_pick()
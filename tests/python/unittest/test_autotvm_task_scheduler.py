@@ -0,0 +1,69 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Test the task scheduler of autotvm"""
+import tempfile
+
+import numpy as np
+
+from tvm import autotvm
+from tvm.autotvm.tuner import TaskScheduler
+
+from test_autotvm_common import DummyRunner, get_sample_task
+
+
+def test_task_scheduler():
+    tasks = [get_sample_task(n)[0] for n in (32, 64, 128)]
+    measure_option = autotvm.measure_option(
+        builder=autotvm.LocalBuilder(n_parallel=2), runner=DummyRunner()
+    )
+
+    for strategy in ["round-robin", "gradient"]:
+        scheduler = TaskScheduler(tasks, task_weights=[1, 2, 1], tuner="random", strategy=strategy)
+        scheduler.tune(n_trial=24, measure_option=measure_option, trials_per_round=4)
+        assert scheduler.ct >= 24
+        # every task is warmed up
+        assert all(ct >= 1 for ct in scheduler.task_cts)
+        assert all(cost < 1e9 for cost in scheduler.best_costs)
+        assert np.isclose(scheduler.cur_score, np.dot([1, 2, 1], scheduler.best_costs))
+
+
+def test_task_scheduler_resume():
+    tasks = [get_sample_task(n)[0] for n in (32, 64)]
+    measure_option = autotvm.measure_option(
+        builder=autotvm.LocalBuilder(n_parallel=2), runner=DummyRunner()
+    )
+
+    with tempfile.NamedTemporaryFile() as log_file:
+        scheduler = TaskScheduler(tasks, tuner="xgb_knob")
+        scheduler.tune(
+            n_trial=16,
+            measure_option=measure_option,
+            trials_per_round=4,
+            callbacks=[autotvm.callback.log_to_file(log_file.name)],
+        )
+
+        resumed = TaskScheduler(tasks, tuner="xgb_knob", load_log_file=log_file.name)
+        assert all(ct == 1 for ct in resumed.task_cts)
+        np.testing.assert_allclose(resumed.best_costs, scheduler.best_costs)
+        for old, new in zip(scheduler.tuners, resumed.tuners):
+            assert new.visited == old.visited
+            assert new.best_flops == old.best_flops
+
+
+if __name__ == "__main__":
+    test_task_scheduler()
+    test_task_scheduler_resume()
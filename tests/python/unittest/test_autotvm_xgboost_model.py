@@ -24,6 +24,8 @@ from tvm import te
 from tvm import autotvm
 from tvm.autotvm import MeasureInput, MeasureResult
 from tvm.autotvm.tuner.xgboost_cost_model import XGBoostCostModel
+from tvm.autotvm.tuner.disk_feature_cache import DiskFeatureCache
+from tvm.contrib import utils
 
 from test_autotvm_common import get_sample_task, get_sample_records
 
@@ -65,7 +67,73 @@ def test_tuner():
     tuner.load_history(records)
 
 
+def test_disk_feature_cache():
+    temp = utils.tempdir()
+    cache = DiskFeatureCache(temp.relpath("cache"), max_bytes=1 << 20)
+    fea_cache = cache.get("knob", ("llvm", "wkl_0"))
+    fea_cache[0] = np.arange(4, dtype=np.float32)
+    fea_cache[1] = None
+    fea_cache.put(2, np.ones(4), flop=2.0)
+    cache.flush()
+
+    # a new session reads the features back from disk
+    fea_cache = DiskFeatureCache(temp.relpath("cache")).get("knob", ("llvm", "wkl_0"))
+    assert len(fea_cache) == 3 and 3 not in fea_cache
+    np.testing.assert_equal(fea_cache[0], np.arange(4))
+    assert fea_cache[1] is None
+    assert np.isnan(fea_cache.get_flop(0)) and fea_cache.get_flop(2) == 2.0
+    assert 0 not in cache.get("knob", ("llvm", "wkl_1"))
+    assert 0 not in cache.get("itervar", ("llvm", "wkl_0"))
+
+    # the least recently used task is evicted first
+    big = np.zeros(64 * 1024, dtype=np.float32)
+    for i in range(5):
+        cache.get("knob", ("llvm", "wkl_big_%d" % i))[0] = big
+        cache.flush()
+        time.sleep(0.01)
+    cache.evict()
+    assert 0 not in DiskFeatureCache(temp.relpath("cache")).get("knob", ("llvm", "wkl_0"))
+    assert 0 in DiskFeatureCache(temp.relpath("cache")).get("knob", ("llvm", "wkl_big_4"))
+
+
+def test_fit_log_feature_cache():
+    task, target = get_sample_task()
+    records = get_sample_records(n=500)
+    temp = utils.tempdir()
+
+    for _ in range(2):
+        model = XGBoostCostModel(
+            task, feature_type="knob", loss_type="rank", feature_cache=temp.relpath("cache")
+        )
+        assert model.fit_log(records, plan_size=32)
+    fea_cache = model.feature_cache.get("knob", (str(target), task.workload))
+    assert len(fea_cache) == len(set(inp.config.index for inp, _ in records))
+
+
+def test_model_zoo():
+    task, target = get_sample_task()
+    records = get_sample_records(n=500)
+    temp = utils.tempdir()
+    log_file = temp.relpath("matmul.log")
+    callback = autotvm.callback.log_to_file(log_file)
+    callback(None, *zip(*records))
+
+    zoo = autotvm.tuner.CostModelZoo(temp.relpath("zoo"))
+    assert zoo.pretrain(log_file, feature_type="knob") == [(str(target), task.name)]
+
+    tuner = autotvm.tuner.XGBTuner(task, feature_type="knob", model_zoo=temp.relpath("zoo"))
+    assert tuner.cost_model.base_model is not None
+    assert len(tuner.trials) > 0
+
+    # no model for another feature type
+    tuner = autotvm.tuner.XGBTuner(task, feature_type="itervar", model_zoo=zoo)
+    assert tuner.cost_model.base_model is None
+
+
 if __name__ == "__main__":
     test_fit()
     test_fit_spawn()
     test_tuner()
+    test_disk_feature_cache()
+    test_fit_log_feature_cache()
+    test_model_zoo()
@@ -17,6 +17,7 @@
 import tvm
 from tvm import te
 import tvm.testing
+import asyncio
 import os
 import stat
 import logging
@@ -27,7 +28,7 @@ import pytest
 import numpy as np
 from tvm import rpc
 from tvm.contrib import utils, cc
-from tvm.rpc.tracker import Tracker
+from tvm.rpc.tracker import Tracker, FairShareScheduler
 
 # tkonolige: The issue as I understand it is this: multiprocessing's spawn
 # method launches a new process and then imports the relevant modules. This
@@ -210,6 +211,47 @@ def test_rpc_file_exchange():
     assert rev == blob
 
 
+@tvm.testing.requires_rpc
+def test_rpc_module_cache():
+    server = rpc.Server("localhost", module_cache_size=1024)
+    blob = bytearray(np.random.randint(0, 10, size=(10)))
+    remote = rpc.connect(server.host, server.port)
+    remote.upload(blob, "dat.bin")
+    assert remote.n_cached_uploads == 0
+
+    # a new session gets the file from the cache of the server
+    remote = rpc.connect(server.host, server.port)
+    remote.upload(blob, "dat.bin")
+    remote.upload(blob, "copy.bin")
+    assert remote.n_cached_uploads == 2
+    assert remote.download("copy.bin") == blob
+    remote.upload(blob, "nocache.bin", use_cache=False)
+    assert remote.n_cached_uploads == 2
+
+    # the server does not cache a file under a hash that does not match its content
+    other = bytearray(np.random.randint(10, 20, size=(10)))
+    with pytest.raises((tvm.error.TVMError, ValueError)):
+        remote.get_function("tvm.rpc.server.upload_cached")("bad.bin", "0" * 64, other)
+    assert remote.get_function("tvm.rpc.server.fetch_cached")("bad.bin", "0" * 64) == 0
+
+    # the least recently used files are evicted beyond the size of the cache
+    temp = utils.tempdir()
+    cache_dir = utils.tempdir()
+    cache = rpc.server.ModuleCache(cache_dir.temp_dir, 25)
+    digests = []
+    for i in range(3):
+        path = temp.relpath("file%d" % i)
+        with open(path, "wb") as out_file:
+            out_file.write(bytes([i] * 10))
+        digests.append("%064x" % i)
+        cache.add(digests[-1], path)
+        os.utime(cache_dir.relpath(digests[-1]), (i, i))
+    assert cache.fetch(digests[0], temp.relpath("out")) is False
+    assert cache.fetch(digests[2], temp.relpath("out")) is True
+    with open(temp.relpath("out"), "rb") as in_file:
+        assert in_file.read() == bytes([2] * 10)
+
+
 @tvm.testing.requires_rpc
 @tvm.testing.requires_llvm
 def test_rpc_remote_module():
@@ -528,6 +570,127 @@ def test_rpc_tracker_request():
     tracker.terminate()
 
 
+@tvm.testing.requires_rpc
+def test_rpc_tracker_async():
+    tracker = Tracker("localhost", port=9000, port_end=10000)
+    device_key = "test_device"
+    server = rpc.Server(
+        "localhost",
+        port=9000,
+        port_end=10000,
+        key=device_key,
+        tracker_addr=(tracker.host, tracker.port),
+    )
+    time.sleep(0.5)
+    client = rpc.connect_tracker_async(tracker.host, tracker.port)
+
+    async def _check():
+        remote = await client.request(device_key, session_timeout=20, timeout=10)
+        blob = bytearray(np.random.randint(0, 10, size=(10)))
+        await remote.upload(blob, "dat.bin")
+        assert await remote.download("dat.bin") == blob
+
+        # the only device is busy, the requests time out or get cancelled
+        with pytest.raises(asyncio.TimeoutError):
+            await client.request(device_key, timeout=0.5)
+        pending = asyncio.ensure_future(client.request(device_key))
+        await asyncio.sleep(0.5)
+        summary = await client.summary()
+        assert summary["queue_info"][device_key]["pending"] >= 1
+        pending.cancel()
+        del remote
+
+        # the withdrawn requests do not take the device
+        remote = await client.request(device_key, timeout=10)
+        await remote.remove("")
+
+    asyncio.get_event_loop().run_until_complete(_check())
+    server.terminate()
+    tracker.terminate()
+
+
+class _ServerConn:
+    """A fake server connection of the tracker"""
+
+    def __init__(self):
+        self.pending_matchkeys = set()
+
+    def put(self, scheduler, matchkey):
+        self.pending_matchkeys.add(matchkey)
+        scheduler.put((self, "localhost", 9000, matchkey))
+
+
+def test_rpc_tracker_fair_share_scheduler():
+    scheduler = FairShareScheduler("test_device", max_lease=60)
+    conns = [_ServerConn(), _ServerConn()]
+    grants = []
+
+    def _callback(user):
+        return lambda value: grants.append((user, value)) or True
+
+    # a batch is granted when all of its devices are free
+    scheduler.request_batch("a", 1, 2, _callback("a"))
+    conns[0].put(scheduler, "k0")
+    assert not grants
+    conns[1].put(scheduler, "k1")
+    assert grants == [
+        ("a", [("localhost", 9000, "k0 -timeout=60"), ("localhost", 9000, "k1 -timeout=60")])
+    ]
+    assert not conns[0].pending_matchkeys and not conns[1].pending_matchkeys
+    time.sleep(0.1)
+
+    # the user who used less device time is served first
+    scheduler.request("a", 1, _callback("a"))
+    scheduler.request("b", 1, _callback("b"))
+    conns[0].put(scheduler, "k2")
+    assert grants[-1] == ("b", ("localhost", 9000, "k2 -timeout=60"))
+
+    summary = scheduler.summary()
+    assert summary["free"] == 0 and summary["pending"] == 1 and summary["leased"] == 2
+    assert summary["grants"] == 2
+    assert summary["users"]["a"]["usage"] > summary["users"]["b"]["usage"]
+    assert summary["users"]["a"]["pending"] == 1
+    assert 0 < summary["utilization"] <= 1
+
+    # a higher priority is served first regardless of the usage
+    scheduler.request("b", 1, _callback("b"))
+    scheduler.request("a", 2, _callback("a"))
+    conns[1].put(scheduler, "k3")
+    assert grants[-1][0] == "a"
+
+
+@tvm.testing.requires_rpc
+def test_rpc_tracker_request_batch():
+    tracker = Tracker("localhost", port=9000, port_end=10000, scheduler=FairShareScheduler)
+    device_key = "test_device"
+    servers = [
+        rpc.Server(
+            "localhost",
+            port=9000,
+            port_end=10000,
+            key=device_key,
+            tracker_addr=(tracker.host, tracker.port),
+        )
+        for _ in range(2)
+    ]
+    time.sleep(1)
+    client = rpc.connect_tracker(tracker.host, tracker.port)
+    remotes = client.request_batch(device_key, 2, user="test")
+    assert len(remotes) == 2
+    for remote in remotes:
+        remote.cpu(0)
+
+    summary = client.summary()
+    assert summary["queue_info"][device_key]["leased"] == 2
+    assert summary["queue_info"][device_key]["users"]["test"]["leased"] == 2
+    assert "Utilization" in client.text_summary()
+
+    del remotes
+    for server in servers:
+        server.terminate()
+    tracker.terminate()
+
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
     test_rpc_echo()
@@ -537,9 +700,13 @@ if __name__ == "__main__":
     test_bigendian_rpc()
     test_rpc_remote_module()
     test_rpc_file_exchange()
+    test_rpc_module_cache()
     test_rpc_array()
     test_rpc_simple()
     test_local_func()
     test_rpc_tracker_register()
     test_rpc_tracker_request()
+    test_rpc_tracker_fair_share_scheduler()
+    test_rpc_tracker_request_batch()
+    test_rpc_tracker_async()
     test_rpc_large_array()